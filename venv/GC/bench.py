@@ -0,0 +1,241 @@
+"""
+bench.py — 핫패스 성능 회귀 체크(ops/sec + peak memory)
+
+측정 대상 (장치 크기 × backend 별):
+  - write_lpn        : 에이징된 장치에 랜덤 덮어쓰기 (필요한 GC 는 시간 측정 밖에서 greedy 로)
+  - trim_lpn         : 매핑된 LPN 을 랜덤 순서로 TRIM
+  - gc/<policy>      : collect_garbage(policy) 1회 = 1 op (사이사이 호스트 write 는 측정 밖)
+  - sim/<policy>     : Simulator.run 전체 (워크로드 op 기준, telemetry 끔)
+  - sim/greedy+trace : 위와 같되 타임라인 + GC 이벤트 ring 켬 (텔레메트리 비용)
+
+시간과 메모리는 따로 잰다: 시간은 tracemalloc 없이 --repeat 회 중 최고값,
+peak memory 는 별도 1회 실행을 tracemalloc 으로(측정 구간에서 새로 할당된 최대 바이트).
+
+사용 예:
+  python bench.py                                      # 기본: 256,1024,4096 블록 × object,compact (수십 분)
+  python bench.py --blocks 256,1024 --out bench_base.json
+  python bench.py --blocks 256,1024 --compare bench_base.json --tolerance 0.2   # 회귀 시 exit 1
+"""
+from __future__ import annotations
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+import gc_algos
+from config import SimConfig
+from models import make_ssd
+from run_sim import warmup_device
+from simulator import Simulator
+from snapshot import clone_device
+from workload import make_workload
+
+POLICIES = ("greedy", "cb", "bsgc", "cat", "atcb", "re50315")
+
+
+# ------------------------------------------------------------
+# 준비
+# ------------------------------------------------------------
+def _config(blocks: int, ppb: int, backend: str, seed: int) -> SimConfig:
+    cfg = SimConfig(num_blocks=blocks, pages_per_block=ppb, backend=backend, rng_seed=seed)
+    cfg.prepare()
+    return cfg
+
+
+def aged_device(cfg: SimConfig, seed: int):
+    """90% 채우고 장치 크기만큼 랜덤 덮어쓰기(greedy GC) — 모든 케이스의 공통 시작 상태."""
+    ssd = make_ssd(cfg.num_blocks, cfg.pages_per_block, rng_seed=seed, backend=cfg.backend)
+    args = SimpleNamespace(warmup_fill=0.9, preage_ops=cfg.total_pages, preage_policy="greedy", seed=seed)
+    warmup_device(args, cfg, ssd)
+    return ssd
+
+
+def _threshold(cfg: SimConfig, ssd) -> int:
+    return max(int(cfg.free_block_threshold_abs), ssd.RESERVED_FREE_BLOCKS + 1)
+
+
+def _mapped(cfg: SimConfig, ssd) -> List[int]:
+    """매핑된 LPN 목록(backend 공통 lookup 사용)."""
+    return [lpn for lpn in range(cfg.user_total_pages) if ssd.lookup(lpn) is not None]
+
+
+# ------------------------------------------------------------
+# 케이스: run(dev) -> 측정 구간 초(float). 준비/정리는 측정 밖
+# ------------------------------------------------------------
+def case_write(cfg: SimConfig, mapped: List[int], n: int, seed: int) -> Callable:
+    rng = random.Random(seed)
+    lpns = [rng.choice(mapped) for _ in range(n)]
+
+    def run(dev) -> float:
+        thr, ppb = _threshold(cfg, dev) + 2, cfg.pages_per_block
+        elapsed, i = 0.0, 0
+        while i < n:
+            # 다음 청크가 free 블록을 임계치 아래로 떨어뜨리지 않게 GC 로 여유 확보(측정 밖)
+            while dev.free_blocks <= thr:
+                dev.collect_garbage(gc_algos.greedy_policy, cause="bench")
+            k = min(n - i, (dev.free_blocks - thr) * ppb)
+            w = dev.write_lpn
+            t0 = time.perf_counter()
+            for lpn in lpns[i:i + k]:
+                w(lpn)
+            elapsed += time.perf_counter() - t0
+            i += k
+        return elapsed
+    return run
+
+
+def case_trim(mapped: List[int], n: int, seed: int) -> Callable:
+    lpns = list(mapped)
+    random.Random(seed).shuffle(lpns)
+    lpns = lpns[:n]
+
+    def run(dev) -> float:
+        t = dev.trim_lpn
+        t0 = time.perf_counter()
+        for lpn in lpns:
+            t(lpn)
+        return time.perf_counter() - t0
+    return run
+
+
+def case_gc(cfg: SimConfig, mapped: List[int], policy_name: str, n: int, seed: int) -> Callable:
+    def run(dev) -> float:
+        gc_algos.reset_config()
+        policy = gc_algos.get_gc_policy(policy_name)
+        rng = random.Random(seed)
+        thr = _threshold(cfg, dev)
+        elapsed = 0.0
+        for _ in range(n):
+            while dev.free_blocks > thr:
+                dev.write_lpn(rng.choice(mapped))
+            t0 = time.perf_counter()
+            dev.collect_garbage(policy, cause="bench")
+            elapsed += time.perf_counter() - t0
+        return elapsed
+    return run
+
+
+def case_sim(cfg: SimConfig, policy_name: str, wl: List, trace: bool) -> Callable:
+    def run(dev) -> float:
+        gc_algos.reset_config()
+        if not trace:
+            dev.gc_log.resize(0)   # 집계만(ring 없음)
+        sim = Simulator(cfg, policy_name, ssd=dev, enable_trace=trace, trace_every=16)
+        t0 = time.perf_counter()
+        sim.run(wl)
+        return time.perf_counter() - t0
+    return run
+
+
+# ------------------------------------------------------------
+# 측정
+# ------------------------------------------------------------
+def measure(run: Callable, base, n_ops: int, repeat: int) -> Dict:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        best = min(best, run(clone_device(base)))
+    dev = clone_device(base)
+    tracemalloc.start()
+    cur0 = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    run(dev)
+    peak = tracemalloc.get_traced_memory()[1] - cur0
+    tracemalloc.stop()
+    return {"ops": n_ops, "seconds": round(best, 6),
+            "ops_per_s": round(n_ops / best, 1) if best > 0 else 0.0,
+            "peak_kb": round(max(0, peak) / 1024.0, 1)}
+
+
+def run_bench(args) -> List[Dict]:
+    results = []
+    for backend in args.backends:
+        for blocks in args.blocks:
+            cfg = _config(blocks, args.pages_per_block, backend, args.seed)
+            base = aged_device(cfg, args.seed)
+            mapped = _mapped(cfg, base)
+            n = args.ops if args.ops > 0 else min(cfg.total_pages, 10000)
+            n_gc = max(1, args.gc_ops)
+            wl = make_workload(n, 0.8, cfg.user_total_pages, rng_seed=args.seed,
+                               enable_trim=True, trim_ratio=0.05)
+            cases = [("write_lpn", case_write(cfg, mapped, n, args.seed), n),
+                     ("trim_lpn", case_trim(mapped, n, args.seed), min(n, len(mapped)))]
+            cases += [(f"gc/{p}", case_gc(cfg, mapped, p, n_gc, args.seed), n_gc) for p in args.policies]
+            cases += [(f"sim/{p}", case_sim(cfg, p, wl, False), n) for p in args.policies]
+            cases.append(("sim/greedy+trace", case_sim(cfg, "greedy", wl, True), n))
+            for name, run, n_ops in cases:
+                row = {"case": name, "backend": backend, "blocks": blocks}
+                row.update(measure(run, base, n_ops, args.repeat))
+                results.append(row)
+                print(f"{name:18s} {backend:8s} {blocks:6d}  {row['ops_per_s']:>12,.0f} ops/s  "
+                      f"{row['peak_kb']:>10,.1f} KiB", flush=True)
+    return results
+
+
+def _key(r: Dict) -> str:
+    return f"{r['case']}/{r['backend']}/{r['blocks']}"
+
+
+def compare(results: List[Dict], baseline_path: str, tolerance: float) -> int:
+    """기준 JSON 대비 처리량이 tolerance 이상 떨어지거나 peak memory 가 tolerance 이상 늘면 회귀. 반환: 회귀 수."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        base = {_key(r): r for r in json.load(f)["results"]}
+    bad = 0
+    print(f"\n=== compare vs {baseline_path} (tolerance {tolerance:.0%}) ===")
+    for r in results:
+        b = base.get(_key(r))
+        if b is None:
+            continue
+        d_ops = r["ops_per_s"] / b["ops_per_s"] - 1.0 if b["ops_per_s"] else 0.0
+        d_mem = r["peak_kb"] - b["peak_kb"]
+        # 작은 할당(64KiB 미만 증가)은 잡음으로 본다
+        mem_bad = d_mem > 64 and d_mem > tolerance * b["peak_kb"]
+        flag = d_ops < -tolerance or mem_bad
+        bad += flag
+        print(f"{'REGRESSION' if flag else 'ok':10s} {_key(r):32s} ops/s {d_ops:+7.1%}  peak {d_mem:+10,.1f} KiB")
+    return bad
+
+
+def _csv_list(s: str, cast=str) -> List:
+    return [cast(x) for x in s.split(",") if x.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="write/trim/GC/policy 핫패스 벤치마크")
+    ap.add_argument("--blocks", type=lambda s: _csv_list(s, int), default=[256, 1024, 4096],
+                    help="장치 크기(블록 수) 목록, 예: 256,1024,4096")
+    ap.add_argument("--pages_per_block", type=int, default=64)
+    ap.add_argument("--backends", type=_csv_list, default=["object", "compact"])
+    ap.add_argument("--policies", type=_csv_list, default=list(POLICIES))
+    ap.add_argument("--ops", type=int, default=0, help="write/trim/sim op 수(0이면 min(장치 총 페이지, 10000))")
+    ap.add_argument("--gc_ops", type=int, default=200, help="정책별 collect_garbage 호출 수")
+    ap.add_argument("--repeat", type=int, default=3, help="시간 측정 반복(최고값 사용)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", type=str, default=None, help="결과 JSON 경로")
+    ap.add_argument("--compare", type=str, default=None, help="기준 JSON — 회귀가 있으면 exit 1")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="허용 저하 비율(기본 0.15)")
+    args = ap.parse_args(argv)
+
+    results = run_bench(args)
+    if args.out:
+        meta = {"ts": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+                "platform": platform.platform(), "args": {k: v for k, v in vars(args).items()
+                                                          if k not in ("out", "compare")}}
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"[bench] wrote {args.out}")
+    if args.compare:
+        bad = compare(results, args.compare, args.tolerance)
+        if bad:
+            print(f"[bench] {bad} regression(s)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
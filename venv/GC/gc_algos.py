@@ -0,0 +1,453 @@
+# gc_algos.py — safe & unified
+from heapq import nsmallest
+
+try:
+    import numpy as np
+except ImportError:  # numpy 없으면 순수 파이썬 경로만 사용
+    np = None
+
+# ---------- 실행 시 설정(run_sim.py 가 config_* 로 주입) ----------
+_CAT_WEIGHTS = {"alpha": 0.55, "beta": 0.25, "gamma": 0.15, "delta": 0.05}
+_CAT_EXT = {"cold_bias": 1.0, "trim_age_bonus": 0.0}
+_PREFETCH_K = 1
+
+def config_cat_weights(**weights):
+    """cat_policy 기본 가중치(alpha/beta/gamma/delta) 변경."""
+    for k, v in weights.items():
+        if k not in _CAT_WEIGHTS:
+            raise ValueError(f"unknown CAT weight: {k}")
+        if v is not None:
+            _CAT_WEIGHTS[k] = float(v)
+
+def config_cold_bias(bias):
+    """cold 풀 블록의 CAT 점수 배율(1.0 = 끔)."""
+    _CAT_EXT["cold_bias"] = 1.0 if bias is None else float(bias)
+
+def config_trim_age_bonus(bonus):
+    """CAT 점수에 bonus * (trimmed_pages / used) 가산(0.0 = 끔)."""
+    _CAT_EXT["trim_age_bonus"] = 0.0 if bonus is None else float(bonus)
+
+def config_victim_prefetch_k(k):
+    """한 번의 점수 계산으로 뽑아 둘 victim 후보 수(1 = prefetch 없음)."""
+    global _PREFETCH_K
+    _PREFETCH_K = max(1, int(k or 1))
+
+def victim_prefetch_k():
+    return _PREFETCH_K
+
+def reset_config():
+    """config_* 설정을 초기값으로(한 프로세스에서 여러 실행을 돌리는 스윕용)."""
+    global _PREFETCH_K
+    _CAT_WEIGHTS.update(alpha=0.55, beta=0.25, gamma=0.15, delta=0.05)
+    _CAT_EXT.update(cold_bias=1.0, trim_age_bonus=0.0)
+    _PREFETCH_K = 1
+
+# ---------- 공통 헬퍼 ----------
+def _block_used(b):
+    return int(getattr(b, "valid_count", 0)) + int(getattr(b, "invalid_count", 0))
+
+def _hotness(b):
+    # 없으면 0.0(차가움)으로 간주
+    return float(getattr(b, "inv_ewma", 0.0))
+
+def _last_activity(b):
+    lp = int(getattr(b, "last_prog_step", 0))
+    li = int(getattr(b, "last_invalid_step", 0))
+    return max(lp, li)
+
+def _wear(b):
+    return int(getattr(b, "erase_count", 0))
+
+def _victim_index(blocks):
+    """장치가 증분 victim 인덱스(victim_index.VictimIndex)를 달아 두었으면 반환."""
+    return getattr(blocks, "victim_index", None)
+
+# ---------- 블록 단위 점수식 (전수 스캔/증분 인덱스 공용) ----------
+def _cb_score(b, used):
+    u = (getattr(b, "valid_count", 0) / used)
+    age_proxy = 1.0 / (1.0 + _wear(b))
+    return (1.0 - u) * age_proxy
+
+def _bsgc_score(b, used, alpha, beta, max_erase):
+    invalid_ratio = getattr(b, "invalid_count", 0) / used
+    wear_norm = (_wear(b) / max_erase) if max_erase > 0 else 0.0
+    return alpha * invalid_ratio + beta * (1.0 - wear_norm)
+
+def _cat_score(b, used, alpha, beta, gamma, delta, last_max, age_den, max_erase):
+    invalid_ratio = getattr(b, "invalid_count", 0) / used
+    hotness = _hotness(b)
+    age_norm = (last_max - _last_activity(b)) / age_den
+    wear_norm = (_wear(b) / max_erase) if max_erase > 0 else 0.0
+    return alpha*invalid_ratio + beta*(1.0 - hotness) + gamma*age_norm + delta*(1.0 - wear_norm)
+
+def _atcb_score(b, used, alpha, beta, gamma, eta, now_step, age_den, max_erase):
+    u = getattr(b, "valid_count", 0) / used
+    inv = 1.0 - u
+    wear_norm = (_wear(b) / max_erase) if max_erase > 0 else 0.0
+    age_norm = (now_step - _last_activity(b)) / age_den
+    hot = _hotness(b)
+    return alpha*inv + beta*(1.0 - wear_norm) + gamma*age_norm + eta*(1.0 - hot)
+
+def _re50315_score(b, used, K, now_step, age_den, max_erase):
+    u = getattr(b, "valid_count", 0) / used
+    inv = 1.0 - u
+    wear_norm = (_wear(b) / max_erase) if max_erase > 0 else 0.0
+    age_norm = (now_step - _last_activity(b)) / age_den
+    return inv + K*age_norm + (1.0 - wear_norm)
+
+def _cat_ext(b, used, s):
+    """CAT 확장 항(TRIM age 보너스, cold 풀 배율). 기본 설정이면 s 그대로."""
+    bonus = _CAT_EXT["trim_age_bonus"]
+    if bonus != 0.0:
+        s = s + bonus * (int(getattr(b, "trimmed_pages", 0)) / used)
+    bias = _CAT_EXT["cold_bias"]
+    if bias != 1.0 and getattr(b, "pool", "gen") == "cold":
+        s = s * bias
+    return s
+
+# ---------- 열(column) 단위 일괄 점수 계산 ----------
+_POLICY_NAMES = {
+    "greedy": "greedy", "cb": "cb", "cost_benefit": "cb", "bsgc": "bsgc", "cat": "cat",
+    "atcb": "atcb", "atcb_policy": "atcb", "re50315": "re50315", "re50315_policy": "re50315",
+}
+
+def _policy_params(name, params):
+    """정책별 기본 하이퍼파라미터 + 호출자가 준 값."""
+    if name == "bsgc":
+        base = {"alpha": 0.7, "beta": 0.3}
+    elif name == "cat":
+        base = dict(_CAT_WEIGHTS)
+    elif name == "atcb":
+        base = {"alpha": 0.5, "beta": 0.3, "gamma": 0.1, "eta": 0.1, "now_step": None}
+    elif name == "re50315":
+        base = {"K": 1.0, "now_step": None}
+    else:
+        base = {}
+    base.update({k: v for k, v in params.items() if v is not None})
+    return base
+
+def block_columns(blocks):
+    """
+    정책 점수에 필요한 블록 카운터를 열 단위로 모은다.
+    blocks.columns() 가 있으면(CompactSSD) 장치 배열을 그대로 쓰고(numpy면 복사 없음),
+    아니면 블록 객체를 한 번만 훑어 만든다.
+    keys: valid, invalid, erase, last_prog, last_invalid, hot, trimmed, cold
+    (columns()가 cold 대신 stream 코드 배열을 주면 stream == 2 로 변환)
+    """
+    cols_fn = getattr(blocks, "columns", None)
+    if cols_fn is not None:
+        cols = cols_fn()
+    else:
+        cols = {
+            "valid": [int(getattr(b, "valid_count", 0)) for b in blocks],
+            "invalid": [int(getattr(b, "invalid_count", 0)) for b in blocks],
+            "erase": [_wear(b) for b in blocks],
+            "last_prog": [int(getattr(b, "last_prog_step", 0)) for b in blocks],
+            "last_invalid": [int(getattr(b, "last_invalid_step", 0)) for b in blocks],
+            "hot": [_hotness(b) for b in blocks],
+            "trimmed": [int(getattr(b, "trimmed_pages", 0)) for b in blocks],
+            "cold": [getattr(b, "pool", "gen") == "cold" for b in blocks],
+        }
+    stream = cols.pop("stream", None)
+    if stream is not None:
+        cols["cold"] = [c == 2 for c in stream] if np is None else np.frombuffer(stream, dtype=np.uint8) == 2
+    if np is not None:
+        cols = {k: np.asarray(v) for k, v in cols.items()}
+        cols["cold"] = cols["cold"].astype(bool)
+    return cols
+
+def _np_scores(name, c, p):
+    """numpy 열 연산으로 전 블록 점수 계산(스칼라 점수식과 같은 연산 순서). 미사용 블록 = -inf."""
+    valid = c["valid"].astype(np.int64)
+    invalid = c["invalid"].astype(np.int64)
+    erase = c["erase"].astype(np.int64)
+    used = valid + invalid
+    mask = used > 0
+    safe = np.where(mask, used, 1)
+    n = used.size
+
+    if name == "greedy":
+        s = invalid.astype(np.float64)
+    elif name == "cb":
+        u = valid / safe
+        s = (1.0 - u) * (1.0 / (1.0 + erase))
+    else:
+        max_erase = int(erase.max()) if n else 0
+        wear_norm = (erase / max_erase) if max_erase > 0 else np.zeros(n)
+        if name == "bsgc":
+            s = p["alpha"] * (invalid / safe) + p["beta"] * (1.0 - wear_norm)
+        else:
+            la = np.maximum(c["last_prog"].astype(np.int64), c["last_invalid"].astype(np.int64))
+            last_min = int(la.min()) if n else 0
+            last_max = int(la.max()) if n else 0
+            hot = c["hot"].astype(np.float64)
+            if name == "cat":
+                age_norm = (last_max - la) / max(1, last_max - last_min)
+                s = (p["alpha"] * (invalid / safe) + p["beta"] * (1.0 - hot)
+                     + p["gamma"] * age_norm + p["delta"] * (1.0 - wear_norm))
+                if _CAT_EXT["trim_age_bonus"] != 0.0:
+                    s = s + _CAT_EXT["trim_age_bonus"] * (c["trimmed"].astype(np.int64) / safe)
+                if _CAT_EXT["cold_bias"] != 1.0:
+                    s = np.where(c["cold"], s * _CAT_EXT["cold_bias"], s)
+            else:
+                now_step = last_max if p.get("now_step") is None else p["now_step"]
+                age_norm = (now_step - la) / max(1, now_step - last_min)
+                inv = 1.0 - valid / safe
+                if name == "atcb":
+                    s = (p["alpha"] * inv + p["beta"] * (1.0 - wear_norm)
+                         + p["gamma"] * age_norm + p["eta"] * (1.0 - hot))
+                else:  # re50315
+                    s = inv + p["K"] * age_norm + (1.0 - wear_norm)
+    return np.where(mask, s, -np.inf)
+
+def _py_scores(name, blocks, p):
+    """numpy 없을 때: 스칼라 점수식으로 같은 결과(list, 미사용 블록 = -inf)."""
+    blocks = list(blocks)
+    wears = [_wear(b) for b in blocks]
+    max_erase = max(wears) if wears else 0
+    lasts = [_last_activity(b) for b in blocks]
+    last_min = min(lasts) if lasts else 0
+    last_max = max(lasts) if lasts else 0
+    now_step = last_max if p.get("now_step") is None else p["now_step"]
+    out = []
+    for b in blocks:
+        used = _block_used(b)
+        if used == 0:
+            out.append(float("-inf"))
+        elif name == "greedy":
+            out.append(float(getattr(b, "invalid_count", 0)))
+        elif name == "cb":
+            out.append(_cb_score(b, used))
+        elif name == "bsgc":
+            out.append(_bsgc_score(b, used, p["alpha"], p["beta"], max_erase))
+        elif name == "cat":
+            s = _cat_score(b, used, p["alpha"], p["beta"], p["gamma"], p["delta"],
+                           last_max, max(1, last_max - last_min), max_erase)
+            out.append(_cat_ext(b, used, s))
+        elif name == "atcb":
+            out.append(_atcb_score(b, used, p["alpha"], p["beta"], p["gamma"], p["eta"],
+                                   now_step, max(1, now_step - last_min), max_erase))
+        else:
+            out.append(_re50315_score(b, used, p["K"], now_step, max(1, now_step - last_min), max_erase))
+    return out
+
+def score_blocks(name, blocks, **params):
+    """
+    정책 name 의 점수를 모든 블록에 대해 한 번에 계산.
+    numpy가 있으면 ndarray, 없으면 list. 미사용(used==0) 블록은 -inf.
+    """
+    n = _POLICY_NAMES.get((name or "").lower())
+    if n is None:
+        raise ValueError(f"unknown policy: {name}")
+    p = _policy_params(n, params)
+    if np is not None:
+        return _np_scores(n, block_columns(blocks), p)
+    return _py_scores(n, blocks, p)
+
+def topk_victims(name, blocks, k=1, **params):
+    """
+    점수 상위 k개 victim 인덱스(점수 내림차순, 동점이면 작은 인덱스 먼저).
+    k=1 의 결과는 같은 이름의 *_policy 가 고르는 victim과 같다.
+    """
+    k = max(1, int(k))
+    s = score_blocks(name, blocks, **params)
+    if np is None:
+        top = nsmallest(k, ((-v, i) for i, v in enumerate(s) if v != float("-inf")))
+        return [i for _, i in top]
+    idx = np.flatnonzero(s > -np.inf)
+    if idx.size == 0:
+        return []
+    sv = s[idx]
+    if k < idx.size:
+        kth = np.partition(sv, idx.size - k)[idx.size - k]  # k번째로 큰 점수
+        keep = sv >= kth
+        idx, sv = idx[keep], sv[keep]
+    order = np.lexsort((idx, -sv))[:k]
+    return [int(i) for i in idx[order]]
+
+def _best(name, blocks, **params):
+    top = topk_victims(name, blocks, 1, **params)
+    return top[0] if top else None
+
+# ---------- 기본 정책들 ----------
+def greedy_policy(blocks):
+    """invalid 페이지가 가장 많은 블록을 victim으로"""
+    vi = _victim_index(blocks)
+    if vi is not None:
+        return vi.greedy()
+    if np is not None:
+        return _best("greedy", blocks)
+    best_idx, best_invalid = None, -1
+    for i, b in enumerate(blocks):
+        used = _block_used(b)
+        if used == 0:
+            continue
+        inv = int(getattr(b, "invalid_count", 0))
+        if inv > best_invalid:
+            best_invalid = inv
+            best_idx = i
+    return best_idx
+
+def cb_policy(blocks):
+    """
+    Cost-Benefit의 단순 근사:
+      score = (1 - u) * age_proxy
+      u = valid_ratio, age_proxy = 1 / (1 + erase_count)
+    """
+    vi = _victim_index(blocks)
+    if vi is not None:
+        return vi.cb()
+    if np is not None:
+        return _best("cb", blocks)
+    best_idx, best_score = None, float("-inf")
+    for i, b in enumerate(blocks):
+        used = _block_used(b)
+        if used == 0:
+            continue
+        s = _cb_score(b, used)
+        if s > best_score:
+            best_score, best_idx = s, i
+    return best_idx
+
+def bsgc_policy(blocks, alpha=0.7, beta=0.3):
+    """
+    score = alpha * invalid_ratio + beta * (1 - wear_norm)
+    """
+    vi = _victim_index(blocks)
+    if vi is not None:
+        return vi.bsgc(alpha, beta)
+    if np is not None:
+        return _best("bsgc", blocks, alpha=alpha, beta=beta)
+    wears = [_wear(b) for b in blocks]
+    max_erase = max(wears) if wears else 0
+    best_idx, best_score = None, float("-inf")
+    for i, b in enumerate(blocks):
+        used = _block_used(b)
+        if used == 0:
+            continue
+        s = _bsgc_score(b, used, alpha, beta, max_erase)
+        if s > best_score:
+            best_score, best_idx = s, i
+    return best_idx
+
+# ---------- CAT (Cold-Aware with Temperature & Age) ----------
+def cat_policy(blocks, alpha=None, beta=None, gamma=None, delta=None):
+    """
+    score = α*invalid_ratio + β*(1-hotness) + γ*age_norm + δ*(1-wear_norm)
+    가중치 기본값은 config_cat_weights() 설정(초기 0.55/0.25/0.15/0.05),
+    config_trim_age_bonus / config_cold_bias 가 켜져 있으면 확장 항 적용.
+    """
+    w = _policy_params("cat", dict(alpha=alpha, beta=beta, gamma=gamma, delta=delta))
+    alpha, beta, gamma, delta = w["alpha"], w["beta"], w["gamma"], w["delta"]
+    if np is not None:
+        return _best("cat", blocks, **w)
+    lasts = [_last_activity(b) for b in blocks]
+    if not lasts:
+        return None
+    last_max, last_min = max(lasts), min(lasts)
+    age_den = max(1, last_max - last_min)
+
+    wears = [_wear(b) for b in blocks]
+    max_erase = max(wears) if wears else 0
+
+    best_idx, best_score = None, float("-inf")
+    for i, b in enumerate(blocks):
+        used = _block_used(b)
+        if used == 0:
+            continue
+        s = _cat_score(b, used, alpha, beta, gamma, delta, last_max, age_den, max_erase)
+        s = _cat_ext(b, used, s)
+        if s > best_score:
+            best_score, best_idx = s, i
+    return best_idx
+
+# ---------- ATCB / RE50315 (경량 비교용) ----------
+def atcb_policy(blocks, alpha=0.5, beta=0.3, gamma=0.1, eta=0.1, now_step=None):
+    """
+    score = α*(1-u) + β*(1-wear_norm) + γ*age_norm + η*(1-hotness)
+    """
+    if np is not None:
+        return _best("atcb", blocks, alpha=alpha, beta=beta, gamma=gamma, eta=eta, now_step=now_step)
+    used_list = [_block_used(b) for b in blocks]
+    if not any(used_list):
+        return None
+
+    wears = [_wear(b) for b in blocks]
+    max_erase = max(wears) if wears else 0
+
+    lasts = [_last_activity(b) for b in blocks]
+    last_min = min(lasts) if lasts else 0
+    if now_step is None:
+        now_step = max(lasts) if lasts else 0
+    age_den = max(1, now_step - last_min)
+
+    best_idx, best_score = None, float("-inf")
+    for i, b in enumerate(blocks):
+        used = _block_used(b)
+        if used == 0:
+            continue
+        s = _atcb_score(b, used, alpha, beta, gamma, eta, now_step, age_den, max_erase)
+        if s > best_score:
+            best_score, best_idx = s, i
+    return best_idx
+
+def re50315_policy(blocks, K=1.0, now_step=None):
+    """
+    score = (1-u) + K*age_norm + (1-wear_norm)
+    """
+    if np is not None:
+        return _best("re50315", blocks, K=K, now_step=now_step)
+    used_list = [_block_used(b) for b in blocks]
+    if not any(used_list):
+        return None
+
+    wears = [_wear(b) for b in blocks]
+    max_erase = max(wears) if wears else 0
+
+    lasts = [_last_activity(b) for b in blocks]
+    last_min = min(lasts) if lasts else 0
+    if now_step is None:
+        now_step = max(lasts) if lasts else 0
+    age_den = max(1, now_step - last_min)
+
+    best_idx, best_score = None, float("-inf")
+    for i, b in enumerate(blocks):
+        used = _block_used(b)
+        if used == 0:
+            continue
+        s = _re50315_score(b, used, K, now_step, age_den, max_erase)
+        if s > best_score:
+            best_score, best_idx = s, i
+    return best_idx
+
+# ---------- top-K (victim prefetch) ----------
+def cat_policy_topk(blocks, k=1, **weights):
+    """(best, top-k 리스트). 한 번의 점수 계산으로 여러 번의 GC 후보를 확보."""
+    top = topk_victims("cat", blocks, k, **weights)
+    return (top[0] if top else None), top
+
+# 각 정책에 policy.topk(blocks, k) 를 달아 두면 Simulator가 prefetch에 사용
+greedy_policy.topk = lambda blocks, k: topk_victims("greedy", blocks, k)
+cb_policy.topk = lambda blocks, k: topk_victims("cb", blocks, k)
+bsgc_policy.topk = lambda blocks, k: topk_victims("bsgc", blocks, k)
+cat_policy.topk = lambda blocks, k: topk_victims("cat", blocks, k)
+atcb_policy.topk = lambda blocks, k: topk_victims("atcb", blocks, k)
+re50315_policy.topk = lambda blocks, k: topk_victims("re50315", blocks, k)
+
+# ---------- 단일 팩토리 (중복 제거) ----------
+def get_gc_policy(name: str):
+    n = (name or "").lower()
+    if n == "greedy":  return greedy_policy
+    if n in ("cb", "cost_benefit"): return cb_policy
+    if n == "bsgc":    return bsgc_policy
+    if n == "cat":     return cat_policy
+    if n in ("atcb", "atcb_policy"):
+        # 하이퍼파라/now_step은 run_sim.py에서 partial/래핑으로 주입 가능
+        p = lambda blocks: atcb_policy(blocks)
+        p.topk = atcb_policy.topk
+        return p
+    if n in ("re50315", "re50315_policy"):
+        p = lambda blocks: re50315_policy(blocks)
+        p.topk = re50315_policy.topk
+        return p
+    raise ValueError(f"unknown policy: {name}")
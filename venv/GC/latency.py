@@ -0,0 +1,248 @@
+"""
+latency.py — 시뮬레이션 장치 시간(µs) 기준 이산 사건 타이밍 엔진
+
+models.SSD/CompactSSD 는 상태만 바꾸고 시간 개념이 없다(gc_avg_s 는 파이썬 실행 시간).
+이 엔진은 Simulator 가 알려주는 사건(호스트 write/trim, FG/BG GC)에 SimConfig 의
+지연 프로파일(host_prog_us, erase_us, migrate_read_prog_us, io_profile)을
+적용해 장치 시간을 진행시키고 호스트 op 지연을 고정 메모리 히스토그램에 기록한다.
+
+장치 모델:
+  - channels × dies_per_channel 개의 die. 물리 페이지는 die 에 페이지 단위로 스트라이핑
+    (die = ppn % D, channel = die // dies_per_channel) → 블록 하나가 모든 die 에 걸친 superblock
+  - 호스트 write: 채널 전송(channel_xfer_us) 후 해당 die 에서 program(host_prog_us)
+  - 호스트 read 는 워크로드에 없으므로 모델링하지 않음(host_read_us 는 migrate_read_prog_us 파생에만 쓰임)
+  - GC: die 내부 copyback(채널 미사용). 이동 페이지를 die 에 고르게 나눠 migrate_read_prog_us,
+    각 die 에서 erase_us. GC 시간 = 가장 늦게 끝나는 die
+  - 호스트 도착: closed-loop QD1(interarrival_us=0, 앞 op 완료 시 다음 도착) 또는
+    고정 간격/포아송 open-loop
+큐잉:
+  - FG GC: 트리거한 호스트 op 와 그 뒤 op 들은 GC 완료까지 디스패치되지 않음(GC stall)
+  - BG GC: die 별 미처리 작업(debt)으로 쌓였다가, 호스트 op 가 그 die 에 오기 전의 idle 구간에
+    채워 넣음(호스트를 지연시키지 않음). FG GC 시작 전 남은 debt 는 먼저 처리(stall 에 포함)
+"""
+from __future__ import annotations
+import math
+import random
+from array import array
+from typing import Dict, Optional
+
+
+class LatencyHistogram:
+    """고정 메모리 log-linear 히스토그램(µs 정수 해상도, 상대 오차 ≈ 2^-sub_bits).
+    [0, 2^sub_bits) 는 1µs 단위, 그 위는 2의 거듭제곱 구간마다 2^(sub_bits-1) 개 버킷."""
+
+    def __init__(self, max_us: int = 1 << 36, sub_bits: int = 5):
+        self._s = int(sub_bits)
+        self._sub = 1 << self._s
+        self._half = self._sub >> 1
+        self._max_idx = self._index(int(max_us))
+        self.counts = array("q", bytes(8 * (self._max_idx + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, v: int) -> int:
+        if v < self._sub:
+            return v
+        shift = v.bit_length() - self._s
+        return self._sub + (shift - 1) * self._half + ((v >> shift) - self._half)
+
+    def _value(self, idx: int) -> float:
+        """버킷 대표값(구간 중앙)."""
+        if idx < self._sub:
+            return float(idx)
+        shift = (idx - self._sub) // self._half + 1
+        mant = (idx - self._sub) % self._half + self._half
+        lo = mant << shift
+        return lo + ((1 << shift) - 1) / 2.0
+
+    def add(self, us: float) -> None:
+        i = self._index(int(us)) if us > 0 else 0
+        self.counts[i if i <= self._max_idx else self._max_idx] += 1
+        self.count += 1
+        self.total += us
+        if us < self.min:
+            self.min = us
+        if us > self.max:
+            self.max = us
+
+    def percentile(self, p: float) -> float:
+        """p ∈ [0,100]. 비어 있으면 0.0. 최댓값을 넘지 않도록 클램프."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(math.ceil(self.count * p / 100.0)))
+        acc = 0
+        for i, c in enumerate(self.counts):
+            acc += c
+            if acc >= rank:
+                return min(self._value(i), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class LatencyEngine:
+    """Simulator 가 사건을 알려주면 장치 시간을 진행시키는 타이밍 모델."""
+
+    def __init__(self,
+                 host_prog_us: float = 100,
+                 erase_us: float = 1500, migrate_read_prog_us: float = 150,
+                 channels: int = 4, dies_per_channel: int = 2, channel_xfer_us: float = 10,
+                 interarrival_us: float = 0.0, arrival: str = "fixed", seed: int = 42):
+        if channels <= 0 or dies_per_channel <= 0:
+            raise ValueError("channels/dies_per_channel 는 양수여야 합니다")
+        if arrival not in ("fixed", "poisson"):
+            raise ValueError("arrival 은 fixed|poisson 중 하나여야 합니다")
+        self.prog_us = float(host_prog_us)
+        self.erase_us = float(erase_us)
+        self.migrate_us = float(migrate_read_prog_us)
+        self.channels = int(channels)
+        self.dies_per_channel = int(dies_per_channel)
+        self.num_dies = self.channels * self.dies_per_channel
+        self.xfer_us = float(channel_xfer_us)
+        self.interarrival_us = float(interarrival_us)
+        self.arrival = arrival
+        self._rng = random.Random(seed)
+
+        self.die_busy = [0.0] * self.num_dies
+        self.chan_busy = [0.0] * self.channels
+        self.bg_debt = [0.0] * self.num_dies
+
+        self.now = 0.0            # 현재 호스트 op 도착 시각
+        self._next_arrival = 0.0
+        self._ftl_ready = 0.0     # FG GC 완료 전까지 호스트 op 디스패치 불가
+        self._last_done = 0.0
+
+        self.hist = LatencyHistogram()
+        self.gc_hist = LatencyHistogram()   # GC 1회 자체 작업(FG+BG, 가장 늦은 die) — 밀린 BG 처리 시간 제외
+        self.host_writes = 0
+        self.host_trims = 0
+        self.fg_gc_count = 0
+        self.bg_gc_count = 0
+        self.gc_stall_us = 0.0    # FG GC 로 호스트가 막힌 총 시간(밀린 BG 처리 포함)
+        self.bg_gc_us = 0.0       # BG GC 로 die 에 부과된 총 작업량(die-µs 중 최대 die 기준)
+
+    @classmethod
+    def from_config(cls, cfg, seed: Optional[int] = None) -> "LatencyEngine":
+        return cls(
+            host_prog_us=cfg.host_prog_us,
+            erase_us=cfg.erase_us, migrate_read_prog_us=cfg.migrate_read_prog_us,
+            channels=getattr(cfg, "channels", 4), dies_per_channel=getattr(cfg, "dies_per_channel", 2),
+            channel_xfer_us=getattr(cfg, "channel_xfer_us", 10),
+            interarrival_us=getattr(cfg, "host_interarrival_us", 0.0),
+            arrival=getattr(cfg, "arrival", "fixed"),
+            seed=cfg.rng_seed if seed is None else seed,
+        )
+
+    # ---------- 호스트 ----------
+    def arrive(self) -> float:
+        """다음 호스트 op 도착 시각으로 진행."""
+        if self.interarrival_us <= 0.0:
+            t = self._last_done  # closed-loop QD1
+        else:
+            t = self._next_arrival
+            gap = (self._rng.expovariate(1.0 / self.interarrival_us)
+                   if self.arrival == "poisson" else self.interarrival_us)
+            self._next_arrival = t + gap
+        self.now = t
+        return t
+
+    def _drain_bg(self, d: int, until: float) -> None:
+        """die d 의 idle 구간 [die_busy, until) 에 BG GC 작업을 채운다."""
+        debt = self.bg_debt[d]
+        if debt > 0.0:
+            gap = until - self.die_busy[d]
+            if gap > 0.0:
+                done = debt if debt < gap else gap
+                self.die_busy[d] += done
+                self.bg_debt[d] = debt - done
+
+    def host_write(self, ppn: int) -> float:
+        """호스트 write 1페이지(물리 위치 ppn)를 스케줄하고 지연(µs)을 반환."""
+        arrival = self.now
+        dispatch = arrival if arrival > self._ftl_ready else self._ftl_ready
+        d = ppn % self.num_dies
+        c = d // self.dies_per_channel
+        xs = dispatch if dispatch > self.chan_busy[c] else self.chan_busy[c]
+        xe = xs + self.xfer_us
+        self.chan_busy[c] = xe
+        self._drain_bg(d, xe)
+        start = xe if xe > self.die_busy[d] else self.die_busy[d]
+        end = start + self.prog_us
+        self.die_busy[d] = end
+        lat = end - arrival
+        self.hist.add(lat)
+        self.host_writes += 1
+        self._last_done = end
+        return lat
+
+    def host_trim(self) -> None:
+        """TRIM 은 FTL 메타데이터만 갱신(매체 작업 없음) — 지연 기록 없이 개수만."""
+        self.host_trims += 1
+
+    # ---------- GC ----------
+    def _gc_work(self, moved: int, d: int) -> float:
+        q, r = divmod(int(moved), self.num_dies)
+        return (q + (1 if d < r else 0)) * self.migrate_us + self.erase_us
+
+    def fg_gc(self, moved: int) -> float:
+        """포그라운드 GC: 현재 호스트 op 앞에서 실행, 완료까지 호스트 디스패치 차단. 반환: stall(µs).
+        stall 에는 먼저 처리하는 밀린 BG 작업이 포함되지만, gc_hist 에는 이 GC 자체 작업만 넣는다
+        (BG 작업은 bg_gc 에서 이미 기록됨)."""
+        t0 = self.now if self.now > self._ftl_ready else self._ftl_ready
+        end = t0
+        own = 0.0
+        for d in range(self.num_dies):
+            # 밀린 BG 작업이 있으면 먼저 끝낸다
+            s = (t0 if t0 > self.die_busy[d] else self.die_busy[d]) + self.bg_debt[d]
+            self.bg_debt[d] = 0.0
+            w = self._gc_work(moved, d)
+            e = s + w
+            self.die_busy[d] = e
+            if e > end:
+                end = e
+            if w > own:
+                own = w
+        self._ftl_ready = end
+        stall = end - t0
+        self.gc_stall_us += stall
+        self.gc_hist.add(own)
+        self.fg_gc_count += 1
+        return stall
+
+    def bg_gc(self, moved: int) -> None:
+        """백그라운드 GC: die 별 debt 로 쌓아 idle 구간에 배치."""
+        worst = 0.0
+        for d in range(self.num_dies):
+            w = self._gc_work(moved, d)
+            self.bg_debt[d] += w
+            if w > worst:
+                worst = w
+        self.bg_gc_us += worst
+        self.gc_hist.add(worst)
+        self.bg_gc_count += 1
+
+    # ---------- 요약 ----------
+    @property
+    def sim_time_us(self) -> float:
+        return max(max(self.die_busy), max(self.chan_busy), self._ftl_ready)
+
+    def summary(self) -> Dict[str, float]:
+        h = self.hist
+        return {
+            "lat_p50_us": round(h.percentile(50), 3),
+            "lat_p95_us": round(h.percentile(95), 3),
+            "lat_p99_us": round(h.percentile(99), 3),
+            "lat_p999_us": round(h.percentile(99.9), 3),
+            "lat_max_us": round(h.max, 3),
+            "lat_mean_us": round(h.mean, 3),
+            "gc_stall_us": round(self.gc_stall_us, 3),
+            "gc_fg_count": self.fg_gc_count,
+            "gc_bg_count": self.bg_gc_count,
+            "gc_dev_avg_us": round(self.gc_hist.mean, 3),
+            "bg_debt_us": round(max(self.bg_debt), 3),
+            "sim_time_us": round(self.sim_time_us, 3),
+        }
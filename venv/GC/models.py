@@ -0,0 +1,947 @@
+from __future__ import annotations
+from enum import Enum
+from typing import Dict, Tuple, Optional, Callable, List
+from array import array
+import random
+import time
+
+from victim_index import VictimIndex
+from telemetry import GCEventLog
+
+# 결과 호환 버전 — 같은 seed 에서 결과가 달라지는 모델 변경 시 올린다(요약 CSV/스냅샷에 기록).
+#   v1: 호스트 블록을 빈 블록 목록(인덱스 순) 중 마지막 RESERVED_FREE_BLOCKS 개를 뺀 나머지에서 무작위 선택,
+#       빈 블록이 예약분뿐이면 부분 free 블록으로 폴백
+#   v2: free 블록 풀(free_gen/hot/cold)에서 무작위 선택, 예약선은 풀에 있는 블록 수 기준,
+#       호스트 write 의 부분 free 블록 폴백 없음
+MODEL_VERSION = 2
+
+# -----------------------------
+# Basic types
+# -----------------------------
+class PageState(Enum):
+    FREE = 0
+    VALID = 1
+    INVALID = 2
+
+
+class Block:
+    """Physical erase-block with page states and a few counters.
+
+    - 기존 필드/메서드는 그대로 유지
+    - 정책 계산용 헬퍼( invalid_ratio(), wear_norm(), last_activity() )와
+      TRIM 추적용 trimmed_pages 를 추가
+    """
+    def __init__(self, pages_per_block: int):
+        self.pages_per_block = pages_per_block
+        self.pages: List[PageState] = [PageState.FREE] * pages_per_block
+        self.valid_count = 0
+        self.invalid_count = 0
+        self.erase_count = 0
+
+        # timestamps for age/staleness-style policies
+        self.last_invalid_step = 0
+        self.last_prog_step = 0
+
+        # lightweight block temperature (invalid-event EWMA)
+        self.inv_ewma = 0.0
+
+        # optional stream tag ("user"/"hot"/"cold")
+        self.stream_id = "user"
+        self.pool = "gen"  # 'hot' | 'cold' | 'gen' (정책에서 cold-bias 등에 활용)
+
+        # --- new: TRIM 추적(정책에서 TRIM-aware age 보너스 계산 시 사용) ---
+        self.trimmed_pages = 0
+
+        # 소속 장치의 victim 인덱스(있으면 상태 변경 시 통지)
+        self._vi: Optional[VictimIndex] = None
+        self._vi_idx = -1
+
+    def _touch(self) -> None:
+        if self._vi is not None:
+            self._vi.touch(self._vi_idx)
+
+    # -------- properties / helpers --------
+    @property
+    def free_count(self) -> int:
+        return self.pages_per_block - self.valid_count - self.invalid_count
+
+    def invalid_ratio(self) -> float:
+        used = self.valid_count + self.invalid_count
+        return (self.invalid_count / used) if used > 0 else 0.0
+
+    def wear_norm(self, max_erase_seen: int) -> float:
+        return (self.erase_count / max_erase_seen) if max_erase_seen > 0 else 0.0
+
+    def last_activity(self) -> int:
+        """최근 활동 시각(프로그래밍/무효화 두 축 중 더 최신)"""
+        return max(int(self.last_prog_step), int(self.last_invalid_step))
+
+    # -------- low-level ops --------
+    def allocate_free_page(self) -> Optional[int]:
+        """Find first FREE page, flip to VALID, return its index (or None)."""
+        for idx, st in enumerate(self.pages):
+            if st == PageState.FREE:
+                self.pages[idx] = PageState.VALID
+                self.valid_count += 1
+                self._touch()
+                return idx
+        return None
+
+    def invalidate_page(self, page_idx: int, step: int = 0, lam: float = 0.02) -> None:
+        """Mark a VALID page INVALID (out-of-place overwrite effect)."""
+        if self.pages[page_idx] == PageState.VALID:
+            self.pages[page_idx] = PageState.INVALID
+            self.valid_count -= 1
+            self.invalid_count += 1
+            self.last_invalid_step = step
+            # invalid 이벤트 기반 온도(핫니스) EWMA 업데이트
+            self.inv_ewma = (1.0 - lam) * self.inv_ewma + lam * 1.0
+            self._touch()
+
+    def erase(self) -> None:
+        """Erase whole block (reset to FREE, wear++)."""
+        self.pages = [PageState.FREE] * self.pages_per_block
+        self.invalid_count = 0
+        self.valid_count = 0
+        self.erase_count += 1
+        # 블록이 새로워졌으므로 상태/나이 관련 값 리셋
+        self.last_invalid_step = 0
+        self.last_prog_step = 0
+        self.inv_ewma = 0.0
+        self.trimmed_pages = 0
+        self._touch()
+
+
+class BlockList(list):
+    """SSD.blocks: 평범한 list + victim_index 속성(gc_algos 정책이 있으면 인덱스로 조회)."""
+    victim_index: Optional[VictimIndex] = None
+
+
+class FreeBlockPool:
+    """완전히 빈 블록 인덱스 집합 — O(1) add/discard/pick.
+
+    pick(rng)는 시드 고정 rng로 임의 원소를 swap-remove 하므로 재현 가능하고,
+    rng=None 이면 LIFO(마지막에 반납된 블록)로 꺼낸다.
+    """
+    __slots__ = ("_arr", "_pos")
+
+    def __init__(self, num_blocks: int, members=()):
+        self._arr = array("i")
+        self._pos = array("i", [-1]) * num_blocks
+        for i in members:
+            self.add(i)
+
+    def __len__(self) -> int:
+        return len(self._arr)
+
+    def __contains__(self, i: int) -> bool:
+        return self._pos[i] >= 0
+
+    def __iter__(self):
+        return iter(self._arr)
+
+    def add(self, i: int) -> None:
+        if self._pos[i] >= 0:
+            return
+        self._pos[i] = len(self._arr)
+        self._arr.append(i)
+
+    def discard(self, i: int) -> None:
+        k = self._pos[i]
+        if k < 0:
+            return
+        last = self._arr.pop()
+        if k < len(self._arr):
+            self._arr[k] = last
+            self._pos[last] = k
+        self._pos[i] = -1
+
+    def pick(self, rng: Optional[random.Random] = None) -> int:
+        if not self._arr:
+            raise IndexError("empty FreeBlockPool")
+        i = self._arr[rng.randrange(len(self._arr))] if rng is not None else self._arr[-1]
+        self.discard(i)
+        return i
+
+
+# stream_id -> Block.pool
+_POOL_OF_STREAM = {"user": "gen", "hot": "hot", "cold": "cold"}
+
+
+# -----------------------------
+# SSD model
+# -----------------------------
+class SSD:
+    """
+    Minimal SSD:
+      - write_lpn(lpn): host write (out-of-place)
+      - trim_lpn(lpn): logical delete (invalidate)
+      - collect_garbage(policy): move VALID pages then erase victim
+    Extras:
+      - optional 3-stream routing (user/hot/cold) during writes/migration
+      - GC destination guarantee logic (no-destination crash prevention)
+      - free-block pools (free_gen/free_hot/free_cold) + free page/block 카운터:
+        호스트 write 비용이 블록 수와 무관
+    """
+
+    # 최소 예약 free 블록 수
+    RESERVED_FREE_BLOCKS = 2
+
+    def __init__(self, num_blocks: int, pages_per_block: int, rng_seed: int = 42):
+        # geometry & state
+        self.num_blocks = num_blocks
+        self.pages_per_block = pages_per_block
+        self.blocks = BlockList(Block(pages_per_block) for _ in range(num_blocks))
+        self.victim_index = VictimIndex(self.blocks)
+        self.blocks.victim_index = self.victim_index
+        for i, b in enumerate(self.blocks):
+            b._vi, b._vi_idx = self.victim_index, i
+        self.rng = random.Random(rng_seed)
+
+        # free-block pools (Block.pool 과 같은 이름) — 처음엔 전부 gen
+        self.free_gen = FreeBlockPool(num_blocks, range(num_blocks))
+        self.free_hot = FreeBlockPool(num_blocks)
+        self.free_cold = FreeBlockPool(num_blocks)
+        self.free_pools = {"gen": self.free_gen, "hot": self.free_hot, "cold": self.free_cold}
+        self._free_pages = num_blocks * pages_per_block
+
+        # clock & temperature
+        self._step = 0
+        self.ewma_lambda = 0.02
+
+        # metrics
+        self.host_write_pages = 0
+        self.device_write_pages = 0
+        self.gc_count = 0
+        self.gc_total_time = 0.0
+        # GC 이벤트: 열 지향 ring buffer(상한 있음, 필요 시 gc_log.spill_to(path)로 디스크에 이어 쓰기)
+        self.gc_log = GCEventLog()
+
+        # mappings
+        self.mapping: Dict[int, Tuple[int, int]] = {}            # LPN -> (b, p)
+        self.reverse_map: Dict[Tuple[int, int], int] = {}        # (b, p) -> LPN
+
+        # write heads
+        self.active_block_idx: Optional[int] = None  # single stream
+        self.three_stream = False
+        self.stream_active = {"user": None, "hot": None, "cold": None}
+
+        # hotness (for 3-stream)
+        self.hotness_mode = "recency"            # or "oracle"
+        self.recency_tau = 200                   # recent updates <= tau => hot
+        self.oracle_hot_cut: Optional[int] = None
+        self.lpn_last_write: Dict[int, int] = {} # LPN -> last host-write step
+
+        # optional score probe for debugging
+        self.score_probe: Optional[Callable] = None
+        self.score_probe_every = 1  # N번째 GC마다만 probe(전체 블록 콜백이라 비쌈)
+
+    # ---------- derived ----------
+    @property
+    def gc_event_log(self) -> List[Dict]:
+        """메모리에 남은 GC 이벤트(dict) — 이전 버전 호환용 읽기 전용 뷰."""
+        return list(self.gc_log)
+
+    @property
+    def gc_durations(self) -> List[float]:
+        return self.gc_log.column("gc_s")
+
+    @property
+    def total_pages(self) -> int:
+        return self.num_blocks * self.pages_per_block
+
+    @property
+    def free_pages(self) -> int:
+        return self._free_pages
+
+    @property
+    def free_blocks(self) -> int:
+        # 풀에 있는 블록 + (erase 직후 등) 아직 비어 있는 헤드
+        heads = {self.active_block_idx, *self.stream_active.values()}
+        heads.discard(None)
+        empty_heads = sum(1 for h in heads if self.blocks[h].free_count == self.pages_per_block)
+        return self._pooled_free() + empty_heads
+
+    def _pooled_free(self) -> int:
+        return len(self.free_gen) + len(self.free_hot) + len(self.free_cold)
+
+    def lookup(self, lpn: int) -> Optional[Tuple[int, int]]:
+        """LPN -> (block, page) 또는 None (CompactSSD.lookup 과 같은 인터페이스)."""
+        return self.mapping.get(lpn)
+
+    # ---------- low-level ops ----------
+    def erase_block(self, block_idx: int) -> None:
+        """Block.erase() 래퍼: free 카운터/풀/헤드 정리."""
+        blk = self.blocks[block_idx]
+        for fp in self.free_pools.values():
+            fp.discard(block_idx)
+        self._free_pages += self.pages_per_block - blk.free_count
+        blk.erase()
+        # 헤드였다면 내려놓고 원래 풀로 반납
+        if self.active_block_idx == block_idx:
+            self.active_block_idx = None
+        for s, h in self.stream_active.items():
+            if h == block_idx:
+                self.stream_active[s] = None
+        self.free_pools.get(blk.pool, self.free_gen).add(block_idx)
+
+    def _allocate(self, block_idx: int) -> Optional[int]:
+        p = self.blocks[block_idx].allocate_free_page()
+        if p is not None:
+            self._free_pages -= 1
+        return p
+
+    # ---------- free-block pools ----------
+    def _reclaim_dead_block(self, exclude_idx: int | None = None) -> bool:
+        """풀이 바닥났을 때만 쓰는 드문 경로: all-invalid 블록 하나를 erase 해 풀로 돌린다."""
+        for i, b in enumerate(self.blocks):
+            if i != exclude_idx and b.valid_count == 0 and b.invalid_count > 0:
+                self.erase_block(i)
+                return True
+        return False
+
+    def _take_free_block(self, pool: str = "gen", exclude_idx: int | None = None,
+                         *, for_host: bool = False) -> int | None:
+        """
+        free 풀에서 빈 블록 하나를 꺼낸다(요청 풀 → gen → hot → cold 순으로 차용).
+        for_host=True 이면 예약선(RESERVED_FREE_BLOCKS) 아래로는 내주지 않는다.
+        """
+        for attempt in range(2):
+            if not (for_host and self._pooled_free() <= self.RESERVED_FREE_BLOCKS):
+                for name in (pool, "gen", "hot", "cold"):
+                    fp = self.free_pools[name]
+                    if len(fp):
+                        i = fp.pick(self.rng)
+                        self.blocks[i].pool = pool
+                        return i
+            if attempt == 0 and not self._reclaim_dead_block(exclude_idx):
+                break
+        return None
+
+    # ---------- destination guarantee helpers ----------
+    def _ensure_active_block(self, exclude_idx: int | None = None, *, for_host: bool = False) -> int | None:
+        """
+        활성(목적지) 블록 보장.
+        - for_host=True: 예약선(RESERVED_FREE_BLOCKS)을 넘지 않음
+        - for_host=False: GC가 목적지 확보할 때 (예약 포함 허용)
+        """
+        cand = self.active_block_idx
+        if cand is not None and cand != exclude_idx and self.blocks[cand].free_count > 0:
+            return cand
+        j = self._take_free_block("gen", exclude_idx, for_host=for_host)
+        if j is not None:
+            self.active_block_idx = j
+            self.blocks[j].stream_id = "user"
+        return j
+
+    def _alloc_block_for_migration(self, victim_idx: int, lpn: int) -> int | None:
+        """
+        마이그레이션 목적지 블록 선택(GC는 예약 블록 사용 허용).
+        - 단일 스트림: 활성 블록 사용
+        - 3-stream: victim stream 보존
+        """
+        if self.three_stream:
+            stream = getattr(self.blocks[victim_idx], "stream_id", "user")
+            return self._ensure_stream_block(stream, exclude_idx=victim_idx, for_host=False)
+        return self._ensure_active_block(exclude_idx=victim_idx, for_host=False)
+
+    # ---------- GC ----------
+    def _fallback_victim(self) -> Optional[int]:
+        """정책이 None을 돌려줄 때: invalid_count 최대 블록(동점이면 앞 인덱스)."""
+        if not self.blocks:
+            return None
+        g = self.victim_index.greedy()
+        return g if g is not None and self.blocks[g].invalid_count > 0 else 0
+
+    def collect_garbage(self, policy: callable, cause: str = "manual") -> None:
+        """
+        - policy(blocks) -> victim_idx
+        - victim VALID 페이지 마이그레이션 후 erase
+        - 목적지 블록 보장 로직 포함(크래시 방지)
+        """
+        # 1) victim 선택
+        victim_idx = policy(self.blocks)
+        if victim_idx is None:
+            victim_idx = self._fallback_victim()
+            if victim_idx is None:
+                raise RuntimeError("No victim block available for GC")
+        victim = self.blocks[victim_idx]
+
+        # 2) victim이 all-invalid면 목적지 없이 즉시 erase
+        if victim.valid_count == 0 and victim.invalid_count > 0:
+            self.erase_block(victim_idx)
+            # (선택) 이벤트 기록 가능
+            return
+
+        # (옵션) 점수/스냅샷
+        probe_detail = None
+        if self.score_probe is not None and self.gc_count % max(1, self.score_probe_every) == 0:
+            try:
+                snap = self.score_probe(self.blocks)
+                if isinstance(snap, dict):
+                    probe_detail = snap.get(victim_idx)
+            except Exception:
+                probe_detail = None
+
+        # victim 상태 스냅샷
+        v_valid, v_invalid = victim.valid_count, victim.invalid_count
+        v_ewma, v_erase = victim.inv_ewma, victim.erase_count
+
+        t0 = time.perf_counter()
+        moved_valid = 0
+
+        # 3) VALID 페이지 마이그레이션
+        for p_idx, st in enumerate(victim.pages):
+            if st != PageState.VALID:
+                continue
+            lpn = self.reverse_map.get((victim_idx, p_idx))
+            if lpn is None:
+                continue
+
+            dst_idx = self._alloc_block_for_migration(victim_idx, lpn)
+            if dst_idx is None:
+                raise RuntimeError("No destination block for migration")
+            dst_p = self._allocate(dst_idx)
+            if dst_p is None:
+                raise RuntimeError("Allocator inconsistency during GC")
+
+            # 새 위치 기록
+            self.blocks[dst_idx].last_prog_step = self._step
+            self.blocks[dst_idx]._touch()
+            victim.invalidate_page(p_idx, step=self._step, lam=self.ewma_lambda)
+            self.reverse_map.pop((victim_idx, p_idx), None)
+            self.mapping[lpn] = (dst_idx, dst_p)
+            self.reverse_map[(dst_idx, dst_p)] = lpn
+            self.device_write_pages += 1
+            moved_valid += 1
+
+        # 4) victim erase & 통계
+        free_before = victim.free_count
+        freed_pages = self.pages_per_block - free_before
+        self.erase_block(victim_idx)
+        self.gc_count += 1
+        dt = time.perf_counter() - t0
+        self.gc_total_time += dt
+
+        # 이벤트 로그(열 지향 ring, 선택: 정책 점수 스냅샷)
+        self.gc_log.append(self._step, cause, victim_idx, moved_valid, freed_pages, dt, self.free_blocks,
+                           v_valid, v_invalid, v_ewma, v_erase, probe_detail)
+
+    # ---------- hotness / stream helpers ----------
+    def _is_hot_lpn(self, lpn: int) -> bool:
+        if self.hotness_mode == "oracle" and self.oracle_hot_cut is not None:
+            return lpn < self.oracle_hot_cut
+        last = self.lpn_last_write.get(lpn, -10**12)
+        return (self._step - last) <= int(self.recency_tau)
+
+    def _ensure_stream_block(self, stream: str, exclude_idx: Optional[int] = None,
+                             *, for_host: bool = True) -> Optional[int]:
+        """stream 헤드 보장(해당 풀에서 꺼냄). 호스트용이면 예약선을 지킨다."""
+        idx = self.stream_active.get(stream)
+        if idx is not None and idx != exclude_idx and self.blocks[idx].free_count > 0:
+            return idx
+        chosen = self._take_free_block(_POOL_OF_STREAM.get(stream, "gen"), exclude_idx, for_host=for_host)
+        self.stream_active[stream] = chosen
+        if chosen is not None:
+            self.blocks[chosen].stream_id = stream
+        return chosen
+
+    # ---------- TRIM ----------
+    def trim_lpn(self, lpn: int) -> None:
+        self._step += 1
+        pos = self.mapping.pop(lpn, None)
+        if pos is None:
+            return
+        b, p = pos
+        # TRIM은 기존 VALID를 INVALID로 전환 (쓰기 없이)
+        if self.blocks[b].pages[p] == PageState.VALID:
+            self.blocks[b].pages[p] = PageState.INVALID
+            self.blocks[b].valid_count -= 1
+            self.blocks[b].invalid_count += 1
+            self.blocks[b].last_invalid_step = self._step
+            self.blocks[b].inv_ewma = (1.0 - self.ewma_lambda) * self.blocks[b].inv_ewma + self.ewma_lambda * 1.0
+            # --- new: TRIM 카운트 증가 ---
+            self.blocks[b].trimmed_pages += 1
+            self.blocks[b]._touch()
+        self.reverse_map.pop((b, p), None)
+
+    # ---------- host write ----------
+    def write_lpn(self, lpn: int) -> None:
+        self._step += 1
+        # invalidate previous mapping
+        if lpn in self.mapping:
+            b, p = self.mapping[lpn]
+            self.blocks[b].invalidate_page(p, step=self._step, lam=self.ewma_lambda)
+            self.reverse_map.pop((b, p), None)
+
+        # pick target block
+        if self.three_stream:
+            stream = "hot" if self._is_hot_lpn(lpn) else "user"
+            b_idx = self._ensure_stream_block(stream)
+            if b_idx is None:
+                # 마지막 방어: 예약 블록이라도 사용
+                b_idx = self._ensure_stream_block(stream, for_host=False)
+        else:
+            b_idx = self._ensure_active_block(for_host=True)
+            if b_idx is None:
+                b_idx = self._ensure_active_block(for_host=False)
+        if b_idx is None:
+            raise RuntimeError("No free page before GC")
+
+        p_idx = self._allocate(b_idx)
+        if p_idx is None:
+            raise RuntimeError("Allocator inconsistency")
+
+        # update maps/metrics
+        self.lpn_last_write[lpn] = self._step
+        self.mapping[lpn] = (b_idx, p_idx)
+        self.reverse_map[(b_idx, p_idx)] = lpn
+        self.host_write_pages += 1
+        self.device_write_pages += 1
+        self.blocks[b_idx].last_prog_step = self._step
+        self.blocks[b_idx]._touch()
+
+
+# -----------------------------
+# Compact (struct-of-arrays) SSD model
+# -----------------------------
+_FREE, _VALID, _INVALID = 0, 1, 2
+_STREAMS = ("user", "hot", "cold")
+_STREAM_CODE = {s: i for i, s in enumerate(_STREAMS)}
+_POOLS = ("gen", "hot", "cold")
+_NEVER = -(10 ** 12)
+
+
+class BlockRef:
+    """CompactSSD의 블록 하나를 Block처럼 보이게 하는 얇은 뷰.
+
+    gc_algos 정책들은 getattr(b, "invalid_count") 식으로만 접근하므로
+    배열 값을 프로퍼티로 노출하면 그대로 재사용된다. 상태는 모두 장치 배열에 있다.
+    """
+    __slots__ = ("_dev", "_i")
+
+    def __init__(self, dev: "CompactSSD", i: int):
+        self._dev = dev
+        self._i = i
+
+    @property
+    def pages_per_block(self) -> int:
+        return self._dev.pages_per_block
+
+    @property
+    def valid_count(self) -> int:
+        return self._dev.valid[self._i]
+
+    @property
+    def invalid_count(self) -> int:
+        return self._dev.invalid[self._i]
+
+    @property
+    def erase_count(self) -> int:
+        return self._dev.erase_count[self._i]
+
+    @property
+    def last_prog_step(self) -> int:
+        return self._dev.last_prog[self._i]
+
+    @property
+    def last_invalid_step(self) -> int:
+        return self._dev.last_invalid[self._i]
+
+    @property
+    def inv_ewma(self) -> float:
+        return self._dev.inv_ewma[self._i]
+
+    @property
+    def trimmed_pages(self) -> int:
+        return self._dev.trimmed[self._i]
+
+    @property
+    def stream_id(self) -> str:
+        return _STREAMS[self._dev.stream[self._i]]
+
+    @property
+    def pool(self) -> str:
+        return _POOLS[self._dev.stream[self._i]]
+
+    @property
+    def pages(self) -> List[PageState]:
+        """디버깅/호환용: 페이지 상태를 PageState 리스트로 복사해서 반환."""
+        ppb = self._dev.pages_per_block
+        base = self._i * ppb
+        return [PageState(s) for s in self._dev.page_state[base:base + ppb]]
+
+    @property
+    def free_count(self) -> int:
+        return self._dev.pages_per_block - self._dev.write_ptr[self._i]
+
+    def invalid_ratio(self) -> float:
+        used = self.valid_count + self.invalid_count
+        return (self.invalid_count / used) if used > 0 else 0.0
+
+    def wear_norm(self, max_erase_seen: int) -> float:
+        return (self.erase_count / max_erase_seen) if max_erase_seen > 0 else 0.0
+
+    def last_activity(self) -> int:
+        return max(int(self.last_prog_step), int(self.last_invalid_step))
+
+
+class BlockArray:
+    """CompactSSD.blocks: len()/인덱싱/순회 가능한 BlockRef 시퀀스(필요할 때만 생성)."""
+    __slots__ = ("_dev", "victim_index")
+
+    def __init__(self, dev: "CompactSSD"):
+        self._dev = dev
+        self.victim_index: Optional[VictimIndex] = None
+
+    def __len__(self) -> int:
+        return self._dev.num_blocks
+
+    def __getitem__(self, i: int) -> BlockRef:
+        n = self._dev.num_blocks
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("block index out of range")
+        return BlockRef(self._dev, i)
+
+    def __iter__(self):
+        dev = self._dev
+        for i in range(dev.num_blocks):
+            yield BlockRef(dev, i)
+
+    def columns(self) -> Dict[str, object]:
+        """gc_algos.block_columns 용: 장치 카운터 배열을 복사 없이 그대로 노출."""
+        dev = self._dev
+        return {
+            "valid": dev.valid, "invalid": dev.invalid, "erase": dev.erase_count,
+            "last_prog": dev.last_prog, "last_invalid": dev.last_invalid,
+            "hot": dev.inv_ewma, "trimmed": dev.trimmed,
+            "stream": dev.stream,  # _STREAMS 코드(2 = cold)
+        }
+
+
+class CompactSSD:
+    """
+    SSD와 같은 인터페이스(write_lpn / trim_lpn / collect_garbage)를 가진 배열 기반 백엔드.
+      - 페이지 상태: 장치 전체를 한 개의 bytearray (0=FREE, 1=VALID, 2=INVALID)
+      - 블록 카운터: valid/invalid/erase/last_prog/last_invalid/inv_ewma/trimmed 배열
+      - 블록별 write pointer: 블록 안에서는 항상 순차 기록이므로 FREE 스캔 불필요
+      - L2P/P2L: 미리 할당한 정수 배열(PPN = block * pages_per_block + page, 미매핑=-1)
+      - free 블록: SSD와 같은 free_gen/free_hot/free_cold 풀 (호스트는 RESERVED_FREE_BLOCKS 아래로 못 가져감)
+    메모리는 장치 크기에만 비례하고, 호스트 write 비용은 블록 수와 무관하다.
+    LPN은 [0, total_pages) 범위여야 한다.
+    """
+
+    RESERVED_FREE_BLOCKS = 2
+
+    def __init__(self, num_blocks: int, pages_per_block: int, rng_seed: int = 42):
+        n, ppb = int(num_blocks), int(pages_per_block)
+        self.num_blocks = n
+        self.pages_per_block = ppb
+        self.rng = random.Random(rng_seed)
+
+        # page / block state (struct-of-arrays)
+        self.page_state = bytearray(n * ppb)
+        self.valid = array("i", bytes(4 * n))
+        self.invalid = array("i", bytes(4 * n))
+        self.erase_count = array("i", bytes(4 * n))
+        self.last_prog = array("q", bytes(8 * n))
+        self.last_invalid = array("q", bytes(8 * n))
+        self.inv_ewma = array("d", bytes(8 * n))
+        self.trimmed = array("i", bytes(4 * n))
+        self.write_ptr = array("i", bytes(4 * n))
+        self.stream = bytearray(n)  # _STREAMS 코드
+
+        # mappings
+        total = n * ppb
+        self.l2p = array("i", [-1]) * total
+        self.p2l = array("i", [-1]) * total
+        self.lpn_last_write = array("q", [_NEVER]) * total
+
+        # free-block pools (처음엔 전부 gen)
+        self.free_gen = FreeBlockPool(n, range(n))
+        self.free_hot = FreeBlockPool(n)
+        self.free_cold = FreeBlockPool(n)
+        self.free_pools = {"gen": self.free_gen, "hot": self.free_hot, "cold": self.free_cold}
+        self._free_pages = total
+
+        self.blocks = BlockArray(self)
+        self.victim_index = VictimIndex(self.blocks)
+        self.blocks.victim_index = self.victim_index
+
+        # clock & temperature
+        self._step = 0
+        self.ewma_lambda = 0.02
+
+        # metrics
+        self.host_write_pages = 0
+        self.device_write_pages = 0
+        self.gc_count = 0
+        self.gc_total_time = 0.0
+        # GC 이벤트: 열 지향 ring buffer(상한 있음, 필요 시 gc_log.spill_to(path)로 디스크에 이어 쓰기)
+        self.gc_log = GCEventLog()
+
+        # write heads
+        self.active_block_idx: Optional[int] = None
+        self.three_stream = False
+        self.stream_active = {"user": None, "hot": None, "cold": None}
+
+        # hotness (for 3-stream)
+        self.hotness_mode = "recency"
+        self.recency_tau = 200
+        self.oracle_hot_cut: Optional[int] = None
+
+        self.score_probe: Optional[Callable] = None
+        self.score_probe_every = 1  # N번째 GC마다만 probe(전체 블록 콜백이라 비쌈)
+
+    # ---------- derived ----------
+    @property
+    def gc_event_log(self) -> List[Dict]:
+        """메모리에 남은 GC 이벤트(dict) — 이전 버전 호환용 읽기 전용 뷰."""
+        return list(self.gc_log)
+
+    @property
+    def gc_durations(self) -> List[float]:
+        return self.gc_log.column("gc_s")
+
+    @property
+    def total_pages(self) -> int:
+        return self.num_blocks * self.pages_per_block
+
+    @property
+    def free_pages(self) -> int:
+        return self._free_pages
+
+    @property
+    def free_blocks(self) -> int:
+        heads = {self.active_block_idx, *self.stream_active.values()}
+        heads.discard(None)
+        return self._pooled_free() + sum(1 for h in heads if self.write_ptr[h] == 0)
+
+    def _pooled_free(self) -> int:
+        return len(self.free_gen) + len(self.free_hot) + len(self.free_cold)
+
+    def lookup(self, lpn: int) -> Optional[Tuple[int, int]]:
+        """LPN -> (block, page) (SSD.mapping.get 에 해당)."""
+        if not 0 <= lpn < len(self.l2p):
+            return None
+        ppn = self.l2p[lpn]
+        return divmod(ppn, self.pages_per_block) if ppn >= 0 else None
+
+    # ---------- low-level ops ----------
+    def _invalidate(self, ppn: int, trimmed: bool = False) -> None:
+        if self.page_state[ppn] != _VALID:
+            return
+        b = ppn // self.pages_per_block
+        lam = self.ewma_lambda
+        self.page_state[ppn] = _INVALID
+        self.valid[b] -= 1
+        self.invalid[b] += 1
+        self.last_invalid[b] = self._step
+        self.inv_ewma[b] = (1.0 - lam) * self.inv_ewma[b] + lam * 1.0
+        if trimmed:
+            self.trimmed[b] += 1
+        self.p2l[ppn] = -1
+        self.victim_index.touch(b)
+
+    def _program(self, b: int, lpn: int) -> int:
+        """블록 b의 write pointer 위치에 lpn을 기록하고 PPN 반환."""
+        p = self.write_ptr[b]
+        ppn = b * self.pages_per_block + p
+        self.write_ptr[b] = p + 1
+        self.page_state[ppn] = _VALID
+        self.valid[b] += 1
+        self.last_prog[b] = self._step
+        self.l2p[lpn] = ppn
+        self.p2l[ppn] = lpn
+        self._free_pages -= 1
+        self.device_write_pages += 1
+        self.victim_index.touch(b)
+        return ppn
+
+    def erase_block(self, block_idx: int) -> None:
+        ppb = self.pages_per_block
+        base = block_idx * ppb
+        for fp in self.free_pools.values():
+            fp.discard(block_idx)
+        self.page_state[base:base + ppb] = bytes(ppb)
+        self._free_pages += self.write_ptr[block_idx]
+        self.write_ptr[block_idx] = 0
+        self.valid[block_idx] = 0
+        self.invalid[block_idx] = 0
+        self.erase_count[block_idx] += 1
+        self.last_prog[block_idx] = 0
+        self.last_invalid[block_idx] = 0
+        self.inv_ewma[block_idx] = 0.0
+        self.trimmed[block_idx] = 0
+        self.victim_index.touch(block_idx)
+        # 헤드였다면 내려놓고 원래 풀로 반납
+        if self.active_block_idx == block_idx:
+            self.active_block_idx = None
+        for s, h in self.stream_active.items():
+            if h == block_idx:
+                self.stream_active[s] = None
+        self.free_pools[_POOLS[self.stream[block_idx]]].add(block_idx)
+
+    # ---------- free-block pools / write heads ----------
+    def _reclaim_dead_block(self, exclude_idx: Optional[int] = None) -> bool:
+        """풀이 바닥났을 때만 쓰는 드문 경로: all-invalid 블록 하나를 erase 해 풀로 돌린다."""
+        valid, invalid = self.valid, self.invalid
+        for i in range(self.num_blocks):
+            if i != exclude_idx and valid[i] == 0 and invalid[i] > 0:
+                self.erase_block(i)
+                return True
+        return False
+
+    def _take_free_block(self, pool: str = "gen", exclude_idx: Optional[int] = None,
+                         *, for_host: bool = False) -> Optional[int]:
+        """SSD._take_free_block 과 동일: 요청 풀 → gen → hot → cold 순 차용, 호스트는 예약선 준수."""
+        for attempt in range(2):
+            if not (for_host and self._pooled_free() <= self.RESERVED_FREE_BLOCKS):
+                for name in (pool, "gen", "hot", "cold"):
+                    fp = self.free_pools[name]
+                    if len(fp):
+                        i = fp.pick(self.rng)
+                        self.stream[i] = _POOLS.index(pool)
+                        return i
+            if attempt == 0 and not self._reclaim_dead_block(exclude_idx):
+                break
+        return None
+
+    def _ensure_active_block(self, exclude_idx: Optional[int] = None, *, for_host: bool = False) -> Optional[int]:
+        cur = self.active_block_idx
+        if cur is not None and cur != exclude_idx and self.write_ptr[cur] < self.pages_per_block:
+            return cur
+        b = self._take_free_block("gen", exclude_idx, for_host=for_host)
+        if b is not None:
+            self.active_block_idx = b
+        return b
+
+    def _ensure_stream_block(self, stream: str, exclude_idx: Optional[int] = None,
+                             *, for_host: bool = True) -> Optional[int]:
+        cur = self.stream_active.get(stream)
+        if cur is not None and cur != exclude_idx and self.write_ptr[cur] < self.pages_per_block:
+            return cur
+        b = self._take_free_block(_POOL_OF_STREAM.get(stream, "gen"), exclude_idx, for_host=for_host)
+        self.stream_active[stream] = b
+        if b is not None:
+            self.stream[b] = _STREAM_CODE[stream]
+        return b
+
+    # ---------- hotness ----------
+    def _is_hot_lpn(self, lpn: int) -> bool:
+        if self.hotness_mode == "oracle" and self.oracle_hot_cut is not None:
+            return lpn < self.oracle_hot_cut
+        return (self._step - self.lpn_last_write[lpn]) <= int(self.recency_tau)
+
+    # ---------- GC ----------
+    def _fallback_victim(self) -> Optional[int]:
+        if self.num_blocks == 0:
+            return None
+        g = self.victim_index.greedy()
+        return g if g is not None and self.invalid[g] > 0 else 0
+
+    def collect_garbage(self, policy: callable, cause: str = "manual") -> None:
+        """SSD.collect_garbage 와 같은 의미: victim VALID 페이지 이동 후 erase."""
+        victim_idx = policy(self.blocks)
+        if victim_idx is None:
+            victim_idx = self._fallback_victim()
+            if victim_idx is None:
+                raise RuntimeError("No victim block available for GC")
+
+        if self.valid[victim_idx] == 0 and self.invalid[victim_idx] > 0:
+            self.erase_block(victim_idx)
+            return
+
+        probe_detail = None
+        if self.score_probe is not None and self.gc_count % max(1, self.score_probe_every) == 0:
+            try:
+                snap = self.score_probe(self.blocks)
+                if isinstance(snap, dict):
+                    probe_detail = snap.get(victim_idx)
+            except Exception:
+                probe_detail = None
+
+        v_valid, v_invalid = self.valid[victim_idx], self.invalid[victim_idx]
+        v_ewma, v_erase = self.inv_ewma[victim_idx], self.erase_count[victim_idx]
+        stream = _STREAMS[self.stream[victim_idx]]
+
+        t0 = time.perf_counter()
+        moved_valid = 0
+        ppb = self.pages_per_block
+        base = victim_idx * ppb
+        state, p2l = self.page_state, self.p2l
+        for ppn in range(base, base + self.write_ptr[victim_idx]):
+            if state[ppn] != _VALID:
+                continue
+            lpn = p2l[ppn]
+            if lpn < 0:
+                continue
+            if self.three_stream:
+                dst = self._ensure_stream_block(stream, exclude_idx=victim_idx, for_host=False)
+            else:
+                dst = self._ensure_active_block(exclude_idx=victim_idx, for_host=False)
+            if dst is None:
+                raise RuntimeError("No destination block for migration")
+            self._invalidate(ppn)
+            self._program(dst, lpn)
+            moved_valid += 1
+
+        freed_pages = self.write_ptr[victim_idx]
+        self.erase_block(victim_idx)
+        self.gc_count += 1
+        dt = time.perf_counter() - t0
+        self.gc_total_time += dt
+
+        # 이벤트 로그(열 지향 ring, 선택: 정책 점수 스냅샷)
+        self.gc_log.append(self._step, cause, victim_idx, moved_valid, freed_pages, dt, self.free_blocks,
+                           v_valid, v_invalid, v_ewma, v_erase, probe_detail)
+
+    # ---------- TRIM ----------
+    def trim_lpn(self, lpn: int) -> None:
+        self._step += 1
+        if not 0 <= lpn < len(self.l2p):
+            return  # SSD.trim_lpn 과 동일: 범위 밖 LPN 은 매핑이 없는 것으로 취급
+        ppn = self.l2p[lpn]
+        if ppn < 0:
+            return
+        self.l2p[lpn] = -1
+        self._invalidate(ppn, trimmed=True)
+
+    # ---------- host write ----------
+    def write_lpn(self, lpn: int) -> None:
+        if not 0 <= lpn < len(self.l2p):
+            raise ValueError(f"LPN out of range: {lpn}")
+        self._step += 1
+        old = self.l2p[lpn]
+        if old >= 0:
+            self._invalidate(old)
+
+        if self.three_stream:
+            stream = "hot" if self._is_hot_lpn(lpn) else "user"
+            b_idx = self._ensure_stream_block(stream)
+            if b_idx is None:
+                # 마지막 방어: 예약 블록이라도 사용
+                b_idx = self._ensure_stream_block(stream, for_host=False)
+        else:
+            b_idx = self._ensure_active_block(for_host=True)
+            if b_idx is None:
+                b_idx = self._ensure_active_block(for_host=False)
+        if b_idx is None:
+            raise RuntimeError("No free page before GC")
+
+        self._program(b_idx, lpn)
+        self.lpn_last_write[lpn] = self._step
+        self.host_write_pages += 1
+
+
+def make_ssd(num_blocks: int, pages_per_block: int, rng_seed: int = 42,
+             backend: str = "object"):
+    """backend 이름으로 장치 생성: 'object'(SSD, 기본) | 'compact'(CompactSSD)."""
+    b = (backend or "object").lower()
+    if b == "object":
+        return SSD(num_blocks, pages_per_block, rng_seed=rng_seed)
+    if b == "compact":
+        return CompactSSD(num_blocks, pages_per_block, rng_seed=rng_seed)
+    raise ValueError(f"unknown backend: {backend}")
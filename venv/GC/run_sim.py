@@ -0,0 +1,474 @@
+import os
+import json
+import argparse
+import random
+from datetime import datetime
+from config import SimConfig
+from simulator import Simulator
+from models import MODEL_VERSION, CompactSSD, make_ssd
+from snapshot import save_snapshot, load_snapshot, snapshot_info
+from latency import LatencyEngine
+from workload import lazy_workload, open_trace, blkio_workload, write_trace
+from metrics import append_summary_csv
+import gc_algos
+
+# ------------------------------
+# helpers
+# ------------------------------
+
+def _gc_ring_arg(text: str):
+    """--gc_ring 값: 정수(0이면 집계만) 또는 'unbounded'(상한 없이 전부 유지)."""
+    if text == "unbounded":
+        return text
+    n = int(text)
+    if n < 0:
+        raise argparse.ArgumentTypeError("--gc_ring 은 0 이상 정수 또는 'unbounded'")
+    return n
+
+
+def _resolve_path(path: str, out_dir: str) -> str | None:
+    if path is None:
+        return None
+    return path if os.path.isabs(path) else os.path.join(out_dir, path)
+
+
+def _infer_user_total_pages(cfg) -> int:
+    """
+    다양한 SimConfig 형태를 호환해서 user_total_pages(=실험에 쓰는 LPN 수)를 추정.
+    우선순위:
+      1) cfg.user_total_pages / total_user_pages / ssd_total_pages
+      2) (blocks|num_blocks|total_blocks) * (pages_per_block|ppb) * (user_capacity_ratio|capacity_ratio|1.0)
+      3) total_pages * (user_capacity_ratio|capacity_ratio|1.0)
+    없으면 RuntimeError.
+    """
+    # 1) 직접 필드
+    for attr in ("user_total_pages", "total_user_pages", "ssd_total_pages"):
+        v = getattr(cfg, attr, None)
+        if isinstance(v, int) and v > 0:
+            return v
+
+    # 공통 필드 후보
+    blocks = (
+        getattr(cfg, "num_blocks", None)
+        or getattr(cfg, "blocks", None)
+        or getattr(cfg, "total_blocks", None)
+    )
+    ppb = getattr(cfg, "pages_per_block", None) or getattr(cfg, "ppb", None)
+    ratio = (
+        getattr(cfg, "user_capacity_ratio", None)
+        or getattr(cfg, "capacity_ratio", None)
+        or 1.0
+    )
+
+    # 2) blocks * ppb * ratio
+    try:
+        if blocks and ppb:
+            return int(int(blocks) * int(ppb) * float(ratio))
+    except Exception:
+        pass
+
+    # 3) total_pages * ratio
+    total_pages = getattr(cfg, "total_pages", None)
+    try:
+        if total_pages and isinstance(total_pages, int) and total_pages > 0:
+            return int(total_pages * float(ratio))
+    except Exception:
+        pass
+
+    raise RuntimeError(
+        "user_total_pages 추정 실패: SimConfig 구조가 예상과 다릅니다. "
+        "필요 필드(user_total_pages / (blocks*ppb*ratio) / total_pages)를 확인하세요."
+    )
+
+
+def _inject_policy(args, sim: Simulator):
+    """
+    args.gc_policy 문자열에 따라 sim.gc_policy를 주입한다.
+    now_step이 필요한 정책은 래핑하여 전달.
+    CAT 확장 설정(콜드 바이어스/트림 보너스/top-k/가중치)은 gc_algos 전역에 반영.
+    """
+    name = (args.gc_policy or "").lower()
+
+    # ---- CAT 확장 설정 주입 (있을 때만 안전 적용) ----
+    if hasattr(gc_algos, "reset_config"):
+        gc_algos.reset_config()
+    if hasattr(gc_algos, "config_cold_bias"):
+        gc_algos.config_cold_bias(args.cold_victim_bias)
+    if hasattr(gc_algos, "config_trim_age_bonus"):
+        gc_algos.config_trim_age_bonus(args.trim_age_bonus)
+    if hasattr(gc_algos, "config_victim_prefetch_k"):
+        gc_algos.config_victim_prefetch_k(args.victim_prefetch_k)
+    if hasattr(gc_algos, "config_cat_weights"):
+        # alpha/beta/gamma/delta 중 None 아닌 것만 반영
+        w = dict(alpha=args.cat_alpha, beta=args.cat_beta, gamma=args.cat_gamma, delta=args.cat_delta)
+        # None 방지
+        w = {k: v for k, v in w.items() if v is not None}
+        if w:
+            gc_algos.config_cat_weights(**w)
+
+    # ---- 기본 정책들 ----
+    if name in ("greedy",):
+        sim.gc_policy = getattr(gc_algos, "greedy_policy")
+        return
+
+    if name in ("cb", "cost_benefit"):
+        sim.gc_policy = getattr(gc_algos, "cb_policy")
+        return
+
+    if name in ("bsgc",):
+        sim.gc_policy = getattr(gc_algos, "bsgc_policy")
+        return
+
+    if name in ("cat",):
+        sim.gc_policy = getattr(gc_algos, "cat_policy")
+        return
+
+    # ---- 확장 정책들 (atcb / re50315) ----
+    if name in ("atcb", "atcb_policy"):
+        atcb_policy = getattr(gc_algos, "atcb_policy", None)
+        if atcb_policy is None:
+            raise RuntimeError("gc_algos.atcb_policy 가 없습니다. gc_algos.py 를 업데이트하세요.")
+        def atcb_with_now(blocks, _sim=sim):
+            return atcb_policy(
+                blocks,
+                alpha=args.atcb_alpha, beta=args.atcb_beta,
+                gamma=args.atcb_gamma, eta=args.atcb_eta,
+                now_step=_sim.ssd._step,
+            )
+        atcb_with_now.topk = lambda blocks, k, _sim=sim: gc_algos.topk_victims(
+            "atcb", blocks, k,
+            alpha=args.atcb_alpha, beta=args.atcb_beta,
+            gamma=args.atcb_gamma, eta=args.atcb_eta,
+            now_step=_sim.ssd._step,
+        )
+        sim.gc_policy = atcb_with_now
+        return
+
+    if name in ("re50315", "re50315_policy"):
+        re50315_policy = getattr(gc_algos, "re50315_policy", None)
+        if re50315_policy is None:
+            raise RuntimeError("gc_algos.re50315_policy 가 없습니다. gc_algos.py 를 업데이트하세요.")
+        def p_with_now(blocks, _sim=sim):
+            return re50315_policy(blocks, K=args.re50315_K, now_step=_sim.ssd._step)
+        p_with_now.topk = lambda blocks, k, _sim=sim: gc_algos.topk_victims(
+            "re50315", blocks, k, K=args.re50315_K, now_step=_sim.ssd._step)
+        sim.gc_policy = p_with_now
+        return
+
+    raise ValueError(f"지원하지 않는 GC 정책: {args.gc_policy}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="GC simulator runner (drop-in)")
+    # ---- 시뮬레이션/장치 파라미터 ----
+    ap.add_argument("--ops", type=int, default=200_000, help="호스트 write(페이지) 횟수")
+    ap.add_argument("--update_ratio", type=float, default=0.8, help="업데이트(덮어쓰기) 비율 (0~1)")
+    ap.add_argument("--hot_ratio", type=float, default=0.2, help="핫 데이터 비율 (0~1)")
+    ap.add_argument("--hot_weight", type=float, default=0.7, help="핫 주소로 보낼 가중치 (0~1)")
+    ap.add_argument("--blocks", type=int, default=256)
+    ap.add_argument("--pages_per_block", type=int, default=64)
+    ap.add_argument("--gc_free_block_threshold", type=float, default=0.12, help="free blocks 비율 임계치 (0~1)")
+    ap.add_argument("--user_capacity_ratio", type=float, default=0.9, help="유저 영역 비율 (0~1)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--backend", type=str, default="object", choices=["object", "compact"],
+                    help="장치 백엔드: object(SSD) | compact(CompactSSD, 배열 기반)")
+
+    # ---- TRIM & WARMUP ----
+    ap.add_argument("--enable_trim", action="store_true", help="워크로드에 TRIM 포함")
+    ap.add_argument("--trim_ratio", type=float, default=0.0, help="TRIM 확률(0~1)")
+    ap.add_argument("--warmup_fill", type=float, default=0.0,
+                    help="실행 전 선행 채우기 비율(0.0~0.99). steady-state 비교용")
+    ap.add_argument("--preage_ops", type=int, default=0,
+                    help="워밍업 뒤 랜덤 덮어쓰기 프리에이징 횟수(steady-state 진입용)")
+    ap.add_argument("--preage_policy", type=str, default="greedy", choices=["greedy", "cb", "bsgc", "cat"],
+                    help="워밍업/프리에이징 중 GC 정책(실험 정책과 분리 → 스냅샷 공유 가능)")
+    ap.add_argument("--snapshot_in", type=str, default=None,
+                    help="워밍업 대신 불러올 장치 스냅샷(snapshot.save_snapshot)")
+    ap.add_argument("--snapshot_out", type=str, default=None,
+                    help="워밍업/프리에이징 직후 장치 스냅샷 저장(out_dir 기준)")
+    ap.add_argument("--workload_file", type=str, default=None,
+                    help="생성 대신 재생할 워크로드: *.bin(workload.write_trace) 또는 블록 I/O CSV(offset/size/type)")
+    ap.add_argument("--trace_page_size", type=int, default=4096, help="블록 I/O CSV → LPN 변환 페이지 크기(바이트)")
+    ap.add_argument("--trace_unit_bytes", type=int, default=1, help="블록 I/O CSV offset/size 단위(바이트=1, 섹터=512)")
+    ap.add_argument("--save_workload", type=str, default=None,
+                    help="생성한 워크로드를 바이너리 트레이스로 저장(out_dir 기준, 실행 전)")
+
+    # ---- 정책 선택 & 파라미터 ----
+    ap.add_argument("--gc_policy", type=str, default="greedy",
+                    choices=["greedy", "cb", "cost_benefit", "bsgc", "cat", "atcb", "re50315"],
+                    help="GC 정책 선택")
+
+    # CAT 확장 옵션(있을 때만 적용)
+    ap.add_argument("--cat_alpha", type=float, default=None, help="CAT α (invalid)")
+    ap.add_argument("--cat_beta",  type=float, default=None, help="CAT β (1-hot)")
+    ap.add_argument("--cat_gamma", type=float, default=None, help="CAT γ (age)")
+    ap.add_argument("--cat_delta", type=float, default=None, help="CAT δ (1-wear)")
+    ap.add_argument("--cold_victim_bias", type=float, default=1.0, help="cold 풀 가점(>1.0)")
+    ap.add_argument("--trim_age_bonus", type=float, default=0.0, help="TRIM 비율 기반 age 보너스")
+    ap.add_argument("--victim_prefetch_k", type=int, default=1, help="victim 후보 top-K")
+
+    # ATCB / RE50315 파라미터
+    ap.add_argument("--atcb_alpha", type=float, default=0.5)
+    ap.add_argument("--atcb_beta",  type=float, default=0.3)
+    ap.add_argument("--atcb_gamma", type=float, default=0.1)
+    ap.add_argument("--atcb_eta",   type=float, default=0.1)
+    ap.add_argument("--re50315_K",  type=float, default=1.0)
+
+    # ---- 타이밍 엔진(장치 시간 기준 지연/GC stall) ----
+    ap.add_argument("--latency", action="store_true",
+                    help="이산 사건 타이밍 엔진 사용 → 요약 CSV에 lat_p50/p95/p99/p999_us, gc_stall_us 등 추가")
+    ap.add_argument("--io_profile", type=str, default="default", choices=["default", "fast", "slow", "qos_lowlat"],
+                    help="지연 프리셋(SimConfig.apply_io_profile)")
+    ap.add_argument("--channels", type=int, default=4)
+    ap.add_argument("--dies_per_channel", type=int, default=2)
+    ap.add_argument("--channel_xfer_us", type=int, default=10, help="페이지 1개 채널 전송 시간")
+    ap.add_argument("--interarrival_us", type=float, default=0.0,
+                    help="호스트 op 도착 간격(µs). 0이면 closed-loop QD1")
+    ap.add_argument("--arrival", type=str, default="fixed", choices=["fixed", "poisson"])
+
+    # ---- 실행/출력 관련 ----
+    ap.add_argument("--bg_gc_every", type=int, default=0,
+                    help="K>0이면 매 K ops마다 백그라운드 GC 시도(시뮬레이터가 지원할 때)")
+    ap.add_argument("--out_dir", type=str, default="results/run",
+                    help="결과/로그를 저장할 디렉토리(상대 경로면 자동 생성)")
+    ap.add_argument("--out_csv", type=str, default=None, help="요약 CSV append 경로")
+    ap.add_argument("--trace_csv", type=str, default=None, help="옵션: trace CSV (시뮬레이터가 지원 시)")
+    ap.add_argument("--gc_events_csv", type=str, default=None,
+                    help="per-GC 이벤트 로그 CSV (실행 중 ring 에서 이어 쓰기)")
+    ap.add_argument("--gc_ring", type=_gc_ring_arg, default=None,
+                    help="메모리에 유지할 최근 GC 이벤트 수(기본 65536, 0이면 집계만, unbounded 면 전부 유지)")
+    ap.add_argument("--trace_every", type=int, default=1, help="trace 샘플 간격(호스트 op)")
+    ap.add_argument("--trace_capacity", type=int, default=1 << 16,
+                    help="trace 최대 샘플 수(넘으면 해상도를 절반으로)")
+    ap.add_argument("--note", type=str, default="", help="메모/주석")
+    return ap
+
+
+def build_config(args) -> SimConfig:
+    """args → SimConfig (user_total_pages 명시 세팅 포함)."""
+    cfg = SimConfig(
+        num_blocks=args.blocks,
+        pages_per_block=args.pages_per_block,
+        gc_free_block_threshold=args.gc_free_block_threshold,
+        rng_seed=args.seed,
+        user_capacity_ratio=args.user_capacity_ratio,
+        backend=args.backend,
+        io_profile=args.io_profile,
+        channels=args.channels,
+        dies_per_channel=args.dies_per_channel,
+        channel_xfer_us=args.channel_xfer_us,
+        host_interarrival_us=args.interarrival_us,
+        arrival=args.arrival,
+    )
+    cfg.apply_io_profile()
+
+    # user_total_pages 보정(필드가 없을 수 있어 명시 세팅)
+    user_total_pages = _infer_user_total_pages(cfg)
+    try:
+        setattr(cfg, "user_total_pages", user_total_pages)
+    except Exception:
+        pass
+    return cfg
+
+
+def make_run_workload(args, user_total_pages: int):
+    """args 의 워크로드 파라미터로 op 스트림 생성(정책과 무관 → 스윕에서 공유 가능).
+    리스트를 만들지 않는 재순회 가능 스트림을 돌려준다(순회마다 같은 시퀀스).
+    --workload_file 이 있으면 파일(.bin=바이너리 트레이스, 그 외=블록 I/O CSV)을 재생한다."""
+    path = getattr(args, "workload_file", None)
+    if path:
+        if path.endswith(".bin"):
+            return open_trace(path)
+        return blkio_workload(path, page_size=args.trace_page_size, lpn_space=user_total_pages,
+                              unit_bytes=args.trace_unit_bytes)
+    return lazy_workload(
+        n_ops=args.ops,
+        update_ratio=args.update_ratio,
+        ssd_total_pages=user_total_pages,
+        rng_seed=args.seed,
+        hot_ratio=args.hot_ratio,
+        hot_weight=args.hot_weight,
+        enable_trim=args.enable_trim,
+        trim_ratio=args.trim_ratio,
+    )
+
+
+def warmup_device(args, cfg, ssd) -> None:
+    """정책과 무관한 장치 준비: 순차 선행 채우기(--warmup_fill) + 랜덤 덮어쓰기 프리에이징(--preage_ops).
+    필요한 GC는 --preage_policy 로 수행하므로 결과 장치를 여러 정책 실행이 공유(스냅샷)할 수 있다."""
+    if args.warmup_fill <= 0.0 and getattr(args, "preage_ops", 0) <= 0:
+        return
+    user_total_pages = cfg.user_total_pages
+    pages_per_block = getattr(cfg, "pages_per_block", getattr(cfg, "ppb", 64))
+    age_policy = gc_algos.get_gc_policy(getattr(args, "preage_policy", "greedy"))
+
+    # ---- 워밍업(선행 채우기) ----
+    lpn = 0
+    if args.warmup_fill > 0.0:
+        # free 블록 2개는 반드시 남기자 (프로젝트에 맞춰 조정 가능)
+        reserve_free_blocks = 2
+        max_warm_pages = max(0, user_total_pages - reserve_free_blocks * pages_per_block)
+        target_pages = min(int(user_total_pages * min(max(args.warmup_fill, 0.0), 0.99)), max_warm_pages)
+
+        wrote = 0
+        while wrote < target_pages and lpn < user_total_pages:
+            # free_pages가 0에 근접하면 GC로 숨통 틔움
+            if getattr(ssd, "free_pages", 1) <= pages_per_block:
+                ssd.collect_garbage(age_policy, cause="warmup")
+            ssd.write_lpn(lpn)
+            wrote += 1
+            lpn += 1
+
+    # ---- 프리에이징(채운 범위 안 랜덤 덮어쓰기, 포그라운드 GC 임계치 사용) ----
+    preage_ops = int(getattr(args, "preage_ops", 0) or 0)
+    if preage_ops > 0:
+        span = lpn if lpn > 0 else user_total_pages
+        rng = random.Random(args.seed + 7919)
+        threshold = max(int(cfg.free_block_threshold_abs), ssd.RESERVED_FREE_BLOCKS + 1)
+        for _ in range(preage_ops):
+            if ssd.free_blocks <= threshold:
+                ssd.collect_garbage(age_policy, cause="warmup")
+            ssd.write_lpn(rng.randrange(span))
+
+
+# 워밍업 결과(장치 상태)를 결정하는 인자 — 스냅샷 메타에 저장되고 sweep 그룹 키로도 쓰인다
+WARMUP_ARGS = ("blocks", "pages_per_block", "user_capacity_ratio", "gc_free_block_threshold",
+               "seed", "backend", "warmup_fill", "preage_ops", "preage_policy")
+
+
+def warmup_key(args) -> tuple:
+    """워밍업 결과를 결정하는 인자 묶음(같으면 같은 장치 상태 → 스냅샷 공유 가능)."""
+    return tuple(getattr(args, k, None) for k in WARMUP_ARGS)
+
+
+def check_snapshot_warmup(path: str, args) -> None:
+    """스냅샷을 만든 워밍업 인자가 현재 인자와 다르면 ValueError(같은 워밍업 상태 보장).
+    워밍업 키가 없는 이전 스냅샷은 확인할 수 없으므로 경고만."""
+    stored = snapshot_info(path).get("warmup")
+    if stored is None:
+        print(f"[warn] {path}: 워밍업 인자가 기록되지 않은 스냅샷 — 일치 여부를 확인할 수 없습니다")
+        return
+    want = json.loads(json.dumps(list(warmup_key(args))))
+    diff = [f"{k}={a!r}(snapshot) vs {b!r}" for k, a, b in zip(WARMUP_ARGS, stored, want) if a != b]
+    if diff:
+        raise ValueError(f"snapshot warmup mismatch: {', '.join(diff)}")
+
+
+def run_once(args, wl=None, *, enable_trace: bool = False, ssd=None, gc_events_csv: str | None = None) -> Simulator:
+    """설정 1개를 끝까지 실행하고 Simulator 반환.
+    wl을 주면 워크로드 생성을 건너뛰고, ssd(스냅샷에서 로드/복제한 장치)를 주면 워밍업을 건너뛴다.
+    gc_events_csv 를 주면 GC 이벤트를 실행 중에 그 파일로 이어 쓴다(ring 이 넘쳐도 유실 없음)."""
+    cfg = build_config(args)
+    user_total_pages = cfg.user_total_pages
+    if ssd is not None:
+        _check_snapshot_geometry(ssd, cfg)
+
+    timing = LatencyEngine.from_config(cfg) if getattr(args, "latency", False) else None
+    sim = Simulator(cfg, enable_trace=enable_trace, bg_gc_every=args.bg_gc_every, ssd=ssd, timing=timing,
+                    trace_every=getattr(args, "trace_every", 1),
+                    trace_capacity=getattr(args, "trace_capacity", 1 << 16))
+    if getattr(args, "gc_ring", None) is not None:
+        sim.ssd.gc_log.resize(None if args.gc_ring == "unbounded" else args.gc_ring)
+    if gc_events_csv:
+        sim.ssd.gc_log.spill_to(gc_events_csv)
+    _inject_policy(args, sim)
+
+    # ---- 워크로드 생성 ----
+    if wl is None:
+        wl = make_run_workload(args, user_total_pages)
+
+    # ---- 워밍업 / 프리에이징 (스냅샷 장치는 이미 완료된 상태) ----
+    if ssd is None:
+        warmup_device(args, cfg, sim.ssd)
+
+    # ---- 실행 ----
+    sim.run(wl)
+    return sim
+
+
+def _check_snapshot_geometry(ssd, cfg) -> None:
+    backend = "compact" if isinstance(ssd, CompactSSD) else "object"
+    if (ssd.num_blocks, ssd.pages_per_block, backend) != (cfg.num_blocks, cfg.pages_per_block, cfg.backend):
+        raise ValueError(
+            f"snapshot geometry ({ssd.num_blocks}x{ssd.pages_per_block}, {backend}) != "
+            f"config ({cfg.num_blocks}x{cfg.pages_per_block}, {cfg.backend})")
+
+
+def run_meta(args) -> dict:
+    """요약 CSV에 함께 기록할 실행 파라미터."""
+    meta = {
+        "run_id": args.note or f"{args.gc_policy}_{args.seed}",
+        "model_version": MODEL_VERSION,
+        "policy": args.gc_policy,
+        "ops": args.ops,
+        "update_ratio": args.update_ratio,
+        "hot_ratio": args.hot_ratio,
+        "hot_weight": args.hot_weight,
+        "seed": args.seed,
+        "trim_enabled": 1 if args.enable_trim else 0,
+        "trim_ratio": args.trim_ratio,
+        "warmup_fill": args.warmup_fill,
+        "bg_gc_every": args.bg_gc_every,
+        "note": args.note,
+        "ts": datetime.now().isoformat(timespec="seconds"),
+    }
+    if getattr(args, "latency", False):
+        meta.update({
+            "io_profile": args.io_profile,
+            "channels": args.channels,
+            "dies_per_channel": args.dies_per_channel,
+            "interarrival_us": args.interarrival_us,
+            "arrival": args.arrival,
+        })
+    return meta
+
+
+def main():
+    args = build_parser().parse_args()
+
+    # ---- 출력 경로 준비 ----
+    out_dir = args.out_dir
+    os.makedirs(out_dir, exist_ok=True)
+    out_csv_path       = _resolve_path(args.out_csv, out_dir) if args.out_csv else None
+    trace_csv_path     = _resolve_path(args.trace_csv, out_dir) if args.trace_csv else None
+    gc_events_csv_path = _resolve_path(args.gc_events_csv, out_dir) if args.gc_events_csv else None
+
+    wl = None
+    if args.save_workload:
+        save_path = _resolve_path(args.save_workload, out_dir)
+        cfg = build_config(args)
+        write_trace(save_path, make_run_workload(args, cfg.user_total_pages))
+        wl = open_trace(save_path)
+
+    # ---- 장치 스냅샷(워밍업 1회 → 여러 정책 실행 공유) ----
+    ssd = None
+    if args.snapshot_in:
+        check_snapshot_warmup(args.snapshot_in, args)
+        ssd = load_snapshot(args.snapshot_in)
+    elif args.snapshot_out:
+        cfg = build_config(args)
+        ssd = make_ssd(cfg.num_blocks, cfg.pages_per_block, rng_seed=cfg.rng_seed, backend=cfg.backend)
+        warmup_device(args, cfg, ssd)
+        save_snapshot(ssd, _resolve_path(args.snapshot_out, out_dir), warmup=warmup_key(args))
+
+    sim = run_once(args, wl, enable_trace=bool(trace_csv_path), ssd=ssd,
+                   gc_events_csv=gc_events_csv_path)
+
+    # ---- 결과 CSV/로그 저장(가능할 때만) ----
+    if out_csv_path:
+        append_summary_csv(out_csv_path, sim, run_meta(args))
+
+    # trace (샘플 타임라인)
+    if trace_csv_path and sim.timeline is not None:
+        sim.timeline.to_csv(trace_csv_path)
+
+    # per-GC 이벤트(spill 중이면 남은 ring 을 마저 쓰고 닫음)
+    if gc_events_csv_path:
+        if sim.ssd.gc_log.spill_path:
+            sim.ssd.gc_log.close()
+        else:
+            sim.ssd.gc_log.to_csv(gc_events_csv_path)
+
+
+if __name__ == "__main__":
+    main()
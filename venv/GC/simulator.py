@@ -0,0 +1,245 @@
+"""
+Simulator — pool-aware allocation, BG-GC cadence, policy adapter (drop-in)
+
+실제 장치(models.SSD / CompactSSD) 위에서 워크로드를 돌리는 실행기.
+- 장치 객체를 직접 받거나, SimConfig를 받아 make_ssd()로 장치를 만든다
+- hot/cold/gen 풀 분리(옵션): 장치의 free_hot/free_cold/free_gen 풀 + 3-stream 라우팅 사용
+- 포그라운드 GC: free 블록이 임계치 이하이면 호스트 1회 쓰기 전에 GC 최대 1회
+- BG-GC 주기: bg_gc_every(전체) 또는 BGSchedule(pool별 cadence)
+- 정책 어댑터: gc_algos의 함수형 정책을 바로 연결, policy.topk 가 있으면 victim prefetch
+  (한 번의 점수 계산으로 top‑K 후보를 뽑아 FG/BG GC 여러 번에 재사용)
+- 타임라인(옵션): enable_trace=True 면 trace_every op 마다 free pages/WAF 샘플(telemetry.Timeline,
+  메모리 상한 trace_capacity — 넘으면 해상도를 절반으로)
+- 타이밍(옵션): timing=latency.LatencyEngine 을 주면 호스트 op/FG·BG GC 를 장치 시간으로 스케줄해
+  op 지연 분포(p50~p99.9)와 GC stall 을 집계
+"""
+from __future__ import annotations
+from typing import Optional, List, Tuple, Callable
+from dataclasses import dataclass
+
+from models import Block, make_ssd
+from telemetry import Timeline
+
+# 정책 로딩(함수형)
+try:
+    from gc_algos import get_gc_policy
+    # 선택적으로 victim prefetch 설정이 있으면 사용
+    try:
+        from gc_algos import victim_prefetch_k  # type: ignore
+    except Exception:
+        victim_prefetch_k = lambda: 1  # type: ignore
+except Exception:
+    def get_gc_policy(name: str):  # type: ignore
+        raise RuntimeError("gc_algos.get_gc_policy() 가 필요합니다")
+    victim_prefetch_k = lambda: 1  # type: ignore
+
+
+@dataclass
+class BGSchedule:
+    every_hot: int = 256
+    every_cold: int = 1024
+
+
+# Simulator 스트림 이름('gen'|'hot'|'cold') -> 장치 stream_id
+_DEVICE_STREAM = {"gen": "user", "hot": "hot", "cold": "cold"}
+
+
+class Simulator:
+    def __init__(self,
+                 device,
+                 policy_name: str = "greedy",
+                 cold_pool: bool = False,
+                 bg: Optional[BGSchedule] = None,
+                 *,
+                 enable_trace: bool = False,
+                 bg_gc_every: int = 0,
+                 ssd=None,
+                 timing=None,
+                 trace_every: int = 1,
+                 trace_capacity: int = 1 << 16):
+        # device 자리에 SimConfig가 오면 장치를 직접 만든다(run_sim.py 경로).
+        # ssd= 를 함께 주면(스냅샷 로드/복제본) 그 장치를 쓰고 cfg는 임계치 등에만 사용
+        if hasattr(device, "write_lpn"):
+            self.cfg = None
+            self.dev = device
+        else:
+            self.cfg = device
+            self.dev = ssd if ssd is not None else make_ssd(
+                device.num_blocks, device.pages_per_block,
+                rng_seed=getattr(device, "rng_seed", 42),
+                backend=getattr(device, "backend", "object"))
+        self.ssd = self.dev
+        self.ops: int = 0
+        self.cold_pool: bool = bool(cold_pool)
+        self.bg = bg
+        self.bg_gc_every = int(bg_gc_every or 0)
+        self.gc_policy = get_gc_policy(policy_name)  # 함수형(policy(blocks)->idx)
+
+        # 풀 분리 시 장치의 3-stream 라우팅(hot/user)과 stream별 free 풀을 사용
+        if self.cold_pool:
+            self.dev.three_stream = True
+
+        # 포그라운드 GC 임계치(free 블록 수). 예약 블록보다는 항상 커야 호스트가 막히지 않는다.
+        if self.cfg is not None and hasattr(self.cfg, "free_block_threshold_abs"):
+            thr = int(self.cfg.free_block_threshold_abs)
+        else:
+            thr = int(round(self.dev.num_blocks * 0.12))
+        self.gc_threshold_blocks = max(thr, self.dev.RESERVED_FREE_BLOCKS + 1)
+
+        # victim prefetch: None이면 gc_algos.config_victim_prefetch_k() 설정을 따른다
+        self.victim_prefetch_k: Optional[int] = None
+        self._victim_queue: List[Tuple[int, int]] = []  # (block idx, 점수 계산 시점 erase_count)
+
+        # 간단 라우터 상태(데모용): 외부에서 바꿔도 됨
+        self._last_stream: str = 'gen'  # 'hot'|'cold'|'gen'
+
+        # 이산 사건 타이밍 엔진(옵션, latency.LatencyEngine)
+        self.timing = timing
+
+        # 메트릭 훅(외부에서 교체 가능)
+        self.on_gc: Optional[Callable[[int, int], None]] = None  # (victim_idx, valid_moved)
+
+        # 샘플 타임라인(옵션) — 비활성이면 write 당 None 체크 한 번
+        self.timeline: Optional[Timeline] = Timeline(trace_every, trace_capacity) if enable_trace else None
+
+    # ---------------- Router ----------------
+    def choose_stream(self, lpn: int) -> str:
+        """외부 또는 실험 코드에서 self._last_stream만 바꿔도 동작.
+        여기서는 그대로 반환."""
+        return self._last_stream
+
+    @property
+    def trace(self) -> Optional[dict]:
+        """이전 버전 호환: 타임라인 열을 리스트 dict 로(step/free_pages/device_writes/gc_count/gc_event ...)."""
+        return self.timeline.as_dict() if self.timeline is not None else None
+
+    # ---------------- Run ----------------
+    def run(self, workload) -> None:
+        """workload: [lpn, ...] 또는 [("write"|"trim", lpn), ...] — 리스트/제너레이터 모두 한 op씩 소비.
+        workload.packed(uint64 code = lpn<<1 | is_trim, workload.PackedTrace)가 있으면 객체 생성 없이 재생."""
+        if self.timeline is not None and not len(self.timeline):
+            self.timeline.mark(self.dev)  # 워밍업 이후부터 구간 WAF 계산
+        packed = getattr(workload, "packed", None)
+        if packed is not None:
+            write, trim = self.write, self.trim
+            for code in packed:
+                if code & 1:
+                    trim(code >> 1)
+                else:
+                    write(code >> 1)
+            return
+        for op in workload:
+            if isinstance(op, tuple):
+                kind, lpn = op
+                if kind == "trim":
+                    self.trim(lpn)
+                    continue
+            else:
+                lpn = op
+            self.write(lpn)
+
+    # ---------------- Write / Trim ----------------
+    def write(self, lpn: int) -> None:
+        gc_event = 0
+        tm = self.timing
+        if tm is not None:
+            tm.arrive()
+        if self.dev.free_blocks <= self.gc_threshold_blocks:
+            # 호스트 1회 쓰기 전에 GC 최대 1회(포그라운드는 풀 제한 없이 전체 후보)
+            if self.gc_once(cause="fg") is not None:
+                gc_event = 1
+        self.dev.write_lpn(lpn)
+        if tm is not None:
+            b, p = self.dev.lookup(lpn)
+            tm.host_write(b * self.dev.pages_per_block + p)
+        self.ops += 1
+
+        # BG cadence
+        if self.bg_gc_every > 0 and self.ops % self.bg_gc_every == 0:
+            gc_event |= self._bg_if_needed(None)
+        if self.bg is not None:
+            if self.ops % max(1, self.bg.every_hot) == 0:
+                gc_event |= self._bg_if_needed('hot')
+            if self.ops % max(1, self.bg.every_cold) == 0:
+                gc_event |= self._bg_if_needed('cold')
+
+        if self.timeline is not None:
+            self.timeline.tick(self.dev, gc_event)
+
+    def trim(self, lpn: int) -> None:
+        if self.timing is not None:
+            self.timing.arrive()
+            self.timing.host_trim()
+        self.dev.trim_lpn(lpn)
+
+    # ---------------- GC core ----------------
+    def gc_once(self, prefer_pool: Optional[str] = None, cause: str = "manual") -> Optional[int]:
+        """한 번의 컬렉션을 수행하고 victim 블록 인덱스를 반환."""
+        blocks = self.dev.blocks
+        if not len(blocks):
+            return None
+
+        if prefer_pool in ("hot", "cold", "gen"):
+            # 후보 집합을 풀로 제한(정책은 local 인덱스를 반환 → 전역 인덱스로 변환)
+            enum = [(i, b) for i, b in enumerate(blocks) if getattr(b, 'pool', 'gen') == prefer_pool]
+            if not enum:  # 풀에 후보 없으면 전체로 fallback
+                return self.gc_once(None, cause)
+            victim_local_idx = self._select([b for _, b in enum])
+            if victim_local_idx is None:
+                return self.gc_once(None, cause)
+            victim_idx = enum[int(victim_local_idx)][0]
+        else:
+            victim_idx = self._select(blocks, prefetch=True)
+            if victim_idx is None:
+                return None
+
+        before = self.dev.device_write_pages
+        self.dev.collect_garbage(lambda _blocks, _v=victim_idx: _v, cause=cause)
+        if self.timing is not None:
+            moved = self.dev.device_write_pages - before
+            if cause == "bg":
+                self.timing.bg_gc(moved)
+            else:
+                self.timing.fg_gc(moved)
+        if callable(self.on_gc):
+            try:
+                self.on_gc(victim_idx, self.dev.device_write_pages - before)
+            except Exception:
+                pass
+        return victim_idx
+
+    def run_bg_gc(self, pool: Optional[str] = None) -> Optional[int]:
+        return self.gc_once(prefer_pool=pool, cause="bg")
+
+    def _bg_if_needed(self, pool: Optional[str]) -> int:
+        # 여유가 충분하면(임계치의 2배 초과) BG GC는 건너뛴다
+        if self.dev.free_blocks > 2 * self.gc_threshold_blocks:
+            return 0
+        return 1 if self.run_bg_gc(pool) is not None else 0
+
+    # ---------------- Internals ----------------
+    def _select(self, blocks, prefetch: bool = False) -> Optional[int]:
+        k = self.victim_prefetch_k or victim_prefetch_k()
+        topk = getattr(self.gc_policy, 'topk', None)
+        if not (prefetch and k > 1 and topk is not None):
+            return self.gc_policy(blocks)
+        # 이전 점수 계산에서 남은 후보 중 아직 유효한 것(그 뒤 erase 안 됨 & 사용 중) 사용
+        q = self._victim_queue
+        while q:
+            idx, erase_seen = q.pop(0)
+            b = blocks[idx]
+            if b.erase_count == erase_seen and (b.valid_count + b.invalid_count) > 0:
+                return idx
+        top = topk(blocks, k)
+        if not top:
+            return None
+        self._victim_queue = [(i, blocks[i].erase_count) for i in top[1:]]
+        return top[0]
+
+    def _ensure_active_block(self, stream: str) -> Tuple[Optional[int], Optional[Block]]:
+        """stream('hot'|'cold'|'gen')의 쓰기 헤드를 장치의 free 풀에서 보장."""
+        if self.cold_pool:
+            idx = self.dev._ensure_stream_block(_DEVICE_STREAM.get(stream, "user"))
+        else:
+            idx = self.dev._ensure_active_block(for_host=True)
+        return (idx, self.dev.blocks[idx]) if idx is not None else (None, None)
@@ -0,0 +1,294 @@
+"""
+snapshot.py — 장치 상태 스냅샷 (버전 관리되는 바이너리, SSD / CompactSSD 공통)
+
+워밍업/프리에이징은 정책과 무관한데 run_sim.py 가 매 실행마다 다시 돌린다.
+한 번 워밍업한 장치를 저장해 두고 정책마다 불러오거나(clone) 복제하면
+인라인 워밍업과 비트 단위로 같은 상태에서 시작한다.
+
+저장 내용: 블록 카운터/페이지 상태, L2P/P2L(및 dict 순서), 쓰기 헤드, step 클럭,
+RNG 상태, free 블록 풀(원소 순서 포함 — rng pick 재현에 필요), 누적 카운터, GC 로그.
+victim 인덱스는 저장하지 않고 로드 후 rebuild() 한다(조회 결과는 상태에만 의존).
+
+파일 레이아웃:
+  <6s magic, H version, H backend, I meta_len> + meta(JSON) +
+  섹션 반복 <B name_len, name, c typecode, Q nbytes, payload>
+
+사용:
+  save_snapshot(dev, "warm.snap");  dev2 = load_snapshot("warm.snap")
+  blob = dump_device(dev);  dev3 = load_device(blob)     # 메모리 내 fork
+  dev4 = clone_device(dev)
+"""
+from __future__ import annotations
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Tuple
+
+from models import MODEL_VERSION, SSD, CompactSSD, PageState, make_ssd
+from telemetry import GCEventLog
+
+SNAPSHOT_MAGIC = b"GCSNAP"
+SNAPSHOT_VERSION = 2  # v2: GC 로그를 열 지향 ring(telemetry.GCEventLog)으로 저장
+_HDR = struct.Struct("<6sHHI")
+_SEC = struct.Struct("<cQ")
+
+_BACKENDS = ("object", "compact")
+_PAGE_STATES = (PageState.FREE, PageState.VALID, PageState.INVALID)
+_STREAMS = ("user", "hot", "cold")
+_POOLS = ("gen", "hot", "cold")
+
+# CompactSSD 에서 그대로 저장하는 배열 속성
+_COMPACT_ARRAYS = ("page_state", "valid", "invalid", "erase_count", "last_prog", "last_invalid",
+                   "inv_ewma", "trimmed", "write_ptr", "stream", "l2p", "p2l", "lpn_last_write")
+
+
+# ------------------------------
+# 공통 상태
+# ------------------------------
+
+def _common_meta(dev) -> Dict:
+    rs = dev.rng.getstate()
+    return {
+        "model_version": MODEL_VERSION,
+        "num_blocks": dev.num_blocks,
+        "pages_per_block": dev.pages_per_block,
+        "byteorder": sys.byteorder,
+        "rng_state": [rs[0], list(rs[1]), rs[2]],
+        "step": dev._step,
+        "ewma_lambda": dev.ewma_lambda,
+        "host_write_pages": dev.host_write_pages,
+        "device_write_pages": dev.device_write_pages,
+        "gc_count": dev.gc_count,
+        "gc_total_time": dev.gc_total_time,
+        "free_pages": dev._free_pages,
+        "active_block_idx": dev.active_block_idx,
+        "three_stream": dev.three_stream,
+        "stream_active": dev.stream_active,
+        "hotness_mode": dev.hotness_mode,
+        "recency_tau": dev.recency_tau,
+        "oracle_hot_cut": dev.oracle_hot_cut,
+        "gc_log": dev.gc_log.export_state()[0],
+    }
+
+
+def _common_sections(dev) -> Dict[str, object]:
+    secs = {f"pool_{name}": array("i", pool) for name, pool in dev.free_pools.items()}
+    secs.update(dev.gc_log.export_state()[1])
+    return secs
+
+
+def _restore_common(dev, meta: Dict, secs: Dict[str, array]) -> None:
+    rs = meta["rng_state"]
+    dev.rng.setstate((rs[0], tuple(rs[1]), rs[2]))
+    dev._step = meta["step"]
+    dev.ewma_lambda = meta["ewma_lambda"]
+    dev.host_write_pages = meta["host_write_pages"]
+    dev.device_write_pages = meta["device_write_pages"]
+    dev.gc_count = meta["gc_count"]
+    dev.gc_total_time = meta["gc_total_time"]
+    dev._free_pages = meta["free_pages"]
+    dev.active_block_idx = meta["active_block_idx"]
+    dev.three_stream = meta["three_stream"]
+    dev.stream_active = dict(meta["stream_active"])
+    dev.hotness_mode = meta["hotness_mode"]
+    dev.recency_tau = meta["recency_tau"]
+    dev.oracle_hot_cut = meta["oracle_hot_cut"]
+    if "gc_log" in meta:
+        dev.gc_log = GCEventLog.from_state(meta["gc_log"], secs)
+    else:
+        # v1: dict 목록 + 지속시간 배열 → ring 으로 옮김
+        for ev in meta.get("gc_event_log", []):
+            dev.gc_log.append(ev["step"], ev["cause"], ev["victim"], ev["moved_valid"], ev["freed_pages"],
+                              ev["gc_s"], ev["free_blocks_after"], ev["v_valid"], ev["v_invalid"],
+                              ev["v_inv_ewma"], ev["v_erase"], ev.get("score_detail"))
+    # 풀은 원소 순서까지 복원(rng pick 이 위치로 고르므로)
+    for name, pool in dev.free_pools.items():
+        for i in list(pool):
+            pool.discard(i)
+        for i in secs[f"pool_{name}"]:
+            pool.add(i)
+
+
+# ------------------------------
+# 백엔드별 상태
+# ------------------------------
+
+def _object_sections(dev: SSD) -> Dict[str, object]:
+    n, ppb = dev.num_blocks, dev.pages_per_block
+    page_state = bytearray(n * ppb)
+    valid, invalid, erase, trimmed = (array("i", bytes(4 * n)) for _ in range(4))
+    last_prog, last_invalid = array("q", bytes(8 * n)), array("q", bytes(8 * n))
+    inv_ewma = array("d", bytes(8 * n))
+    stream, pool = bytearray(n), bytearray(n)
+    for i, b in enumerate(dev.blocks):
+        page_state[i * ppb:(i + 1) * ppb] = bytes(st.value for st in b.pages)
+        valid[i], invalid[i], erase[i], trimmed[i] = b.valid_count, b.invalid_count, b.erase_count, b.trimmed_pages
+        last_prog[i], last_invalid[i] = b.last_prog_step, b.last_invalid_step
+        inv_ewma[i] = b.inv_ewma
+        stream[i], pool[i] = _STREAMS.index(b.stream_id), _POOLS.index(b.pool)
+    # dict 는 삽입 순서까지 그대로 보존(키/값 배열 쌍)
+    return {
+        "page_state": page_state, "valid": valid, "invalid": invalid, "erase_count": erase,
+        "trimmed": trimmed, "last_prog": last_prog, "last_invalid": last_invalid,
+        "inv_ewma": inv_ewma, "stream": stream, "pool": pool,
+        "map_lpn": array("q", dev.mapping.keys()),
+        "map_ppn": array("q", (b * ppb + p for b, p in dev.mapping.values())),
+        "rmap_ppn": array("q", (b * ppb + p for b, p in dev.reverse_map.keys())),
+        "rmap_lpn": array("q", dev.reverse_map.values()),
+        "llw_lpn": array("q", dev.lpn_last_write.keys()),
+        "llw_step": array("q", dev.lpn_last_write.values()),
+    }
+
+
+def _restore_object(dev: SSD, secs: Dict[str, array]) -> None:
+    ppb = dev.pages_per_block
+    ps = secs["page_state"]
+    for i, b in enumerate(dev.blocks):
+        b.pages = [_PAGE_STATES[x] for x in ps[i * ppb:(i + 1) * ppb]]
+        b.valid_count = secs["valid"][i]
+        b.invalid_count = secs["invalid"][i]
+        b.erase_count = secs["erase_count"][i]
+        b.trimmed_pages = secs["trimmed"][i]
+        b.last_prog_step = secs["last_prog"][i]
+        b.last_invalid_step = secs["last_invalid"][i]
+        b.inv_ewma = secs["inv_ewma"][i]
+        b.stream_id = _STREAMS[secs["stream"][i]]
+        b.pool = _POOLS[secs["pool"][i]]
+    dev.mapping = {lpn: divmod(ppn, ppb) for lpn, ppn in zip(secs["map_lpn"], secs["map_ppn"])}
+    dev.reverse_map = {divmod(ppn, ppb): lpn for ppn, lpn in zip(secs["rmap_ppn"], secs["rmap_lpn"])}
+    dev.lpn_last_write = dict(zip(secs["llw_lpn"], secs["llw_step"]))
+
+
+def _compact_sections(dev: CompactSSD) -> Dict[str, object]:
+    return {name: getattr(dev, name) for name in _COMPACT_ARRAYS}
+
+
+def _restore_compact(dev: CompactSSD, secs: Dict[str, array]) -> None:
+    for name in _COMPACT_ARRAYS:
+        cur, new = getattr(dev, name), secs[name]
+        if len(cur) != len(new):
+            raise ValueError(f"snapshot array size mismatch: {name} ({len(new)} != {len(cur)})")
+        cur[:] = new
+
+
+# ------------------------------
+# 직렬화
+# ------------------------------
+
+def _backend_of(dev) -> str:
+    if isinstance(dev, CompactSSD):
+        return "compact"
+    if isinstance(dev, SSD):
+        return "object"
+    raise TypeError(f"unsupported device type: {type(dev).__name__}")
+
+
+def dump_device(dev, warmup=None) -> bytes:
+    """장치 전체 상태 → 스냅샷 바이트. warmup: 이 상태를 만든 워밍업 인자(run_sim.warmup_key) — 로드 시 검증용."""
+    backend = _backend_of(dev)
+    meta = _common_meta(dev)
+    if warmup is not None:
+        meta["warmup"] = list(warmup)
+    meta = json.dumps(meta, separators=(",", ":"), default=str).encode("utf-8")
+    secs = _common_sections(dev)
+    secs.update(_object_sections(dev) if backend == "object" else _compact_sections(dev))
+
+    parts = [_HDR.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, _BACKENDS.index(backend), len(meta)), meta]
+    for name, data in secs.items():
+        code = data.typecode if isinstance(data, array) else "B"
+        payload = data.tobytes() if isinstance(data, array) else bytes(data)
+        key = name.encode("ascii")
+        parts += [bytes([len(key)]), key, _SEC.pack(code.encode("ascii"), len(payload)), payload]
+    return b"".join(parts)
+
+
+def _parse(blob) -> Tuple[str, Dict, Dict[str, object]]:
+    mv = memoryview(blob)
+    if len(mv) < _HDR.size:
+        raise ValueError("not a device snapshot (too short)")
+    magic, version, backend, meta_len = _HDR.unpack_from(mv, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("not a device snapshot (bad magic)")
+    if version not in (1, SNAPSHOT_VERSION):
+        raise ValueError(f"unsupported snapshot version {version} (expected <= {SNAPSHOT_VERSION})")
+    off = _HDR.size
+    meta = json.loads(bytes(mv[off:off + meta_len]).decode("utf-8"))
+    off += meta_len
+    # model_version 이 없는 스냅샷은 v2 도입 전 저장본이지만 free 블록 풀 이후 형식이라 v2 와 같다
+    mver = meta.get("model_version", 2)
+    if mver != MODEL_VERSION:
+        raise ValueError(f"snapshot model_version {mver} != {MODEL_VERSION} (다른 모델 버전으로 만든 장치 상태)")
+    swap = meta.get("byteorder", sys.byteorder) != sys.byteorder
+
+    secs: Dict[str, object] = {}
+    while off < len(mv):
+        klen = mv[off]
+        name = bytes(mv[off + 1:off + 1 + klen]).decode("ascii")
+        off += 1 + klen
+        code, nbytes = _SEC.unpack_from(mv, off)
+        off += _SEC.size
+        payload = mv[off:off + nbytes]
+        if len(payload) != nbytes:
+            raise ValueError(f"truncated snapshot section: {name}")
+        off += nbytes
+        code = code.decode("ascii")
+        if code == "B":
+            secs[name] = bytearray(payload)
+        else:
+            arr = array(code)
+            arr.frombytes(payload)
+            if swap:
+                arr.byteswap()
+            secs[name] = arr
+    return _BACKENDS[backend], meta, secs
+
+
+def load_device(blob):
+    """스냅샷 바이트 → 새 장치(SSD 또는 CompactSSD). victim 인덱스는 재구성된다."""
+    backend, meta, secs = _parse(blob)
+    dev = make_ssd(meta["num_blocks"], meta["pages_per_block"], backend=backend)
+    _restore_common(dev, meta, secs)
+    if backend == "object":
+        _restore_object(dev, secs)
+    else:
+        _restore_compact(dev, secs)
+    dev.victim_index.rebuild()
+    return dev
+
+
+def clone_device(dev):
+    """장치의 독립 복사본(정책별 실행을 같은 워밍업 상태에서 시작할 때)."""
+    return load_device(dump_device(dev))
+
+
+def save_snapshot(dev, path: str, warmup=None) -> int:
+    """스냅샷 파일 저장(임시 파일 → rename 으로 원자적). 반환: 바이트 수."""
+    blob = dump_device(dev, warmup)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, path)
+    return len(blob)
+
+
+def load_snapshot(path: str):
+    with open(path, "rb") as f:
+        return load_device(f.read())
+
+
+def snapshot_info(path: str) -> Dict:
+    """헤더/메타만 읽어 기하/백엔드/step 등 확인(장치는 만들지 않음)."""
+    with open(path, "rb") as f:
+        hdr = f.read(_HDR.size)
+        if len(hdr) < _HDR.size:
+            raise ValueError("not a device snapshot (too short)")
+        magic, version, backend, meta_len = _HDR.unpack(hdr)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("not a device snapshot (bad magic)")
+        meta = json.loads(f.read(meta_len).decode("utf-8"))
+    return {"version": version, "model_version": meta.get("model_version", 2), "backend": _BACKENDS[backend], "num_blocks": meta["num_blocks"],
+            "pages_per_block": meta["pages_per_block"], "step": meta["step"],
+            "host_write_pages": meta["host_write_pages"], "gc_count": meta["gc_count"],
+            "warmup": meta.get("warmup")}
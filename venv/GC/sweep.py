@@ -0,0 +1,443 @@
+"""
+sweep.py — 병렬·재개 가능한 파라미터 스윕 (run_sim.py 위에서 동작)
+
+사용 예:
+  # 그리드는 run_sim.py 인자 이름(dest) 기준. 나머지 인자는 모든 셀의 공통값으로 run_sim에 그대로 전달
+  python sweep.py --set gc_policy=greedy,cb,cat --set update_ratio=0.5,0.8 \\
+                  --set user_capacity_ratio=0.8,0.9 --set seed=1,2,3 --tag rq1 -- --ops 50000 --blocks 128
+  python sweep.py --grid grid.json                      # {"gc_policy": [...], "seed": [...], ...}
+  python sweep.py --grid grid.json --resume results/2025-10-04/run03_rq1   # 중단된 스윕 이어서
+
+동작:
+  - results/YYYY-MM-DD/runNN[_tag]/ 생성 + results/LATEST.txt 갱신, sweep_meta.json 기록
+  - 워크로드 파라미터(ops/update/hot/trim/seed/용량)가 같은 셀끼리 묶어 워크로드는 한 번만 생성
+    (임시 바이너리 트레이스), 같은 그룹의 모든 정책이 mmap 으로 공유.
+    워밍업/프리에이징도 그룹당 1회 실행 후 장치 스냅샷을 셀마다 복원(snapshot.py).
+    그룹 준비와 셀 실행을 각각 태스크로 프로세스 풀(기본: 코어 수)에 분배 — 동시에 준비해 두는 그룹은 약 workers 개
+  - 실패한 셀은 error 컬럼만 있는 행으로 기록(집계 제외, 재개 시 다시 실행)
+  - 결과는 부모 프로세스의 단일 수집기가 results.csv 한 파일에 기록(새 컬럼이 생기면 헤더를 합쳐 다시 씀)
+  - results.csv 에 이미 있는 cell_id 는 건너뜀(재개)
+  - 끝나면 seed 를 제외한 셀별 평균/95% CI 를 summary_agg.csv 로 집계
+"""
+from __future__ import annotations
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import run_sim
+from metrics import summary_row
+from models import make_ssd
+from snapshot import load_snapshot, save_snapshot
+from workload import open_trace, write_trace
+
+# 워크로드 생성에 영향을 주는 인자(같으면 워크로드 공유)
+WORKLOAD_KEYS = ("ops", "update_ratio", "hot_ratio", "hot_weight", "enable_trim", "trim_ratio",
+                 "seed", "blocks", "pages_per_block", "user_capacity_ratio",
+                 "workload_file", "trace_page_size", "trace_unit_bytes")
+
+# 집계할 메트릭
+AGG_METRICS = ("waf", "gc_count", "device_writes", "gc_avg_s", "wear_max", "wear_avg", "wear_std",
+               "free_blocks", "trimmed_pages")
+
+# 양측 95% t 임계값 (df=1..30), 그 이상은 1.96
+_T95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+# ------------------------------
+# grid / cells
+# ------------------------------
+
+def _parse_value(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def load_grid(grid_path: str | None, sets: List[str]) -> Dict[str, list]:
+    grid: Dict[str, list] = {}
+    if grid_path:
+        with open(grid_path, "r", encoding="utf-8") as f:
+            grid.update(json.load(f))
+    for item in sets or []:
+        if "=" not in item:
+            raise ValueError(f"--set 형식은 key=v1,v2,... 입니다: {item}")
+        k, vs = item.split("=", 1)
+        grid[k.strip()] = [_parse_value(v.strip()) for v in vs.split(",") if v.strip()]
+    valid = {a.dest for a in run_sim.build_parser()._actions}
+    for k, vs in grid.items():
+        if k not in valid:
+            raise ValueError(f"run_sim.py 에 없는 인자: {k}")
+        if not isinstance(vs, list) or not vs:
+            raise ValueError(f"그리드 값은 비어있지 않은 리스트여야 합니다: {k}")
+    return grid
+
+
+def cell_id(params: Dict) -> str:
+    blob = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:12]
+
+
+def expand_cells(grid: Dict[str, list], base: Dict) -> List[Tuple[str, str, Dict]]:
+    """(cell_id, agg_id, 전체 파라미터) 목록. agg_id 는 seed 를 뺀 셀 식별자."""
+    keys = sorted(grid)
+    cells = []
+    for combo in itertools.product(*(grid[k] for k in keys)):
+        params = dict(base)
+        params.update(zip(keys, combo))
+        no_seed = {k: v for k, v in params.items() if k != "seed"}
+        cells.append((cell_id(params), cell_id(no_seed), params))
+    return cells
+
+
+def group_by_workload(cells):
+    groups: Dict[Tuple, list] = {}
+    for c in cells:
+        # 워밍업 상태도 같아야 워밍업 1회 → 스냅샷으로 셀마다 복제 가능
+        key = tuple(c[2].get(k) for k in WORKLOAD_KEYS) + run_sim.warmup_key(argparse.Namespace(**c[2]))
+        groups.setdefault(key, []).append(c)
+    # 큰 그룹부터 제출(꼬리 지연 감소)
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+# ------------------------------
+# worker
+# ------------------------------
+
+def _make_args(params: Dict) -> argparse.Namespace:
+    args = run_sim.build_parser().parse_args([])
+    for k, v in params.items():
+        setattr(args, k, v)
+    return args
+
+
+def prepare_group(cells, work_dir: str, gid: int) -> Tuple[str, str | None]:
+    """같은 워크로드/워밍업을 쓰는 셀들의 공유 입력을 디스크에 1회 생성.
+    반환: (바이너리 트레이스 경로, 워밍업 스냅샷 경로 또는 None). 셀 태스크는 이 파일만 읽는다."""
+    first = _make_args(cells[0][2])
+    cfg = run_sim.build_config(first)
+    trace_path = os.path.join(work_dir, f"g{gid:04d}.bin")
+    write_trace(trace_path, run_sim.make_run_workload(first, cfg.user_total_pages))
+    snap_path = None
+    if first.warmup_fill > 0.0 or first.preage_ops > 0:
+        dev = make_ssd(cfg.num_blocks, cfg.pages_per_block, rng_seed=cfg.rng_seed, backend=cfg.backend)
+        run_sim.warmup_device(first, cfg, dev)
+        snap_path = os.path.join(work_dir, f"g{gid:04d}.snap")
+        save_snapshot(dev, snap_path, warmup=run_sim.warmup_key(first))
+    return trace_path, snap_path
+
+
+def run_cell(cell, grid_keys, trace_path: str, snap_path: str | None) -> Dict:
+    """셀 1개 실행(트레이스는 mmap 재생, 장치는 스냅샷에서 복원)."""
+    cid, aid, params = cell
+    args = _make_args(params)
+    ssd = load_snapshot(snap_path) if snap_path else None
+    with open_trace(trace_path) as wl:
+        sim = run_sim.run_once(args, wl, ssd=ssd)
+        row = summary_row(sim, run_sim.run_meta(args))
+    for k in grid_keys:
+        row[k] = params[k]
+    row["cell_id"] = cid
+    row["agg_id"] = aid
+    return row
+
+
+def error_row(cell, grid_keys, err: BaseException) -> Dict:
+    """실패한 셀의 결과 행(메트릭 없이 error 만). 재개 시 다시 실행된다."""
+    cid, aid, params = cell
+    row = {k: params[k] for k in grid_keys}
+    row["cell_id"] = cid
+    row["agg_id"] = aid
+    row["error"] = f"{type(err).__name__}: {err}"
+    return row
+
+
+# ------------------------------
+# collector / aggregation
+# ------------------------------
+
+class ResultCollector:
+    """results.csv 단일 기록자. 헤더는 기존 파일(재개) 또는 첫 행에서 정하고,
+    이후 행에 새 컬럼이 있으면 합친 헤더로 파일을 다시 쓴다(기존 행의 새 컬럼은 빈 값)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: set = set()
+        self._fieldnames: List[str] = []
+        if os.path.exists(path):
+            with open(path, "r", newline="", encoding="utf-8") as f:
+                r = csv.DictReader(f)
+                self._fieldnames = list(r.fieldnames or [])
+                for row in r:
+                    if not row.get("error"):   # 실패 행은 재개 시 다시 실행
+                        self.done.add(row.get("cell_id"))
+        self._f = None
+        self._w = None
+
+    def _open(self, write_header: bool) -> None:
+        self._f = open(self.path, "a", newline="", encoding="utf-8")
+        self._w = csv.DictWriter(self._f, fieldnames=self._fieldnames, restval="")
+        if write_header:
+            self._w.writeheader()
+
+    def _rewrite(self, fieldnames: List[str]) -> None:
+        """합친 헤더로 기존 행을 옮겨 쓴다(tmp → replace)."""
+        self.close()
+        with open(self.path, "r", newline="", encoding="utf-8") as f:
+            old_rows = list(csv.DictReader(f))
+        tmp = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=fieldnames, restval="")
+            w.writeheader()
+            w.writerows(old_rows)
+        os.replace(tmp, self.path)
+        self._fieldnames = fieldnames
+        self._open(write_header=False)
+
+    def write(self, rows: List[Dict]) -> None:
+        if not rows:
+            return
+        if not self._fieldnames:
+            self._fieldnames = sorted(set().union(*rows))
+            self._open(write_header=True)
+        else:
+            new_cols = sorted({k for row in rows for k in row} - set(self._fieldnames))
+            if new_cols:
+                self._rewrite(self._fieldnames + new_cols)
+            elif self._w is None:
+                self._open(write_header=False)
+        for row in rows:
+            self._w.writerow(row)
+            if not row.get("error"):
+                self.done.add(row["cell_id"])
+        self._f.flush()
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+        self._f = None
+        self._w = None
+
+
+def _remove_files(paths) -> None:
+    for p in paths:
+        if p and os.path.exists(p):
+            os.remove(p)
+
+
+def _mean_ci(xs: List[float]) -> Tuple[float, float]:
+    n = len(xs)
+    if n == 0:
+        return 0.0, 0.0
+    m = sum(xs) / n
+    if n < 2:
+        return m, 0.0
+    sd = math.sqrt(sum((x - m) ** 2 for x in xs) / (n - 1))
+    t = _T95[n - 2] if n - 1 <= len(_T95) else 1.96
+    return m, t * sd / math.sqrt(n)
+
+
+def aggregate(results_csv: str, out_csv: str, grid_keys: List[str]) -> int:
+    """agg_id(= seed 제외 셀)별 평균/95% CI. 반환: 집계 행 수."""
+    with open(results_csv, "r", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    groups: Dict[str, List[Dict]] = {}
+    for r in rows:
+        if r.get("error"):
+            continue
+        groups.setdefault(r["agg_id"], []).append(r)
+
+    keys = [k for k in grid_keys if k != "seed"]
+    out = []
+    for aid, rs in groups.items():
+        rec = {"agg_id": aid, "n": len(rs)}
+        for k in keys:
+            rec[k] = rs[0].get(k, "")
+        for m in AGG_METRICS:
+            xs = []
+            for r in rs:
+                try:
+                    xs.append(float(r[m]))
+                except (KeyError, TypeError, ValueError):
+                    pass
+            mean, ci = _mean_ci(xs)
+            rec[f"{m}_mean"] = round(mean, 6)
+            rec[f"{m}_ci95"] = round(ci, 6)
+        out.append(rec)
+    out.sort(key=lambda r: [str(r[k]) for k in keys])
+
+    fieldnames = ["agg_id", *keys, "n"] + [f"{m}_{s}" for m in AGG_METRICS for s in ("mean", "ci95")]
+    with open(out_csv, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=fieldnames)
+        w.writeheader()
+        w.writerows(out)
+    return len(out)
+
+
+# ------------------------------
+# parallel scheduling
+# ------------------------------
+
+def run_parallel(groups, grid_keys, work_dir: str, workers: int, done) -> None:
+    """그룹 준비(워크로드/워밍업)가 끝나는 대로 그 그룹의 셀을 셀 단위 태스크로 제출.
+    준비 중이거나 셀이 남은 그룹은 약 workers 개로 제한하고, 큐가 비어 갈 때만 다음 그룹을
+    준비한다(공유 입력 파일이 work_dir 에 쌓이지 않게). 셀/준비 실패는 error 행으로 기록하고,
+    풀 자체가 깨지거나 중단되면 대기 중인 태스크를 취소하고 다시 던진다."""
+    ex = ProcessPoolExecutor(max_workers=workers)
+    pending: Dict = {}
+    paths_of: Dict[int, Tuple] = {}
+    left = {gid: len(g) for gid, g in enumerate(groups)}
+    next_gid = 0
+
+    def finish_cell(gid, row):
+        done(row)
+        left[gid] -= 1
+        if left[gid] == 0:
+            _remove_files(paths_of.pop(gid, ()))
+
+    try:
+        while True:
+            live = sum(1 for gid in range(next_gid) if left[gid] > 0)
+            while next_gid < len(groups) and (live < workers or len(pending) < workers):
+                pending[ex.submit(prepare_group, groups[next_gid], work_dir, next_gid)] = ("prep", next_gid, None)
+                next_gid += 1
+                live += 1
+            if not pending:
+                break
+            fin, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in fin:
+                kind, gid, cell = pending.pop(fut)
+                try:
+                    result = fut.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    if kind == "prep":
+                        for c in groups[gid]:
+                            finish_cell(gid, error_row(c, grid_keys, e))
+                    else:
+                        finish_cell(gid, error_row(cell, grid_keys, e))
+                    continue
+                if kind == "prep":
+                    paths_of[gid] = result
+                    for c in groups[gid]:
+                        pending[ex.submit(run_cell, c, grid_keys, *result)] = ("cell", gid, c)
+                else:
+                    finish_cell(gid, result)
+    except BaseException:
+        ex.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        ex.shutdown(wait=True)
+
+
+# ------------------------------
+# run dir
+# ------------------------------
+
+def new_run_dir(root: str, tag: str = "") -> str:
+    day = os.path.join(root, datetime.now().strftime("%Y-%m-%d"))
+    os.makedirs(day, exist_ok=True)
+    nums = [int(d[3:5]) for d in os.listdir(day) if d.startswith("run") and d[3:5].isdigit()]
+    name = f"run{(max(nums) + 1) if nums else 1:02d}" + (f"_{tag}" if tag else "")
+    path = os.path.join(day, name)
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(root, "LATEST.txt"), "w", encoding="utf-8") as f:
+        f.write(path + "\n")
+    return path
+
+
+def main():
+    ap = argparse.ArgumentParser(description="parallel / resumable sweep over run_sim.py",
+                                 epilog="알 수 없는 나머지 인자는 모든 셀 공통 run_sim 인자로 전달")
+    ap.add_argument("--grid", type=str, default=None, help="그리드 JSON 파일 {인자: [값, ...]}")
+    ap.add_argument("--set", action="append", default=[], help="그리드 축 key=v1,v2,... (반복 가능)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="프로세스 수(기본: 코어 수)")
+    ap.add_argument("--root", type=str, default="results", help="결과 루트 디렉토리")
+    ap.add_argument("--tag", type=str, default="", help="runNN_<tag> 접미사")
+    ap.add_argument("--resume", type=str, default=None, help="이어서 실행할 기존 run 디렉토리")
+    args, rest = ap.parse_known_args()
+    if rest and rest[0] == "--":
+        rest = rest[1:]
+
+    grid = load_grid(args.grid, args.set)
+    if not grid:
+        ap.error("--grid 또는 --set 으로 최소 한 개의 축을 지정하세요")
+    base_ns = run_sim.build_parser().parse_args(rest)
+    base = {k: v for k, v in vars(base_ns).items()
+            if k not in ("out_dir", "out_csv", "trace_csv", "gc_events_csv", "save_workload",
+                         "snapshot_in", "snapshot_out")}
+
+    run_dir = args.resume or new_run_dir(args.root, args.tag)
+    os.makedirs(run_dir, exist_ok=True)
+    results_csv = os.path.join(run_dir, "results.csv")
+
+    cells = expand_cells(grid, base)
+    collector = ResultCollector(results_csv)
+    todo = [c for c in cells if c[0] not in collector.done]
+    groups = group_by_workload(todo)
+
+    meta_path = os.path.join(run_dir, "sweep_meta.json")
+    if not os.path.exists(meta_path):
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"grid": grid, "base": base, "n_cells": len(cells),
+                       "started": datetime.now().isoformat(timespec="seconds"),
+                       "python": sys.version.split()[0], "platform": platform.platform()},
+                      f, ensure_ascii=False, indent=2, default=str)
+
+    print(f"[sweep] {run_dir}: {len(cells)} cells, {len(cells) - len(todo)} done, "
+          f"{len(todo)} to run in {len(groups)} workload groups, workers={args.workers}")
+
+    grid_keys = sorted(grid)
+    finished = len(cells) - len(todo)
+    work_dir = tempfile.mkdtemp(prefix="sweep_")
+
+    def done(row):
+        nonlocal finished
+        collector.write([row])
+        finished += 1
+        print(f"[sweep] {finished}/{len(cells)}")
+
+    try:
+        if args.workers <= 1:
+            for gid, g in enumerate(groups):
+                try:
+                    paths = prepare_group(g, work_dir, gid)
+                except Exception as e:
+                    for c in g:
+                        done(error_row(c, grid_keys, e))
+                    continue
+                for c in g:
+                    try:
+                        row = run_cell(c, grid_keys, *paths)
+                    except Exception as e:
+                        row = error_row(c, grid_keys, e)
+                    done(row)
+                _remove_files(paths)
+        else:
+            run_parallel(groups, grid_keys, work_dir, args.workers, done)
+    finally:
+        collector.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if os.path.exists(results_csv):
+        n = aggregate(results_csv, os.path.join(run_dir, "summary_agg.csv"), grid_keys)
+        print(f"[sweep] aggregated {n} cells → {os.path.join(run_dir, 'summary_agg.csv')}")
+
+
+if __name__ == "__main__":
+    main()
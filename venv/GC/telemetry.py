@@ -0,0 +1,328 @@
+"""
+telemetry.py — 메모리 상한이 있는 열 지향 텔레메트리
+
+  - GCEventLog: GC 이벤트 ring buffer(열마다 array, 기본 최근 GC_RING_DEFAULT 개). 오래된 이벤트는
+    덮어쓰고, spill_path 를 주면 덮어쓰기 전에 CSV 로 이어 쓴다(전체 이력은 디스크, 메모리는 capacity 만큼).
+    spill 없이 버리기 시작하면 1회 경고. capacity=None 은 상한 없이 전부 유지(명시적으로 고를 때만).
+    누적 집계(count / total_s / moved / by cause)는 ring 과 무관하게 전체 실행 기준.
+  - Timeline: interval op 마다 1샘플(free pages/blocks, host/device writes, 구간 WAF, GC 횟수).
+    capacity 에 닿으면 샘플을 2:1 로 솎고 interval 을 2배로 → 실행 길이와 무관하게 메모리 고정.
+
+비활성 시 비용: Simulator 는 timeline 이 None 이면 분기 한 번, 장치는 GC 1회당 append 한 번.
+"""
+from __future__ import annotations
+import csv
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+# 스키마(기존 gc_event_log dict 키와 동일, CSV 는 정렬된 열 순서)
+_GC_COLS = (
+    ("step", "q"), ("victim", "i"), ("moved_valid", "i"), ("freed_pages", "i"), ("gc_s", "d"),
+    ("free_blocks_after", "i"), ("v_valid", "i"), ("v_invalid", "i"), ("v_inv_ewma", "d"), ("v_erase", "i"),
+)
+
+
+GC_RING_DEFAULT = 1 << 16   # Timeline 기본 capacity 와 같은 크기
+
+
+class GCEventLog:
+    """GC 이벤트 ring buffer(capacity=None 이면 상한 없음) + 선택적 CSV spill."""
+
+    def __init__(self, capacity: Optional[int] = GC_RING_DEFAULT, spill_path: Optional[str] = None):
+        self.capacity = None if capacity is None else max(0, int(capacity))
+        self._size = 64 if self.capacity is None else self.capacity   # 저장 슬롯 수(무제한이면 2배씩 증가)
+        self._floor = 0   # 무제한 모드에서 남아 있는 가장 오래된 순번(ring 에서 전환한 경우 > 0)
+        self._warned = False
+        self._cols: Dict[str, array] = {name: array(code, bytes(array(code).itemsize * self._size))
+                                        for name, code in _GC_COLS}
+        self._cause = bytearray(self._size)
+        self._causes: List[str] = []
+        self._cause_code: Dict[str, int] = {}
+        self._detail: Dict[int, object] = {}   # seq -> score_detail (probe 사용 시, ring 범위만 유지)
+        self.count = 0
+        self.total_s = 0.0
+        self.moved_total = 0
+        self.by_cause: Dict[str, int] = {}
+        self.spill_path: Optional[str] = None
+        self._spilled = 0
+        self._spill_f = None
+        self._spill_w = None
+        if spill_path:
+            self.spill_to(spill_path)
+
+    # ---------- 기록 ----------
+    def append(self, step: int, cause: str, victim: int, moved_valid: int, freed_pages: int, gc_s: float,
+               free_blocks_after: int, v_valid: int, v_invalid: int, v_inv_ewma: float, v_erase: int,
+               score_detail=None) -> None:
+        seq = self.count
+        self.total_s += gc_s
+        self.moved_total += moved_valid
+        self.by_cause[cause] = self.by_cause.get(cause, 0) + 1
+        cap = self._size
+        if self.capacity is None:
+            if seq >= cap:
+                self._realloc(cap * 2, self._floor)
+                cap = self._size
+        elif cap == 0:
+            self.count = seq + 1
+            return
+        elif seq >= cap:
+            if self._spill_w is not None:
+                if seq - self._spilled >= cap:
+                    self._write_rows(self._spilled, seq)  # 덮어쓰기 전에 ring 전체를 디스크로
+            elif not self._warned:
+                self._warned = True
+                print(f"[warn] GC 이벤트 ring(capacity={cap}) 초과 — 오래된 이벤트를 버립니다"
+                      f"(spill_to / --gc_events_csv 로 디스크에 보존 가능)")
+        i = seq % cap
+        c = self._cols
+        c["step"][i] = step
+        c["victim"][i] = victim
+        c["moved_valid"][i] = moved_valid
+        c["freed_pages"][i] = freed_pages
+        c["gc_s"][i] = gc_s
+        c["free_blocks_after"][i] = free_blocks_after
+        c["v_valid"][i] = v_valid
+        c["v_invalid"][i] = v_invalid
+        c["v_inv_ewma"][i] = v_inv_ewma
+        c["v_erase"][i] = v_erase
+        code = self._cause_code.get(cause)
+        if code is None:
+            code = self._cause_code[cause] = len(self._causes)
+            self._causes.append(cause)
+        self._cause[i] = code
+        if self._detail and self.capacity is not None:
+            self._detail.pop(seq - cap, None)
+        if score_detail is not None:
+            self._detail[seq] = score_detail
+        self.count = seq + 1
+
+    # ---------- 조회 ----------
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.count if self.count else 0.0
+
+    @property
+    def first_retained(self) -> int:
+        """메모리에 남아 있는 가장 오래된 이벤트의 순번."""
+        if self.capacity is None:
+            return self._floor
+        return max(0, self.count - self.capacity)
+
+    def __len__(self) -> int:
+        return self.count - self.first_retained
+
+    def _row(self, seq: int) -> Dict:
+        i = seq % self._size
+        row = {name: col[i] for name, col in self._cols.items()}
+        row["cause"] = self._causes[self._cause[i]]
+        if seq in self._detail:
+            row["score_detail"] = self._detail[seq]
+        return row
+
+    def __iter__(self) -> Iterator[Dict]:
+        """남은 이벤트를 오래된 순으로 dict 로(기존 gc_event_log 항목과 같은 키)."""
+        for seq in range(self.first_retained, self.count):
+            yield self._row(seq)
+
+    def column(self, name: str) -> List:
+        """남은 범위의 한 열(오래된 순)."""
+        size = self._size
+        if name == "cause":
+            return [self._causes[self._cause[s % size]] for s in range(self.first_retained, self.count)]
+        col = self._cols[name]
+        return [col[s % size] for s in range(self.first_retained, self.count)]
+
+    def resize(self, capacity: Optional[int]) -> None:
+        """capacity 변경(None 이면 상한 없음) — 누적 집계와 최근 이벤트(새 capacity 만큼)는 유지."""
+        capacity = None if capacity is None else max(0, int(capacity))
+        if capacity == self.capacity:
+            return
+        self.flush()
+        if capacity is None:
+            lo = self.first_retained
+            size = max(64, self.count - lo)
+            while size < self.count:
+                size *= 2
+        else:
+            lo = max(self.first_retained, self.count - capacity)
+            size = capacity
+        self.capacity = capacity
+        self._floor = lo
+        self._warned = False
+        self._realloc(size, lo)
+
+    def _realloc(self, size: int, lo: int) -> None:
+        """저장 슬롯을 size 개로 다시 만들고 순번 lo.. 의 이벤트를 옮긴다."""
+        old = self._size
+        rows = {name: [self._cols[name][s % old] for s in range(lo, self.count)] for name in self._cols}
+        causes = [self._cause[s % old] for s in range(lo, self.count)]
+        self._size = size
+        self._cols = {name: array(code, bytes(array(code).itemsize * size)) for name, code in _GC_COLS}
+        self._cause = bytearray(size)
+        for j, seq in enumerate(range(lo, self.count)):
+            i = seq % size
+            for name, col in self._cols.items():
+                col[i] = rows[name][j]
+            self._cause[i] = causes[j]
+        self._detail = {k: v for k, v in self._detail.items() if k >= lo}
+
+    # ---------- 스냅샷 ----------
+    def export_state(self):
+        """(meta, arrays) — snapshot.py 저장용. spill 대상 파일은 실행 설정이라 저장하지 않는다.
+        아직 한 바퀴 돌지 않은 ring 은 쓴 슬롯까지만 저장(빈 슬롯은 복원 시 다시 채움)."""
+        used = min(self.count, self._size)
+        meta = {"capacity": self.capacity, "size": self._size, "floor": self._floor, "count": self.count,
+                "total_s": self.total_s, "moved_total": self.moved_total, "by_cause": self.by_cause,
+                "causes": self._causes, "detail": [[k, v] for k, v in self._detail.items()]}
+        arrays = {f"gc_{name}": col[:used] for name, col in self._cols.items()}
+        arrays["gc_cause"] = self._cause[:used]
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta, arrays) -> "GCEventLog":
+        log = cls(meta["capacity"])
+        size = meta.get("size", len(arrays["gc_cause"]))
+        for name, code in _GC_COLS:
+            col = arrays[f"gc_{name}"]
+            col.extend(array(code, bytes(col.itemsize * (size - len(col)))))
+            log._cols[name] = col
+        log._cause = bytearray(arrays["gc_cause"]) + bytearray(size - len(arrays["gc_cause"]))
+        log._size = size
+        log._floor = meta.get("floor", 0)
+        log._causes = list(meta["causes"])
+        log._cause_code = {c: i for i, c in enumerate(log._causes)}
+        log._detail = {int(k): v for k, v in meta["detail"]}
+        log.count = meta["count"]
+        log.total_s = meta["total_s"]
+        log.moved_total = meta["moved_total"]
+        log.by_cause = dict(meta["by_cause"])
+        return log
+
+    # ---------- spill ----------
+    def spill_to(self, path: str) -> None:
+        """이후(및 아직 ring 에 남은) 이벤트를 path CSV 에 이어 쓴다."""
+        if self.capacity == 0:
+            raise ValueError("spill 에는 capacity > 0 이 필요합니다")
+        self.close()
+        self.spill_path = path
+        self._spill_f = open(path, "w", newline="", encoding="utf-8")
+        fields = sorted([name for name, _ in _GC_COLS] + ["cause", "score_detail"])
+        self._spill_w = csv.DictWriter(self._spill_f, fieldnames=fields, restval="")
+        self._spill_w.writeheader()
+        self._spilled = self.first_retained
+
+    def _write_rows(self, lo: int, hi: int) -> None:
+        w = self._spill_w
+        for seq in range(max(lo, self.first_retained), hi):
+            w.writerow(self._row(seq))
+        self._spilled = hi
+        self._spill_f.flush()
+
+    def flush(self) -> None:
+        """아직 디스크에 없는 이벤트를 spill(파일은 열어 둠)."""
+        if self._spill_w is not None:
+            self._write_rows(self._spilled, self.count)
+
+    def close(self) -> None:
+        if self._spill_f is not None:
+            self.flush()
+            self._spill_f.close()
+        self._spill_f = None
+        self._spill_w = None
+
+    def to_csv(self, path: str) -> int:
+        """ring 범위를 한 번에 CSV 로(spill 을 안 쓸 때). 반환: 행 수."""
+        fields = sorted([name for name, _ in _GC_COLS] + ["cause", "score_detail"])
+        n = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=fields, restval="")
+            w.writeheader()
+            for row in self:
+                w.writerow(row)
+                n += 1
+        return n
+
+
+class Timeline:
+    """interval 단위 샘플 타임라인(열 지향, capacity 도달 시 2:1 다운샘플)."""
+
+    COLUMNS = ("step", "free_pages", "free_blocks", "host_writes", "device_writes", "gc_count", "gc_event", "waf")
+
+    def __init__(self, interval: int = 1, capacity: int = 1 << 16):
+        self.interval = max(1, int(interval))
+        self.capacity = max(2, int(capacity))
+        self.cols: Dict[str, array] = {k: array("d" if k == "waf" else "q") for k in self.COLUMNS}
+        # 구간 host/device write 증분(다운샘플 시 구간 WAF 재계산용)
+        self._dh = array("q")
+        self._dd = array("q")
+        self._countdown = self.interval
+        self._events = 0              # 현재 구간의 GC 이벤트 수
+        self._prev_host = 0
+        self._prev_dev = 0
+
+    def mark(self, dev) -> None:
+        """구간 WAF 기준점을 현재 장치 카운터로(워밍업 이후 실행만 보려면 실행 직전 호출)."""
+        self._prev_host, self._prev_dev = dev.host_write_pages, dev.device_write_pages
+
+    def tick(self, dev, gc_event: int) -> None:
+        """호스트 op 1회마다 호출. interval 마다 샘플 1개."""
+        self._events += gc_event
+        self._countdown -= 1
+        if self._countdown > 0:
+            return
+        self._countdown = self.interval
+        h, d = dev.host_write_pages, dev.device_write_pages
+        dh, dd = h - self._prev_host, d - self._prev_dev
+        c = self.cols
+        c["step"].append(dev._step)
+        c["free_pages"].append(dev.free_pages)
+        c["free_blocks"].append(dev.free_blocks)
+        c["host_writes"].append(h)
+        c["device_writes"].append(d)
+        c["gc_count"].append(dev.gc_count)
+        c["gc_event"].append(self._events)
+        c["waf"].append(dd / dh if dh > 0 else 0.0)
+        self._dh.append(dh)
+        self._dd.append(dd)
+        self._prev_host, self._prev_dev = h, d
+        self._events = 0
+        if len(self._dh) >= self.capacity:
+            self._downsample()
+
+    def _downsample(self) -> None:
+        """인접 샘플 쌍을 하나로: 상태/누적값은 뒤 샘플, GC 이벤트와 write 증분은 합, WAF 는 합으로 재계산."""
+        c, n = self.cols, len(self._dh) // 2 * 2
+        merged = {k: array(v.typecode) for k, v in c.items()}
+        dh2, dd2 = array("q"), array("q")
+        for b in range(1, n, 2):
+            a = b - 1
+            for k in ("step", "free_pages", "free_blocks", "host_writes", "device_writes", "gc_count"):
+                merged[k].append(c[k][b])
+            merged["gc_event"].append(c["gc_event"][a] + c["gc_event"][b])
+            dh, dd = self._dh[a] + self._dh[b], self._dd[a] + self._dd[b]
+            merged["waf"].append(dd / dh if dh > 0 else 0.0)
+            dh2.append(dh)
+            dd2.append(dd)
+        for k, v in c.items():
+            merged[k].extend(v[n:])
+        dh2.extend(self._dh[n:])
+        dd2.extend(self._dd[n:])
+        self.cols, self._dh, self._dd = merged, dh2, dd2
+        self.interval *= 2
+        self._countdown = self.interval
+
+    def __len__(self) -> int:
+        return len(self._dh)
+
+    def as_dict(self) -> Dict[str, List]:
+        return {k: v.tolist() for k, v in self.cols.items()}
+
+    def to_csv(self, path: str) -> int:
+        c = self.cols
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(self.COLUMNS)
+            for i in range(len(self)):
+                w.writerow([c[k][i] for k in self.COLUMNS])
+        return len(self)
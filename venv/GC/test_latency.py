@@ -0,0 +1,70 @@
+"""지연 히스토그램 백분위와 FG/BG GC 장치 시간 집계."""
+import math
+import random
+
+import pytest
+
+import run_sim
+from latency import LatencyEngine, LatencyHistogram
+
+
+def _exact(xs, p):
+    s = sorted(xs)
+    return s[max(1, math.ceil(len(s) * p / 100.0)) - 1]
+
+
+@pytest.mark.parametrize("p", [1, 50, 90, 99, 99.9, 100])
+def test_percentile_within_bucket_error(p):
+    rng = random.Random(1)
+    xs = [rng.lognormvariate(6, 1.5) for _ in range(20000)]
+    h = LatencyHistogram(sub_bits=5)
+    for x in xs:
+        h.add(x)
+    want = _exact(xs, p)
+    # 버킷 폭 ≈ 값의 2^-(sub_bits-1) + 정수 µs 절사
+    assert abs(h.percentile(p) - want) <= want * 2 ** -4 + 1.0
+    assert h.percentile(p) <= h.max
+
+
+def test_small_values_are_exact_and_empty_is_zero():
+    h = LatencyHistogram()
+    assert h.percentile(99) == 0.0 and h.mean == 0.0
+    for v in (1, 2, 3, 4, 5, 6, 7, 8, 9, 10):
+        h.add(v)
+    assert h.percentile(50) == 5 and h.percentile(100) == 10
+    assert h.mean == 5.5 and h.min == 1 and h.max == 10
+
+
+def _engine():
+    return LatencyEngine(host_prog_us=200, erase_us=3000, migrate_read_prog_us=100,
+                         channels=1, dies_per_channel=2, channel_xfer_us=10)
+
+
+def test_fg_gc_does_not_recount_drained_bg_work():
+    e = _engine()
+    e.arrive()
+    e.bg_gc(10)                 # die 당 5페이지 이동 + erase = 3500µs 가 debt 로
+    e.arrive()
+    stall = e.fg_gc(10)
+    assert stall == pytest.approx(7000)       # 밀린 BG 3500 + 자기 작업 3500
+    s = e.summary()
+    assert s["gc_stall_us"] == pytest.approx(7000)
+    assert s["gc_dev_avg_us"] == pytest.approx(3500)   # GC 2회 각각 3500
+    assert (s["gc_fg_count"], s["gc_bg_count"]) == (1, 1)
+
+
+def test_host_write_waits_for_fg_gc():
+    e = _engine()
+    e.arrive()
+    e.fg_gc(0)                  # erase 만: 3000µs
+    lat = e.host_write(0)
+    assert lat == pytest.approx(3000 + 10 + 200)
+
+
+def test_run_sim_latency_columns():
+    args = run_sim.build_parser().parse_args(
+        ["--ops", "3000", "--blocks", "64", "--warmup_fill", "0.85", "--latency", "--bg_gc_every", "16"])
+    sim = run_sim.run_once(args)
+    s = sim.timing.summary()
+    assert s["lat_p50_us"] <= s["lat_p99_us"] <= s["lat_max_us"]
+    assert s["gc_fg_count"] + s["gc_bg_count"] == sim.ssd.gc_count
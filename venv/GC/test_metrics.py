@@ -0,0 +1,29 @@
+"""append_summary_csv: 헤더 생성, 새 컬럼이 생기면 헤더 병합 후 전체 재작성."""
+import csv
+
+import run_sim
+from metrics import append_summary_csv, collect_run_metrics
+
+
+def _sim(*argv):
+    args = run_sim.build_parser().parse_args(["--ops", "1500", "--blocks", "32", "--warmup_fill", "0.8", *argv])
+    return run_sim.run_once(args)
+
+
+def test_header_widens_when_latency_columns_appear(tmp_path):
+    path = str(tmp_path / "sub" / "summary.csv")
+    plain, timed = _sim(), _sim("--latency")
+    append_summary_csv(path, plain, {"tag": "a"})
+    append_summary_csv(path, plain, {"tag": "b"})
+    append_summary_csv(path, timed, {"tag": "c"})
+    append_summary_csv(path, plain, {"tag": "d"})
+
+    with open(path, newline="", encoding="utf-8") as f:
+        r = csv.DictReader(f)
+        header, rows = r.fieldnames, list(r)
+    first = sorted({**collect_run_metrics(plain), "tag": ""})
+    assert header[:len(first)] == first
+    assert "lat_p99_us" in header[len(first):]
+    assert [row["tag"] for row in rows] == ["a", "b", "c", "d"]
+    assert [bool(row["lat_p99_us"]) for row in rows] == [False, False, True, False]
+    assert rows[2]["waf"] == str(collect_run_metrics(timed)["waf"])
@@ -0,0 +1,77 @@
+"""스냅샷 저장/복원: 복원한 장치로 이어 실행한 결과가 인라인 워밍업 실행과 같은지."""
+import pytest
+
+import run_sim
+import snapshot
+from metrics import collect_run_metrics
+from models import make_ssd
+from snapshot import clone_device, load_snapshot, save_snapshot, snapshot_info
+
+_WARM = ["--blocks", "64", "--warmup_fill", "0.85", "--preage_ops", "3000", "--seed", "11"]
+
+
+def _args(*argv):
+    return run_sim.build_parser().parse_args([*_WARM, *argv])
+
+
+def _metrics(sim):
+    row = collect_run_metrics(sim)
+    row.pop("gc_avg_s", None)
+    return row
+
+
+def _warm_device(args):
+    cfg = run_sim.build_config(args)
+    dev = make_ssd(cfg.num_blocks, cfg.pages_per_block, rng_seed=cfg.rng_seed, backend=cfg.backend)
+    run_sim.warmup_device(args, cfg, dev)
+    return dev
+
+
+@pytest.mark.parametrize("backend", ["object", "compact"])
+@pytest.mark.parametrize("policy", ["greedy", "cat"])
+def test_run_from_snapshot_matches_inline(tmp_path, backend, policy):
+    args = _args("--backend", backend, "--gc_policy", policy, "--ops", "4000")
+    path = str(tmp_path / "warm.snap")
+    save_snapshot(_warm_device(args), path, warmup=run_sim.warmup_key(args))
+
+    inline = run_sim.run_once(args)
+    restored = run_sim.run_once(args, ssd=load_snapshot(path))
+    assert _metrics(restored) == _metrics(inline)
+    lpns = range(inline.cfg.user_total_pages)
+    assert [restored.ssd.lookup(l) for l in lpns] == [inline.ssd.lookup(l) for l in lpns]
+    for col in ("step", "victim", "moved_valid", "cause"):
+        assert restored.ssd.gc_log.column(col) == inline.ssd.gc_log.column(col)
+
+
+def test_clone_is_independent():
+    dev = _warm_device(_args())
+    twin = clone_device(dev)
+    for lpn in range(200):
+        twin.write_lpn(lpn)
+    assert twin.host_write_pages == dev.host_write_pages + 200
+    assert clone_device(dev).host_write_pages == dev.host_write_pages
+
+
+def test_warmup_mismatch_rejected(tmp_path):
+    args = _args()
+    path = str(tmp_path / "warm.snap")
+    save_snapshot(_warm_device(args), path, warmup=run_sim.warmup_key(args))
+    assert snapshot_info(path)["warmup"] == list(run_sim.warmup_key(args))
+    run_sim.check_snapshot_warmup(path, args)
+    with pytest.raises(ValueError, match="preage_ops"):
+        run_sim.check_snapshot_warmup(path, _args("--preage_ops", "10"))
+
+
+def test_model_version_mismatch_rejected(tmp_path, monkeypatch):
+    path = str(tmp_path / "warm.snap")
+    save_snapshot(make_ssd(16, 8, rng_seed=1), path)
+    monkeypatch.setattr(snapshot, "MODEL_VERSION", snapshot.MODEL_VERSION + 1)
+    with pytest.raises(ValueError, match="model_version"):
+        load_snapshot(path)
+
+
+def test_rejects_garbage(tmp_path):
+    path = tmp_path / "bad.snap"
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(ValueError):
+        load_snapshot(str(path))
@@ -0,0 +1,96 @@
+"""sweep: 결과 수집기 헤더 병합/재개, 집계, 실패 셀 기록과 재개 시 재실행."""
+import csv
+import sys
+
+import pytest
+
+import sweep
+from sweep import ResultCollector, aggregate, error_row
+
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        r = csv.DictReader(f)
+        return r.fieldnames, list(r)
+
+
+def test_collector_widens_header_and_tracks_done(tmp_path):
+    path = str(tmp_path / "results.csv")
+    col = ResultCollector(path)
+    col.write([{"cell_id": "a", "agg_id": "x", "waf": 1.5}])
+    col.write([{"cell_id": "b", "agg_id": "x", "waf": 1.7, "lat_p99_us": 900}])
+    col.write([error_row(("c", "y", {"gc_policy": "nosuch"}), ["gc_policy"], KeyError("nosuch"))])
+    col.close()
+
+    header, rows = _read(path)
+    assert header[:3] == ["agg_id", "cell_id", "waf"]
+    assert {"lat_p99_us", "error", "gc_policy"} <= set(header)
+    assert [r["cell_id"] for r in rows] == ["a", "b", "c"]
+    assert rows[0]["lat_p99_us"] == "" and rows[1]["lat_p99_us"] == "900"
+    assert rows[2]["error"].startswith("KeyError")
+
+    again = ResultCollector(path)
+    assert again.done == {"a", "b"}        # 실패 셀은 재개 시 다시 실행
+
+
+def test_aggregate_mean_ci_skips_errors(tmp_path):
+    src, out = str(tmp_path / "r.csv"), str(tmp_path / "agg.csv")
+    col = ResultCollector(src)
+    for seed, waf in ((1, 1.0), (2, 2.0), (3, 3.0)):
+        col.write([{"cell_id": f"s{seed}", "agg_id": "g", "gc_policy": "greedy", "seed": seed, "waf": waf}])
+    col.write([error_row(("s4", "g", {"gc_policy": "greedy", "seed": 4}), ["gc_policy", "seed"], RuntimeError("x"))])
+    col.close()
+
+    assert aggregate(src, out, ["gc_policy", "seed"]) == 1
+    _, (rec,) = _read(out)
+    assert rec["n"] == "3" and rec["gc_policy"] == "greedy"
+    assert float(rec["waf_mean"]) == pytest.approx(2.0)
+    assert float(rec["waf_ci95"]) == pytest.approx(4.303 / 3 ** 0.5, rel=1e-5)   # sd=1, t(2)=4.303
+
+
+def _sweep(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["sweep.py", *argv,
+                                      "--", "--ops", "1500", "--blocks", "32", "--warmup_fill", "0.8"])
+    sweep.main()
+
+
+def test_failed_cells_are_recorded_and_retried_on_resume(tmp_path, monkeypatch):
+    real = sweep.run_cell
+
+    def flaky(cell, *a):
+        if cell[2]["gc_policy"] == "cb":
+            raise RuntimeError("boom")
+        return real(cell, *a)
+
+    root = str(tmp_path / "res")
+    with monkeypatch.context() as m:
+        m.setattr(sweep, "run_cell", flaky)
+        _sweep(m, "--root", root, "--workers", "1", "--set", "gc_policy=greedy,cb", "--set", "seed=1,2")
+    run_dir = open(f"{root}/LATEST.txt", encoding="utf-8").read().strip()
+
+    _, rows = _read(f"{run_dir}/results.csv")
+    assert len(rows) == 4
+    assert sorted(r["gc_policy"] for r in rows if r["error"]) == ["cb", "cb"]
+    assert all(r["error"] == "RuntimeError: boom" for r in rows if r["gc_policy"] == "cb")
+    _, agg = _read(f"{run_dir}/summary_agg.csv")
+    assert [(a["gc_policy"], a["n"]) for a in agg] == [("greedy", "2")]
+
+    _sweep(monkeypatch, "--resume", run_dir, "--workers", "1", "--set", "gc_policy=greedy,cb", "--set", "seed=1,2")
+    _, rows = _read(f"{run_dir}/results.csv")
+    ok = [r for r in rows if not r["error"]]
+    assert len(rows) == 6 and sorted(r["gc_policy"] for r in ok) == ["cb", "cb", "greedy", "greedy"]
+    _, agg = _read(f"{run_dir}/summary_agg.csv")
+    assert [(a["gc_policy"], a["n"]) for a in agg] == [("cb", "2"), ("greedy", "2")]
+
+
+def test_parallel_matches_sequential(tmp_path, monkeypatch):
+    grid = ["--set", "gc_policy=greedy,cost_benefit_typo", "--set", "seed=1,2"]
+    _sweep(monkeypatch, "--root", str(tmp_path / "a"), "--workers", "1", *grid)
+    _sweep(monkeypatch, "--root", str(tmp_path / "b"), "--workers", "2", *grid)
+    runs = []
+    for sub in ("a", "b"):
+        run_dir = open(tmp_path / sub / "LATEST.txt", encoding="utf-8").read().strip()
+        _, rows = _read(f"{run_dir}/results.csv")
+        runs.append({r["cell_id"]: (r["waf"], r["gc_count"], bool(r["error"])) for r in rows})
+    assert runs[0] == runs[1]
+    assert sum(err for *_, err in runs[0].values()) == 2
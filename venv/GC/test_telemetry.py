@@ -0,0 +1,90 @@
+"""GCEventLog ring/spill/스냅샷 상태와 Timeline 다운샘플링."""
+import csv
+
+import pytest
+
+from telemetry import GC_RING_DEFAULT, GCEventLog, Timeline
+
+
+def _fill(log, n, start=0):
+    for k in range(start, start + n):
+        log.append(k, ("fg", "bg")[k % 2], k % 50, k % 7, 64, 0.001, 5, 1, 2, 0.5, k % 3)
+
+
+def test_default_is_bounded_ring():
+    log = GCEventLog()
+    assert log.capacity == GC_RING_DEFAULT
+    small = GCEventLog(8)
+    _fill(small, 20)
+    assert len(small) == 8 and small.count == 20
+    assert small.column("step") == list(range(12, 20))
+    assert small.by_cause == {"fg": 10, "bg": 10}
+    assert small.moved_total == sum(k % 7 for k in range(20))
+
+
+def test_spill_keeps_every_event(tmp_path):
+    path = str(tmp_path / "ev.csv")
+    log = GCEventLog(16, spill_path=path)
+    _fill(log, 100)
+    log.close()
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [int(r["step"]) for r in rows] == list(range(100))
+    assert len(log) == 16
+
+
+def test_unbounded_and_zero_capacity():
+    log = GCEventLog(None)
+    _fill(log, 1000)
+    assert len(log) == 1000 and log.column("step")[0] == 0
+    agg = GCEventLog(0)
+    _fill(agg, 50)
+    assert len(agg) == 0 and agg.count == 50 and agg.mean_s == pytest.approx(0.001)
+
+
+def test_resize_keeps_recent_events():
+    log = GCEventLog(100)
+    _fill(log, 250)
+    log.resize(None)
+    _fill(log, 300, start=250)
+    assert log.column("step") == list(range(150, 550))
+    log.resize(10)
+    assert log.column("step") == list(range(540, 550))
+
+
+@pytest.mark.parametrize("capacity,n", [(None, 100), (None, 1000), (16, 10), (16, 100), (0, 5), (4096, 300)])
+def test_state_roundtrip(capacity, n):
+    log = GCEventLog(capacity)
+    _fill(log, n)
+    meta, arrays = log.export_state()
+    twin = GCEventLog.from_state(meta, arrays)
+    assert twin.capacity == log.capacity and list(twin) == list(log)
+    _fill(log, 50, start=n)
+    _fill(twin, 50, start=n)
+    assert list(twin) == list(log)
+
+
+def test_warns_once_without_spill(capsys):
+    log = GCEventLog(4)
+    _fill(log, 20)
+    assert capsys.readouterr().out.count("[warn]") == 1
+
+
+class _Dev:
+    def __init__(self):
+        self._step = self.host_write_pages = self.device_write_pages = 0
+        self.free_pages = self.free_blocks = self.gc_count = 0
+
+
+def test_timeline_downsample_keeps_totals():
+    dev, tl = _Dev(), Timeline(interval=1, capacity=64)
+    tl.mark(dev)
+    for step in range(1, 1001):
+        dev._step = dev.host_write_pages = step
+        dev.device_write_pages += 2 if step % 10 == 0 else 1
+        tl.tick(dev, gc_event=int(step % 10 == 0))
+    assert len(tl) < 64 and tl.interval > 1
+    cols = tl.as_dict()
+    assert cols["step"][-1] == 1000 - 1000 % tl.interval
+    assert sum(cols["gc_event"]) == cols["step"][-1] // 10
+    assert all(1.0 <= w <= 2.0 for w in cols["waf"])
@@ -0,0 +1,48 @@
+"""증분 victim 인덱스가 gc_algos 전수 스캔(numpy/스칼라)과 같은 victim 을 고르는지."""
+import random
+
+import pytest
+
+import gc_algos
+from models import make_ssd
+
+_INDEXED = {
+    "greedy": gc_algos.greedy_policy,
+    "cb": gc_algos.cb_policy,
+    "bsgc": gc_algos.bsgc_policy,
+}
+
+
+def _scan(policy, blocks, monkeypatch, use_numpy):
+    """인덱스를 잠시 떼고 정책 함수의 리스트 스캔 경로로 victim 선택."""
+    vi = blocks.victim_index
+    blocks.victim_index = None
+    try:
+        with monkeypatch.context() as m:
+            if not use_numpy:
+                m.setattr(gc_algos, "np", None)
+            return policy(blocks)
+    finally:
+        blocks.victim_index = vi
+
+
+@pytest.mark.parametrize("backend", ["object", "compact"])
+def test_index_matches_scan(backend, monkeypatch):
+    gc_algos.reset_config()
+    ssd = make_ssd(48, 16, rng_seed=3, backend=backend)
+    rng = random.Random(3)
+    user_pages = int(48 * 16 * 0.8)
+    checked = 0
+    for step in range(12000):
+        if rng.random() < 0.05:
+            ssd.trim_lpn(rng.randrange(user_pages))
+        else:
+            ssd.write_lpn(rng.randrange(user_pages))
+        while ssd.free_blocks <= ssd.RESERVED_FREE_BLOCKS + 2:
+            for name, policy in _INDEXED.items():
+                got = policy(ssd.blocks)
+                assert got == _scan(policy, ssd.blocks, monkeypatch, True), (name, step)
+                assert got == _scan(policy, ssd.blocks, monkeypatch, False), (name, step)
+                checked += 1
+            ssd.collect_garbage(list(_INDEXED.values())[step % 3], cause="test")
+    assert checked > 300
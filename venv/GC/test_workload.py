@@ -0,0 +1,74 @@
+"""바이너리 트레이스 왕복과 블록 I/O CSV 임포터."""
+import pytest
+
+from workload import _io_kind, iter_blkio_csv, make_workload, open_trace, write_trace
+
+
+def test_trace_roundtrip_plain_lpns(tmp_path):
+    ops = [5, 0, 17, 2 ** 40, 5]
+    path = str(tmp_path / "w.bin")
+    assert write_trace(path, ops) == len(ops)
+    with open_trace(path) as t:
+        assert len(t) == len(ops)
+        assert list(t) == ops
+        assert list(t) == ops     # 재순회 가능
+        assert [c >> 1 for c in t.packed] == ops
+        assert not any(c & 1 for c in t.packed)
+
+
+def test_trace_roundtrip_with_trims(tmp_path):
+    ops = make_workload(2000, 0.8, 500, rng_seed=4, enable_trim=True, trim_ratio=0.1)
+    assert any(isinstance(op, tuple) and op[0] == "trim" for op in ops)
+    path = str(tmp_path / "w.bin")
+    write_trace(path, ops, chunk_ops=128)    # 청크 경계를 여러 번 넘김
+    with open_trace(path) as t:
+        assert list(t) == list(ops)
+
+
+def test_empty_trace(tmp_path):
+    path = str(tmp_path / "e.bin")
+    assert write_trace(path, []) == 0
+    with open_trace(path) as t:
+        assert len(t) == 0 and list(t) == []
+
+
+def test_rejects_non_trace(tmp_path):
+    path = tmp_path / "x.bin"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        open_trace(str(path))
+
+
+@pytest.mark.parametrize("text,kind", [
+    ("Write", "write"), ("W", "write"), ("ws", "write"), (" write ", "write"), ("1", "write"),
+    ("Trim", "trim"), ("Discard", "trim"), ("D", "trim"), ("DS", "trim"), ("unmap", "trim"),
+    ("Read", None), ("R", None), ("", None), ("delete", None), ("t", None), ("dummy", None), ("wx", None),
+])
+def test_io_kind(text, kind):
+    assert _io_kind(text) == kind
+
+
+def test_blkio_csv_with_header(tmp_path):
+    path = tmp_path / "io.csv"
+    path.write_text(
+        "offset,size,type\n"
+        "0,4096,Write\n"
+        "4096,8192,W\n"        # 페이지 1..2
+        "8192,4096,Read\n"     # 읽기 → 건너뜀
+        "12288,4096,bogus\n"   # 알 수 없는 op → 건너뜀
+        "16384,1,Discard\n"
+        "oops,4096,Write\n"    # 깨진 행 → 건너뜀
+        "40960,4096,Write\n"
+    )
+    got = list(iter_blkio_csv(str(path), page_size=4096))
+    assert got == [("write", 0), ("write", 1), ("write", 2), ("trim", 4), ("write", 10)]
+    folded = list(iter_blkio_csv(str(path), page_size=4096, lpn_space=8))
+    assert folded[-1] == ("write", 2)
+
+
+def test_blkio_csv_msr_layout(tmp_path):
+    # 헤더 없음: Timestamp,Hostname,DiskNumber,Type,Offset,Size,ResponseTime
+    path = tmp_path / "msr.csv"
+    path.write_text("128166372003061629,src1,0,Write,1024,1024,100\n"
+                    "128166372003061630,src1,0,Read,0,512,100\n")
+    assert list(iter_blkio_csv(str(path), page_size=512, unit_bytes=1)) == [("write", 2), ("write", 3)]
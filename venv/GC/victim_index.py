@@ -0,0 +1,118 @@
+"""
+victim_index.py — GC victim 선택용 증분 인덱스
+
+정책 함수(gc_algos.*_policy)는 매 GC마다 전체 블록을 훑는다. 장치가 커지고 GC가 잦으면
+이 스캔이 실행 시간을 지배하므로, 블록 상태가 바뀔 때마다(프로그램/무효화/TRIM/erase)
+touch(i)로 알려 주고 victim 조회는 힙에서 꺼내 쓰도록 한다.
+
+  - greedy / cb      : 블록 자신의 값만으로 점수가 정해짐 → lazy max-heap, 조회 O(log N)
+  - bsgc             : max_erase 에 의존 → max_erase 가 바뀔 때만 힙 재구성(단조 증가)
+  - 전역 경계값: max_erase(누적 최대)
+
+cat / atcb / re50315 는 인덱스가 없고 gc_algos 의 전수 스캔(O(N), numpy 가 있으면 벡터화)을 쓴다.
+전역 정규화(age_den, max_erase)가 매 스텝 바뀌어 점수를 힙에 둘 수 없고, 블록 고유 항의 힙에
+age/wear 항의 상한([0,1] × 가중치)을 더하는 branch & bound 는 그 상한이 고유 항의 분포보다
+넓어 거의 가지치기가 되지 않았다(4096 블록에서 전수 스캔보다 느림).
+
+점수 계산은 gc_algos 의 블록 단위 점수식을 그대로 호출하므로 전수 스캔과 같은 victim
+(동점이면 가장 작은 인덱스)을 돌려준다. 힙은 해당 정책이 처음 조회될 때 만들어지고,
+그 뒤로는 등록된 힙만 갱신하므로 쓰지 않는 정책의 비용은 없다.
+"""
+from __future__ import annotations
+from heapq import heapify, heappop, heappush
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from gc_algos import _block_used, _wear, _cb_score, _bsgc_score
+
+
+class _LazyHeap:
+    """(key, idx) min-heap. idx마다 최신 버전만 유효하고 오래된 항목은 꺼낼 때 버린다."""
+
+    def __init__(self, n: int):
+        self._heap: List[Tuple[float, int, int]] = []
+        self._ver = [0] * n
+        self._key: List[Optional[float]] = [None] * n
+        self._limit = 2 * n + 64
+
+    def set(self, idx: int, key: Optional[float]) -> None:
+        self._ver[idx] += 1
+        self._key[idx] = key
+        if key is not None:
+            heappush(self._heap, (key, idx, self._ver[idx]))
+            if len(self._heap) > self._limit:
+                self._compact()
+
+    def _compact(self) -> None:
+        ver, key = self._ver, self._key
+        self._heap = [(k, i, ver[i]) for i, k in enumerate(key) if k is not None]
+        heapify(self._heap)
+
+    def _fresh(self, e: Tuple[float, int, int]) -> bool:
+        return self._ver[e[1]] == e[2]
+
+    def peek(self) -> Optional[Tuple[float, int]]:
+        h = self._heap
+        while h and not self._fresh(h[0]):
+            heappop(h)
+        return (h[0][0], h[0][1]) if h else None
+
+
+class VictimIndex:
+    """블록 시퀀스에 붙는 증분 victim 인덱스. 장치가 touch(i)를 호출해 최신 상태를 유지한다."""
+
+    def __init__(self, blocks: Sequence):
+        self._blocks = blocks
+        self._n = len(blocks)
+        self.max_erase = max((_wear(b) for b in blocks), default=0)
+        # name/params -> (heap, key_fn)
+        self._heaps: Dict[Tuple, Tuple[_LazyHeap, Callable]] = {}
+        self._bsgc_built_for: Dict[Tuple, int] = {}
+
+    # ---------- 상태 갱신 ----------
+    def touch(self, i: int) -> None:
+        b = self._blocks[i]
+        w = _wear(b)
+        if w > self.max_erase:
+            self.max_erase = w
+        if self._heaps:
+            used = _block_used(b)
+            for heap, key_fn in self._heaps.values():
+                heap.set(i, key_fn(b, used) if used else None)
+
+    def rebuild(self) -> None:
+        """블록 상태를 외부에서 일괄 변경(스냅샷 로드 등)한 뒤 전체 재구성."""
+        self.max_erase = max((_wear(b) for b in self._blocks), default=0)
+        for key in list(self._heaps):
+            self._build(key, self._heaps[key][1])
+
+    def _build(self, key: Tuple, key_fn: Callable) -> _LazyHeap:
+        heap = _LazyHeap(self._n)
+        for i, b in enumerate(self._blocks):
+            used = _block_used(b)
+            heap._key[i] = key_fn(b, used) if used else None
+        heap._compact()
+        self._heaps[key] = (heap, key_fn)
+        return heap
+
+    def _heap(self, key: Tuple, key_fn: Callable) -> _LazyHeap:
+        ent = self._heaps.get(key)
+        return ent[0] if ent is not None else self._build(key, key_fn)
+
+    # ---------- 정책별 조회 ----------
+    def greedy(self) -> Optional[int]:
+        top = self._heap(("greedy",), lambda b, used: -int(getattr(b, "invalid_count", 0))).peek()
+        return top[1] if top else None
+
+    def cb(self) -> Optional[int]:
+        top = self._heap(("cb",), lambda b, used: -_cb_score(b, used)).peek()
+        return top[1] if top else None
+
+    def bsgc(self, alpha: float = 0.7, beta: float = 0.3) -> Optional[int]:
+        key = ("bsgc", alpha, beta)
+        m = self.max_erase
+        if self._bsgc_built_for.get(key) != m:
+            # max_erase 가 늘면 wear_norm 이 모두 바뀌므로 재구성(증가 횟수만큼만 발생)
+            self._heaps.pop(key, None)
+            self._bsgc_built_for[key] = m
+        top = self._heap(key, lambda b, used: -_bsgc_score(b, used, alpha, beta, self.max_erase)).peek()
+        return top[1] if top else None
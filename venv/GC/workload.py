@@ -0,0 +1,492 @@
+from typing import Callable, Iterable, Iterator, List, Tuple, Optional
+from array import array
+import csv
+import mmap
+import random
+import struct
+import sys
+
+# ------------------------------------------------------------
+# 내부 유틸: 인덱스드 리스트 (O(1) add/remove/choice)
+# ------------------------------------------------------------
+class _IndexList:
+    def __init__(self):
+        self._arr: List[int] = []
+        self._pos: dict[int, int] = {}
+    def __len__(self) -> int:
+        return len(self._arr)
+    def add(self, x: int) -> None:
+        if x in self._pos:  # 중복 방지
+            return
+        self._pos[x] = len(self._arr)
+        self._arr.append(x)
+    def remove(self, x: int) -> None:
+        i = self._pos.pop(x, None)
+        if i is None:
+            return
+        last = self._arr.pop()
+        if i < len(self._arr):
+            self._arr[i] = last
+            self._pos[last] = i
+    def choice(self, rng: random.Random) -> int:
+        if not self._arr:
+            raise IndexError("empty _IndexList")
+        return self._arr[rng.randrange(len(self._arr))]
+    def to_list(self) -> List[int]:
+        return list(self._arr)
+
+
+# ------------------------------------------------------------
+# 메인 워크로드 (인터페이스 동일)
+# ------------------------------------------------------------
+def iter_workload(
+    n_ops: int,
+    update_ratio: float,
+    ssd_total_pages: int,
+    rng_seed: int = 42,
+    hot_ratio: float = 0.2,
+    hot_weight: float = 0.7,
+    enable_trim: bool = False,
+    trim_ratio: float = 0.0,
+) -> Iterator:
+    """
+    make_workload 와 같은 시퀀스를 한 op씩 내보내는 제너레이터(메모리 O(live LPN)).
+      - enable_trim=False: lpn(int)
+      - enable_trim=True : ("write"|"trim", lpn)
+    """
+    rng = random.Random(rng_seed)
+
+    # hotset 경계 (oracle 스타일: lpn < hot_cut → hot)
+    hot_cut = max(1, int(ssd_total_pages * max(0.0, min(hot_ratio, 1.0))))
+
+    # 라이브 LPN 컨테이너(빠른 샘플링/삭제용)
+    live_hot = _IndexList()
+    live_cold = _IndexList()
+
+    def _is_hot(lpn: int) -> bool:
+        return lpn < hot_cut
+
+    def _add_live(lpn: int) -> None:
+        (live_hot if _is_hot(lpn) else live_cold).add(lpn)
+
+    def _remove_live(lpn: int) -> None:
+        (live_hot if _is_hot(lpn) else live_cold).remove(lpn)
+
+    def _have_live() -> bool:
+        return (len(live_hot) + len(live_cold)) > 0
+
+    def _pick_update_lpn() -> int:
+        # hot_weight 확률로 hot pool 우선, 비어있으면 다른 풀에서
+        if rng.random() < max(0.0, min(hot_weight, 1.0)):
+            if len(live_hot) > 0:
+                return live_hot.choice(rng)
+            if len(live_cold) > 0:
+                return live_cold.choice(rng)
+        else:
+            if len(live_cold) > 0:
+                return live_cold.choice(rng)
+            if len(live_hot) > 0:
+                return live_hot.choice(rng)
+        return 0  # 완전 비어있을 때의 안전 기본값
+
+    next_lpn = 0
+    trim_ratio = max(0.0, min(trim_ratio, 1.0)) if enable_trim else 0.0
+    for _ in range(n_ops):
+        # 1) TRIM 이벤트 (enable_trim=True 일 때만)
+        if trim_ratio > 0.0 and _have_live() and (rng.random() < trim_ratio):
+            # pool 비율을 반영한 trim (hot_weight로 균형)
+            if rng.random() < max(0.0, min(hot_weight, 1.0)) and len(live_hot) > 0:
+                lpn = live_hot.choice(rng)
+            elif len(live_cold) > 0:
+                lpn = live_cold.choice(rng)
+            elif len(live_hot) > 0:
+                lpn = live_hot.choice(rng)
+            else:
+                lpn = 0
+            _remove_live(lpn)
+            yield ("trim", lpn)
+            continue
+
+        # 2) WRITE 이벤트 (신규/업데이트)
+        new_write = (len(live_hot) + len(live_cold) == 0) or (rng.random() >= update_ratio)
+        if new_write and next_lpn < ssd_total_pages:
+            lpn = next_lpn
+            next_lpn += 1
+            _add_live(lpn)
+        else:
+            # 용량을 다 채웠거나 update 선택 → live 풀에서 선택
+            if _have_live():
+                lpn = _pick_update_lpn()
+            else:
+                # 빈 시스템에서 update가 걸리는 경우를 방지하기 위한 fallback
+                lpn = min(next_lpn, ssd_total_pages - 1) if ssd_total_pages > 0 else 0
+                if next_lpn < ssd_total_pages:
+                    next_lpn += 1
+                    _add_live(lpn)
+        yield ("write", lpn) if enable_trim else lpn
+
+
+def make_workload(
+    n_ops: int,
+    update_ratio: float,
+    ssd_total_pages: int,
+    rng_seed: int = 42,
+    hot_ratio: float = 0.2,
+    hot_weight: float = 0.7,
+    # 신규 옵션 (기본 False라 기존 호출엔 영향 없음)
+    enable_trim: bool = False,
+    trim_ratio: float = 0.0,   # enable_trim=True일 때만 사용
+) -> List:
+    """
+    반환:
+      - enable_trim=False (기본): [lpn, lpn, ...]  ← 기존과 동일
+      - enable_trim=True:      [("write"| "trim", lpn), ...]
+
+    변경 사항(안전성/성능):
+      - next_lpn 이 ssd_total_pages 를 넘지 않도록 안전 가드(넘으면 update로 전환)
+      - hot/cold 선택을 리스트 선형검색 대신 O(1) 자료구조로 최적화
+      - 대규모 실행은 리스트 대신 iter_workload()/lazy_workload() 사용 권장
+    """
+    return list(iter_workload(n_ops, update_ratio, ssd_total_pages, rng_seed,
+                              hot_ratio, hot_weight, enable_trim, trim_ratio))
+
+
+class LazyWorkload:
+    """제너레이터 팩토리를 감싼 재순회 가능한 워크로드. iter() 할 때마다 처음부터 다시 생성한다
+    (리스트를 만들지 않으므로 스윕의 여러 셀/워밍업 재실행에서 메모리가 일정)."""
+
+    def __init__(self, factory: Callable[..., Iterable], *args, length: Optional[int] = None, **kwargs):
+        self._factory = factory
+        self._args = args
+        self._kwargs = kwargs
+        self._length = length
+
+    def __iter__(self):
+        return iter(self._factory(*self._args, **self._kwargs))
+
+    def __len__(self) -> int:
+        if self._length is None:
+            raise TypeError("length unknown for this workload")
+        return self._length
+
+
+def lazy_workload(n_ops: int, update_ratio: float, ssd_total_pages: int, **kwargs) -> LazyWorkload:
+    """make_workload 와 같은 인자, 같은 시퀀스. 단 리스트 대신 재순회 가능한 스트림."""
+    return LazyWorkload(iter_workload, n_ops, update_ratio, ssd_total_pages, length=n_ops, **kwargs)
+
+
+# ------------------------------------------------------------
+# 멀티 페이즈 (내부적으로 iter_workload 호출)
+# ------------------------------------------------------------
+def iter_phased_workload(phases, ssd_total_pages: int, base_seed: int = 42) -> Iterator:
+    """make_phased_workload 의 스트리밍 버전(중간 리스트/정규화 복사 없음)."""
+    # 한 phase라도 TRIM 튜플을 만들면 전부 튜플로 맞춘다(정수는 write로 변환)
+    as_tuple = any(p.get("enable_trim", False) and p["n_ops"] > 0 for p in phases)
+    for i, p in enumerate(phases):
+        chunk = iter_workload(
+            n_ops=p["n_ops"],
+            update_ratio=p.get("update_ratio", 0.8),
+            ssd_total_pages=ssd_total_pages,
+            rng_seed=p.get("seed", base_seed + i),
+            hot_ratio=p.get("hot_ratio", 0.2),
+            hot_weight=p.get("hot_weight", 0.85),
+            enable_trim=p.get("enable_trim", False),
+            trim_ratio=p.get("trim_ratio", 0.0),
+        )
+        if as_tuple and not p.get("enable_trim", False):
+            for x in chunk:
+                yield ("write", x)
+        else:
+            yield from chunk
+
+
+def make_phased_workload(phases, ssd_total_pages: int, base_seed: int = 42) -> List:
+    """
+    phases: [{"n_ops":..., "update_ratio":..., "hot_ratio":..., "hot_weight":...,
+              "trim_ratio":..., "enable_trim":..., "seed":...}, ...]
+    반환:
+      - 모든 phase가 enable_trim=False 또는 미지정 → [lpn, ...]
+      - 하나라도 enable_trim=True → [("write"/"trim", lpn), ...]
+    """
+    return list(iter_phased_workload(phases, ssd_total_pages, base_seed))
+
+
+# ------------------------------------------------------------
+# 보조 유틸 (리스트/제너레이터/PackedTrace 모두 한 번만 훑음)
+# ------------------------------------------------------------
+def iter_only_writes(seq) -> Iterator[int]:
+    """[("write"/"trim", lpn), ...] → lpn 스트림 (trim은 버림)"""
+    packed = getattr(seq, "packed", None)
+    if packed is not None:
+        for c in packed:
+            if not c & 1:
+                yield c >> 1
+        return
+    for x in seq:
+        if isinstance(x, tuple):
+            op, lpn = x
+            if op == "write":
+                yield lpn
+        else:
+            yield x
+
+
+def only_writes(seq):
+    """[("write"/"trim", lpn), ...] → [lpn, ...] 로 변환 (trim은 버림)"""
+    return list(iter_only_writes(seq))
+
+
+def trim_count(seq) -> int:
+    """생성된 시퀀스에서 TRIM 개수 확인."""
+    packed = getattr(seq, "packed", None)
+    if packed is not None:
+        return sum(c & 1 for c in packed)
+    c = 0
+    for x in seq:
+        if isinstance(x, tuple) and x[0] == "trim":
+            c += 1
+    return c
+
+
+def make_rocksdb_like_phases(user_pages: int, base_seed: int = 500) -> list:
+    """
+    아주 단순화된 LSM 패턴:
+      - 초기 bulk-load 비슷한 write
+      - update-heavy 구간 반복 (compaction 유사 burst)
+    """
+    bulk = int(user_pages * 0.8)
+    burst = int(user_pages * 0.2)
+    phases = [{"n_ops": bulk, "update_ratio": 0.2, "hot_ratio": 0.2, "hot_weight": 0.85, "seed": base_seed}]
+    for i in range(3):
+        phases.append({"n_ops": burst, "update_ratio": 0.9, "hot_ratio": 0.2, "hot_weight": 0.9, "seed": base_seed + i + 1})
+        phases.append({"n_ops": burst, "update_ratio": 0.7, "hot_ratio": 0.2, "hot_weight": 0.85, "seed": base_seed + i + 10})
+    return phases
+
+# ------------------------------------------------------------
+# 바이너리 트레이스 (packed op + LPN, mmap 재생)
+# ------------------------------------------------------------
+# 레이아웃: 24바이트 헤더 <4s magic, H version, H flags, Q count, Q lpn_space> + uint64[count]
+#   각 op = (lpn << 1) | is_trim  (op당 8바이트, 파이썬 객체 없이 memoryview로 재생)
+TRACE_MAGIC = b"GCWL"
+TRACE_VERSION = 1
+_TRACE_HDR = struct.Struct("<4sHHQQ")
+_FLAG_TUPLE = 0x1       # 원본이 ("write"|"trim", lpn) 튜플 형식
+_FLAG_BIG_ENDIAN = 0x2  # 본문 uint64 바이트 순서(기록한 머신 기준)
+
+
+def write_trace(path: str, ops: Iterable, chunk_ops: int = 1 << 16) -> int:
+    """op 스트림(int 또는 (op, lpn))을 바이너리 트레이스로 저장. 메모리는 chunk_ops 만큼만 사용.
+    반환: 기록한 op 수."""
+    count = 0
+    lpn_space = 0
+    flags = _FLAG_BIG_ENDIAN if sys.byteorder == "big" else 0
+    buf = array("Q")
+    with open(path, "wb") as f:
+        f.write(_TRACE_HDR.pack(TRACE_MAGIC, TRACE_VERSION, flags, 0, 0))
+        for x in ops:
+            if isinstance(x, tuple):
+                flags |= _FLAG_TUPLE
+                op, lpn = x
+                code = (lpn << 1) | (1 if op == "trim" else 0)
+            else:
+                lpn = x
+                code = lpn << 1
+            if lpn >= lpn_space:
+                lpn_space = lpn + 1
+            buf.append(code)
+            if len(buf) >= chunk_ops:
+                buf.tofile(f)
+                count += len(buf)
+                buf = array("Q")
+        buf.tofile(f)
+        count += len(buf)
+        f.seek(0)
+        f.write(_TRACE_HDR.pack(TRACE_MAGIC, TRACE_VERSION, flags, count, lpn_space))
+    return count
+
+
+class PackedTrace:
+    """write_trace() 파일을 mmap으로 연 재순회 가능한 워크로드.
+    - packed: uint64 memoryview (code = lpn<<1 | is_trim) — Simulator.run 의 빠른 경로
+    - iter(): 원본 형식(int 또는 ("write"|"trim", lpn))으로 한 op씩"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "rb")
+        try:
+            hdr = self._f.read(_TRACE_HDR.size)
+            if len(hdr) < _TRACE_HDR.size:
+                raise ValueError(f"not a workload trace (too short): {path}")
+            magic, version, flags, count, lpn_space = _TRACE_HDR.unpack(hdr)
+            if magic != TRACE_MAGIC:
+                raise ValueError(f"not a workload trace (bad magic): {path}")
+            if version != TRACE_VERSION:
+                raise ValueError(f"unsupported trace version {version}: {path}")
+            self.count = count
+            self.lpn_space = lpn_space
+            self.as_tuple = bool(flags & _FLAG_TUPLE)
+            body = _TRACE_HDR.size + 8 * count
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if count else None
+            if self._mm is not None and len(self._mm) < body:
+                raise ValueError(f"truncated trace ({len(self._mm)} < {body} bytes): {path}")
+        except Exception:
+            self._f.close()
+            raise
+        native_big = sys.byteorder == "big"
+        if self._mm is None:
+            self.packed = memoryview(array("Q"))
+        elif bool(flags & _FLAG_BIG_ENDIAN) == native_big:
+            self.packed = memoryview(self._mm)[_TRACE_HDR.size:body].cast("Q")
+        else:
+            # 다른 엔디안 머신에서 기록된 파일: 한 번 읽어 바이트 순서 변환(드묾)
+            arr = array("Q")
+            arr.frombytes(self._mm[_TRACE_HDR.size:body])
+            arr.byteswap()
+            self.packed = memoryview(arr)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        if self.as_tuple:
+            for c in self.packed:
+                yield ("trim" if c & 1 else "write", c >> 1)
+        else:
+            for c in self.packed:
+                yield c >> 1
+
+    def close(self) -> None:
+        if self.packed is not None:
+            self.packed.release()
+            self.packed = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_trace(path: str) -> PackedTrace:
+    return PackedTrace(path)
+
+
+# ------------------------------------------------------------
+# 블록 I/O 트레이스 CSV 스트리밍 임포터 (offset/size/type → LPN)
+# ------------------------------------------------------------
+# 헤더가 없으면 SNIA MSR-Cambridge 열 순서(Timestamp,Hostname,DiskNumber,Type,Offset,Size,...)로 본다.
+_MSR_COLS = {"type": 3, "offset": 4, "size": 5}
+_COL_ALIASES = {
+    "offset": ("offset", "lba", "address", "addr", "sector"),
+    "size": ("size", "length", "len", "bytes", "nbytes", "blocks"),
+    "type": ("type", "op", "rw", "rwbs", "opcode", "iotype", "request"),
+}
+
+
+# 요청 종류 토큰(소문자). 여기 없는 값(읽기, 알 수 없는 op)은 건너뛴다 — 접두사로 추측하지 않음
+_WRITE_KINDS = frozenset(("write", "writes", "w", "ws", "wm", "wa", "wsm", "wfs", "1"))
+_TRIM_KINDS = frozenset(("trim", "discard", "unmap", "dealloc", "deallocate", "d", "ds"))
+
+
+def _io_kind(t: str) -> Optional[str]:
+    """'Write'/'W'/'WS' → write, 'Trim'/'Discard'/'D' → trim, 읽기/기타 → None."""
+    t = t.strip().lower()
+    if t in _WRITE_KINDS:
+        return "write"
+    if t in _TRIM_KINDS:
+        return "trim"
+    return None
+
+
+def iter_blkio_csv(
+    path: str,
+    page_size: int = 4096,
+    lpn_space: Optional[int] = None,
+    *,
+    unit_bytes: int = 1,
+    cols: Optional[dict] = None,
+) -> Iterator[Tuple[str, int]]:
+    """
+    블록 I/O 트레이스 CSV를 한 줄씩 읽어 ("write"|"trim", lpn) 를 내보낸다(읽기는 건너뜀).
+      - offset/size 는 unit_bytes 단위(바이트=1, 512B 섹터=512)
+      - 한 요청이 걸친 모든 페이지 [offset//page_size, (offset+size-1)//page_size] 를 내보냄
+      - lpn_space 를 주면 lpn % lpn_space 로 장치 유저 영역에 접어 넣음
+      - cols={"offset": i, "size": j, "type": k} 로 열 위치 지정(없으면 헤더/MSR 형식 자동 인식)
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be > 0")
+    with open(path, "r", newline="", encoding="utf-8", errors="replace") as f:
+        reader = csv.reader(f)
+        idx = dict(cols) if cols else None
+        for row in reader:
+            if not row:
+                continue
+            if idx is None:
+                names = [c.strip().lower() for c in row]
+                found = {}
+                for key, aliases in _COL_ALIASES.items():
+                    for j, nm in enumerate(names):
+                        if nm in aliases:
+                            found[key] = j
+                            break
+                if len(found) == 3:
+                    idx = found
+                    continue  # 헤더 행
+                idx = dict(_MSR_COLS)
+            try:
+                kind = _io_kind(row[idx["type"]])
+                if kind is None:
+                    continue
+                off = int(float(row[idx["offset"]])) * unit_bytes
+                size = int(float(row[idx["size"]])) * unit_bytes
+            except (IndexError, ValueError):
+                continue  # 깨진 행은 건너뜀
+            if size <= 0 or off < 0:
+                continue
+            first = off // page_size
+            last = (off + size - 1) // page_size
+            for lpn in range(first, last + 1):
+                yield (kind, lpn % lpn_space if lpn_space else lpn)
+
+
+def blkio_workload(path: str, page_size: int = 4096, lpn_space: Optional[int] = None, **kwargs) -> LazyWorkload:
+    """iter_blkio_csv 의 재순회 가능한 래퍼(재생할 때마다 파일을 다시 스트리밍)."""
+    return LazyWorkload(iter_blkio_csv, path, page_size, lpn_space, **kwargs)
+
+
+# ------------------------------------------------------------
+# CLI: 워크로드 → 바이너리 트레이스 변환
+#   python workload.py rocksdb --user_pages 1000000 --out rocksdb.bin
+#   python workload.py blkio   msr_src1_0.csv --lpn_space 1000000 --out src1.bin
+# ------------------------------------------------------------
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="workload → packed binary trace")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("rocksdb", help="make_rocksdb_like_phases 스트림 저장")
+    r.add_argument("--user_pages", type=int, required=True)
+    r.add_argument("--seed", type=int, default=500)
+    r.add_argument("--out", type=str, required=True)
+    b = sub.add_parser("blkio", help="블록 I/O CSV(offset/size/type) 변환")
+    b.add_argument("csv_path")
+    b.add_argument("--page_size", type=int, default=4096)
+    b.add_argument("--unit_bytes", type=int, default=1, help="offset/size 단위(바이트=1, 섹터=512)")
+    b.add_argument("--lpn_space", type=int, default=None, help="LPN을 이 범위로 접음(장치 유저 페이지 수)")
+    b.add_argument("--out", type=str, required=True)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "rocksdb":
+        ops = iter_phased_workload(make_rocksdb_like_phases(args.user_pages, args.seed), args.user_pages)
+    else:
+        ops = iter_blkio_csv(args.csv_path, args.page_size, args.lpn_space, unit_bytes=args.unit_bytes)
+    n = write_trace(args.out, ops)
+    with open_trace(args.out) as t:
+        print(f"[workload] wrote {n} ops (lpn_space={t.lpn_space}, trims={trim_count(t)}) → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 환경 변수만 로드
+APP_KEY = os.getenv("appkey")
+APP_SECRET = os.getenv("secretkey")
+ACCOUNT_NO = os.getenv("account")
+HTS_ID = os.getenv("id")
+FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY")
+
+# DB 설정
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))  # Flask + 마이그레이션 공유 커넥션 풀 크기
+DB_SQLITE_PATH = os.getenv("DB_SQLITE_PATH")        # 설정 시 MySQL 대신 SQLite 파일 사용(로컬 테스트용)
+
+# 예외처리
+if not FINNHUB_API_KEY:
+    raise ValueError("❌ FINNHUB_API_KEY가 .env에서 로드되지 않았습니다.")
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import pandas as pd
+import re
+
+# 데이터 저장 경로
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = BASE_DIR
+PORTFOLIO_FILE = os.path.join(DATA_DIR, "portfolio_data.csv")
+ACCOUNT_VALUE_FILE = os.path.join(DATA_DIR, "account_value.csv")
+# 처리한 원본 CSV 기록(이름 → mtime/size/sha1/추출값). 바뀐 파일만 다시 파싱
+MANIFEST_FILE = os.path.join(DATA_DIR, ".ingest_manifest.json")
+MANIFEST_VERSION = 1
+
+# 컬럼 매핑 (한글 → 영어)
+COLUMN_MAP = {
+    "구분": "type", "구분.1": "type_1", "계좌번호": "account_number",
+    "종목명": "ticker", "평가손익": "profit_loss", "손익률": "profit_rate",
+    "잔고수량": "quantity", "매입단가": "purchase_price", "매입금액": "purchase_amount",
+    "평가금액": "evaluation_amount", "평가비중": "evaluation_ratio"
+}
+
+
+def extract_date_from_filename(filename):
+    """ 파일명에서 날짜(YYYY-MM-DD) 추출 """
+    match = re.search(r"(\d{4}-\d{2}-\d{2})", filename)
+    return match.group(1) if match else None  # 날짜 형식이면 반환, 아니면 None
+
+
+def get_latest_csv():
+    """ 날짜 형식 CSV 파일 중 가장 최신 파일 반환 """
+    csv_files = [f for f in os.listdir(DATA_DIR) if f.endswith(".csv") and extract_date_from_filename(f)]
+    return os.path.join(DATA_DIR, max(csv_files, key=extract_date_from_filename)) if csv_files else None
+
+
+def get_all_csv_files():
+    """ 날짜 형식 CSV 파일 목록 반환 (오래된 순서부터 정렬) """
+    csv_files = [f for f in os.listdir(DATA_DIR) if f.endswith(".csv") and extract_date_from_filename(f)]
+    return sorted(csv_files, key=extract_date_from_filename)
+
+
+def load_manifest():
+    """ 처리 기록 로드 (없거나 형식이 다르면 빈 기록 → 전체 재처리) """
+    try:
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "files": {}, "portfolio": None}
+
+
+def save_manifest(manifest):
+    """ 임시 파일에 쓰고 교체 (중간에 죽어도 이전 기록 유지) """
+    tmp = MANIFEST_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, MANIFEST_FILE)
+
+
+def _file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _check_file(entry, path):
+    """ (바뀌었는지, 새 서명) — mtime/size 가 같으면 해시 생략, 다르면 해시로 실제 변경 여부 판단 """
+    st = os.stat(path)
+    sig = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+    if entry and entry.get("mtime_ns") == sig["mtime_ns"] and entry.get("size") == sig["size"]:
+        sig["sha1"] = entry.get("sha1")
+        return False, sig
+    sig["sha1"] = _file_hash(path)
+    return not (entry and entry.get("sha1") == sig["sha1"]), sig
+
+
+def process_account_value():
+    """ 날짜 형식 CSV에서 날짜별 총 평가금액을 추출하여 account_value.csv 생성
+        (manifest 에 없거나 내용이 바뀐 파일만 파싱, 나머지는 기록된 값 재사용) """
+    csv_files = get_all_csv_files()
+    if not csv_files:
+        print("❌ No valid CSV files found for account value processing.")
+        return False
+
+    manifest = load_manifest()
+    known = manifest["files"]
+    files = {}
+    parsed = 0
+    for csv_file in csv_files:
+        file_path = os.path.join(DATA_DIR, csv_file)
+        entry = known.get(csv_file)
+        changed, sig = _check_file(entry, file_path)
+        if not changed:
+            files[csv_file] = {**entry, **sig}
+            continue
+        df = pd.read_csv(file_path, encoding="utf-8-sig", usecols=["평가금액"])
+        total_value = df["평가금액"].astype(str).str.replace(",", "").astype(float).sum()
+        files[csv_file] = {**sig, "date": extract_date_from_filename(csv_file), "total_value": float(total_value)}
+        parsed += 1
+
+    removed = len(set(known) - set(files))
+    manifest["files"] = files
+    if parsed or removed or not os.path.exists(ACCOUNT_VALUE_FILE):
+        account_values = [{"date": e["date"], "total_value": e["total_value"]} for e in files.values()]
+        pd.DataFrame(account_values).sort_values(by="date").to_csv(ACCOUNT_VALUE_FILE, index=False, encoding="utf-8-sig")
+        print(f"✅ Account Value CSV Updated with {len(account_values)} records ({parsed} parsed, {removed} removed).")
+    else:
+        print(f"ℹ️ Account Value CSV unchanged ({len(files)} files already processed).")
+    save_manifest(manifest)
+    return bool(parsed or removed)
+
+
+def process_portfolio_data():
+    """ 가장 최신 날짜 형식 CSV에서 포트폴리오 데이터 추출하여 portfolio_data.csv 생성
+        (같은 원본에서 이미 만들었으면 스킵) """
+    latest_csv = get_latest_csv()
+    if not latest_csv:
+        print("❌ No valid CSV files found for portfolio processing.")
+        return False
+    manifest = load_manifest()
+    source = os.path.basename(latest_csv)
+    prev = manifest.get("portfolio")
+    entry = prev if prev and prev.get("source") == source else manifest["files"].get(source)
+    changed, sig = _check_file(entry, latest_csv)
+    if not changed and prev and prev.get("source") == source and os.path.exists(PORTFOLIO_FILE):
+        print(f"ℹ️ Portfolio Data CSV unchanged (source {source}).")
+        return False
+
+    df = pd.read_csv(latest_csv, encoding="utf-8-sig")
+    # ✅ 4번째 행이 중복 헤더일 경우 제거
+    if len(df) > 3 and "구분" in df.iloc[3].values:
+        df.drop(index=3, inplace=True)
+        df.reset_index(drop=True, inplace=True)
+    # ✅ 컬럼 변환 및 필터링
+    df.columns = df.columns.str.strip()
+    df.rename(columns={k: v for k, v in COLUMN_MAP.items() if k in df.columns}, inplace=True)
+    portfolio_df = df[["type", "account_number","ticker", "profit_loss", "profit_rate", "quantity", "purchase_amount", "evaluation_amount", "evaluation_ratio"]].copy()
+    # ✅ 데이터 변환 및 NaN 처리
+    portfolio_df["evaluation_amount"] = portfolio_df["evaluation_amount"].astype(str).str.replace(",", "").astype(
+        float).fillna(0)
+    portfolio_df.loc[:, "ticker"] = portfolio_df["ticker"].fillna(portfolio_df["type"])
+    # ✅ 저장
+    portfolio_df.to_csv(PORTFOLIO_FILE, index=False, encoding="utf-8-sig")
+    manifest["portfolio"] = {"source": source, **sig}
+    save_manifest(manifest)
+    print(f"✅ Portfolio Data CSV Processed from {latest_csv}")
+    return True
+
+if __name__ == "__main__":
+    process_account_value()
+    process_portfolio_data()
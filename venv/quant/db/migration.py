@@ -0,0 +1,218 @@
+import math
+from contextlib import nullcontext
+import pandas as pd
+from utils import get_connection
+
+BATCH_SIZE = 500  # executemany 1회당 행 수
+_INT64_MAX = 2 ** 63 - 1  # clean_int_col 이 int64 로 담을 수 있는 범위(밖이면 default)
+
+
+def _begin(conn):
+    """mysql-connector / pymysql 둘 다 대응"""
+    try:
+        conn.start_transaction()
+    except Exception:
+        try:
+            conn.begin()
+        except Exception:
+            # 일부 드라이버는 autocommit=False로만 트랜잭션이 잡힘
+            pass
+
+
+def clean_int(val, default=0) -> int:
+    """'1,234', '12.3%', NaN, '' 등을 안전하게 int로."""
+    if val is None or (isinstance(val, float) and pd.isna(val)) or (isinstance(val, str) and val.strip() == ""):
+        return default
+    s = str(val).replace(",", "").replace("%", "").strip()
+    if s == "" or s.lower() == "nan":
+        return default
+    try:
+        return int(float(s))
+    except Exception:
+        return default
+
+
+def clean_float(val, default=0.0) -> float:
+    """'12.3%', NaN, '' 등을 안전하게 float로."""
+    if val is None or (isinstance(val, float) and pd.isna(val)) or (isinstance(val, str) and val.strip() == ""):
+        return default
+    s = str(val).replace(",", "").replace("%", "").strip()
+    if s == "" or s.lower() == "nan":
+        return default
+    try:
+        return float(s)
+    except Exception:
+        return default
+
+
+def _to_number(s: pd.Series) -> pd.Series:
+    """열 전체를 숫자로('1,234' / '12.3%' / '' / NaN → 숫자 또는 NaN)."""
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+    s = s.astype(str).str.replace(",", "", regex=False).str.replace("%", "", regex=False).str.strip()
+    return pd.to_numeric(s, errors="coerce")
+
+
+def clean_int_col(s: pd.Series, default=0) -> list:
+    """clean_int 의 열 단위(벡터화) 버전. 반환: 파이썬 int 리스트(DB 드라이버용).
+    int64 범위를 벗어나는 값(inf 포함)은 default — 범위 안에서는 clean_int 와 같다."""
+    n = _to_number(s)
+    n = n.where(n.abs() < _INT64_MAX)
+    return n.fillna(default).astype("int64").tolist()
+
+
+def clean_float_col(s: pd.Series, default=0.0) -> list:
+    """clean_float 의 열 단위(벡터화) 버전."""
+    return _to_number(s).fillna(default).astype(float).tolist()
+
+
+def _text_col(df: pd.DataFrame, col: str) -> list:
+    """문자열 키 열(없거나 NaN 이면 None)."""
+    if col not in df.columns:
+        return [None] * len(df)
+    s = df[col].astype(object)
+    return s.where(s.notna(), None).tolist()
+
+
+def _num_col(df: pd.DataFrame, col: str, cleaner) -> list:
+    return cleaner(df[col]) if col in df.columns else cleaner(pd.Series([None] * len(df), dtype=object))
+
+
+# ------------------------------------------------------------
+# diff 기반 동기화: 테이블 현재 내용과 새 스냅샷을 키로 비교해 바뀐 행만 반영
+# ------------------------------------------------------------
+def _norm(v):
+    """비교용 정규화(DB 가 돌려준 Decimal/str 과 CSV 값의 타입 차이 흡수)."""
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return None
+    if isinstance(v, (int, float)) or type(v).__name__ == "Decimal":
+        return round(float(v), 6)
+    return str(v)
+
+
+def _norm_key(v):
+    """키 비교용: 문자열로(12345678 / 12345678.0 / '12345678' 을 같은 키로)."""
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return None
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v)
+
+
+def _where(key_cols, key):
+    """키 조건(NULL 키는 IS NULL — '= NULL' 은 어떤 행과도 같지 않음). 반환: (SQL, 파라미터)."""
+    conds, params = [], []
+    for c, v in zip(key_cols, key):
+        if v is None:
+            conds.append(f"{c} IS NULL")
+        else:
+            conds.append(f"{c} = %s")
+            params.append(v)
+    return " AND ".join(conds), params
+
+
+def _executemany_keyed(cur, sql, key_cols, items):
+    """items: (앞 파라미터, 키). WHERE 절 모양(NULL 키 위치)이 같은 행끼리 묶어 BATCH_SIZE 단위 executemany.
+    sql 의 {where} 자리에 키 조건이 들어간다. 반환: 영향받은 행 수 합계."""
+    groups = {}
+    for head, key in items:
+        where, kp = _where(key_cols, key)
+        groups.setdefault(where, []).append(tuple(head) + tuple(kp))
+    affected = 0
+    for where, rows in groups.items():
+        stmt = sql.format(where=where)
+        for i in range(0, len(rows), BATCH_SIZE):
+            cur.executemany(stmt, rows[i:i + BATCH_SIZE])
+            affected += max(0, cur.rowcount)
+    return affected
+
+
+def sync_table(table: str, key_cols, val_cols, rows, conn=None) -> dict:
+    """rows(새 스냅샷, key_cols + val_cols 순서 튜플)로 table 을 맞춘다.
+    새 키는 INSERT, 값이 바뀐 키는 UPDATE, 스냅샷에 없는 키는 DELETE — 같은 행은 건드리지 않음.
+    테이블에 같은 키 행이 여럿이면(이전 전체 재적재 시절의 중복) 모두 지우고 새 행 1개로 다시 넣는다.
+    rows 에 중복 키가 있으면 ValueError(키 기준 비교가 불가능) — 그 외에는 전체 삭제 후 재적재와 결과가 같다."""
+    nk = len(key_cols)
+    cols = list(key_cols) + list(val_cols)
+
+    new, dup_new = {}, []
+    for r in rows:
+        k = tuple(_norm_key(v) for v in r[:nk])
+        if k in new:
+            dup_new.append(k)
+        new[k] = r
+    if dup_new:
+        raise ValueError(f"{table}: 새 데이터에 중복 키 {len(dup_new)}개 ({', '.join(map(str, dup_new[:5]))}) "
+                         f"— {'/'.join(key_cols)} 가 유일해야 합니다")
+
+    with (nullcontext(conn) if conn is not None else get_connection()) as conn:
+        try:
+            _begin(conn)
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT {', '.join(cols)} FROM {table}")
+                current, dup = {}, set()
+                for r in cur.fetchall():
+                    k = tuple(_norm_key(v) for v in r[:nk])
+                    if k in current:
+                        dup.add(k)
+                    current[k] = (tuple(r[:nk]), tuple(_norm(v) for v in r[nk:]))
+
+                # 중복 키는 키 조건 DELETE 로 전부 지운 뒤 INSERT
+                inserts = [r for k, r in new.items() if k not in current or k in dup]
+                updates = [(r[nk:], current[k][0]) for k, r in new.items()
+                           if k in current and k not in dup and tuple(_norm(v) for v in r[nk:]) != current[k][1]]
+                deletes = [((), raw) for k, (raw, _) in current.items() if k not in new or k in dup]
+
+                deleted = 0
+                if deletes:
+                    # 중복 키 그룹은 키 1개로 여러 행이 지워지므로 실제 rowcount 를 센다
+                    deleted = _executemany_keyed(cur, f"DELETE FROM {table} WHERE {{where}}", key_cols, deletes)
+                if updates:
+                    sets = ", ".join(f"{c} = %s" for c in val_cols)
+                    _executemany_keyed(cur, f"UPDATE {table} SET {sets} WHERE {{where}}", key_cols, updates)
+                if inserts:
+                    sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join(['%s'] * len(cols))})"
+                    for i in range(0, len(inserts), BATCH_SIZE):
+                        cur.executemany(sql, inserts[i:i + BATCH_SIZE])
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+
+    stats = {"inserted": len(inserts), "updated": len(updates), "deleted": deleted,
+             "unchanged": len(new) - len(inserts) - len(updates)}
+    print(f"✅ {table}: +{stats['inserted']} ~{stats['updated']} -{stats['deleted']} (={stats['unchanged']})")
+    return stats
+
+
+PORTFOLIO_KEYS = ("account_number", "ticker")
+PORTFOLIO_VALUES = ("quantity", "purchase_amount", "evaluation_amount", "profit_loss", "profit_rate", "evaluation_ratio")
+
+
+def migrate_portfolio(csv_path: str = "data/portfolio_data.csv", conn=None) -> dict:
+    df = pd.read_csv(csv_path, encoding="utf-8-sig", dtype={k: str for k in PORTFOLIO_KEYS})
+
+    rows = list(zip(
+        _text_col(df, "account_number"),
+        _text_col(df, "ticker"),
+        _num_col(df, "quantity", clean_int_col),
+        _num_col(df, "purchase_amount", clean_int_col),
+        _num_col(df, "evaluation_amount", clean_int_col),
+        _num_col(df, "profit_loss", clean_int_col),
+        _num_col(df, "profit_rate", clean_float_col),
+        _num_col(df, "evaluation_ratio", clean_float_col),
+    ))
+    return sync_table("portfolio", PORTFOLIO_KEYS, PORTFOLIO_VALUES, rows, conn=conn)
+
+
+def migrate_account_value(csv_path: str = "data/account_value.csv", conn=None) -> dict:
+    df = pd.read_csv(csv_path, encoding="utf-8-sig", dtype={"date": str})
+
+    rows = list(zip(
+        _text_col(df, "date"),
+        _num_col(df, "total_value", clean_int_col),
+    ))
+    return sync_table("account_value", ("date",), ("total_value",), rows, conn=conn)
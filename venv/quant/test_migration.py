@@ -0,0 +1,97 @@
+"""db.migration.sync_table: 임시 SQLite 파일에서 insert/update/delete, NULL 키, 중복 키 처리."""
+import os
+
+os.environ.setdefault("FINNHUB_API_KEY", "test")   # config 는 import 시 키를 요구
+
+import pandas as pd
+import pytest
+
+from db.migration import clean_int, clean_int_col, migrate_portfolio, sync_table
+from utils import SQLiteConnection
+
+
+@pytest.fixture
+def conn(tmp_path):
+    c = SQLiteConnection(str(tmp_path / "t.db"))
+    with c.cursor() as cur:
+        cur.execute("CREATE TABLE t (a TEXT, b TEXT, v INTEGER)")
+    c.commit()
+    yield c
+    c.close()
+
+
+def _load(conn, rows):
+    with conn.cursor() as cur:
+        cur.executemany("INSERT INTO t VALUES (%s, %s, %s)", rows)
+    conn.commit()
+
+
+def _table(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT a, b, v FROM t")
+        return sorted(cur.fetchall(), key=repr)
+
+
+def test_insert_update_delete_and_noop(conn):
+    _load(conn, [("1", "x", 1), ("2", "y", 2), ("3", "z", 3)])
+    new = [("1", "x", 1), ("2", "y", 20), ("4", "w", 4)]
+    assert sync_table("t", ("a", "b"), ("v",), new, conn=conn) == \
+        {"inserted": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+    assert _table(conn) == sorted(new, key=repr)
+    assert sync_table("t", ("a", "b"), ("v",), new, conn=conn) == \
+        {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 3}
+
+
+def test_numeric_key_matches_text_key(conn):
+    _load(conn, [("12345678", "x", 1)])
+    stats = sync_table("t", ("a", "b"), ("v",), [(12345678.0, "x", 1)], conn=conn)
+    assert stats["unchanged"] == 1 and _table(conn) == [("12345678", "x", 1)]
+
+
+def test_null_keys_update_and_delete(conn):
+    _load(conn, [(None, "z", 1), (None, "q", 2), ("1", None, 3)])
+    stats = sync_table("t", ("a", "b"), ("v",), [(None, "z", 10), ("1", None, 3)], conn=conn)
+    assert stats == {"inserted": 0, "updated": 1, "deleted": 1, "unchanged": 1}
+    assert _table(conn) == sorted([(None, "z", 10), ("1", None, 3)], key=repr)
+
+
+def test_duplicate_rows_in_table_are_replaced(conn):
+    _load(conn, [("1", "x", 1), ("1", "x", 2), ("2", "y", 3), (None, "z", 4), (None, "z", 5)])
+    new = [("1", "x", 9), ("2", "y", 3), (None, "z", 5)]
+    stats = sync_table("t", ("a", "b"), ("v",), new, conn=conn)
+    # 중복 그룹 2개(각 2행)는 실제로 지운 행 수만큼 센다
+    assert stats == {"inserted": 2, "updated": 0, "deleted": 4, "unchanged": 1}
+    assert _table(conn) == sorted(new, key=repr)
+
+
+def test_duplicate_new_keys_rejected_without_changes(conn):
+    _load(conn, [("1", "x", 1)])
+    with pytest.raises(ValueError, match="중복 키"):
+        sync_table("t", ("a", "b"), ("v",), [("1", "x", 9), (1.0, "x", 8)], conn=conn)
+    assert _table(conn) == [("1", "x", 1)]
+
+
+def test_clean_int_col_matches_scalar_and_masks_overflow():
+    s = pd.Series(["1,234", "12.7%", "", None, "nan", "abc", "-3", 9.99e18, -9.3e18, float("inf"), 2 ** 40])
+    assert clean_int_col(s, default=-1) == [1234, 12, -1, -1, -1, -1, -3, -1, -1, -1, 2 ** 40]
+    inside = s[[0, 1, 2, 3, 4, 5, 6, 10]]
+    assert clean_int_col(inside) == [clean_int(v) for v in inside]
+
+
+def test_migrate_portfolio_from_csv(tmp_path, conn):
+    with conn.cursor() as cur:
+        cur.execute("CREATE TABLE portfolio (account_number TEXT, ticker TEXT, quantity INTEGER, "
+                    "purchase_amount INTEGER, evaluation_amount INTEGER, profit_loss INTEGER, "
+                    "profit_rate REAL, evaluation_ratio REAL)")
+    conn.commit()
+    path = tmp_path / "portfolio.csv"
+    path.write_text("account_number,ticker,quantity,purchase_amount,evaluation_amount,profit_loss,"
+                    "profit_rate,evaluation_ratio\n"
+                    "0012,005930,\"1,000\",70000000,75000000,5000000,7.1%,60\n"
+                    "0012,AAPL,3,,600000,,,40\n", encoding="utf-8")
+    assert migrate_portfolio(str(path), conn=conn)["inserted"] == 2
+    with conn.cursor() as cur:
+        cur.execute("SELECT account_number, ticker, quantity, purchase_amount, profit_rate FROM portfolio")
+        got = sorted(cur.fetchall())
+    assert got == [("0012", "005930", 1000, 70000000, 7.1), ("0012", "AAPL", 3, 0, 0.0)]
+    assert migrate_portfolio(str(path), conn=conn)["unchanged"] == 2
@@ -0,0 +1,168 @@
+import sqlite3
+import threading
+import time
+from config import DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, DB_POOL_SIZE, DB_SQLITE_PATH
+
+try:
+    from mysql.connector import pooling
+    from mysql.connector.errors import PoolError
+except ImportError:  # SQLite 대체만 쓰는 로컬 테스트 환경
+    pooling = None
+    PoolError = Exception
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """프로세스 공유 MySQL 커넥션 풀(첫 호출 시 생성)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if pooling is None:
+                    raise RuntimeError("mysql-connector-python 이 필요합니다 (또는 DB_SQLITE_PATH 설정)")
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name="quant",
+                    pool_size=DB_POOL_SIZE,
+                    pool_reset_session=True,
+                    host=DB_HOST,
+                    user=DB_USER,
+                    password=DB_PASSWORD,
+                    database=DB_NAME
+                )
+    return _pool
+
+
+def get_connection(timeout: float = 5.0):
+    """공유 풀에서 커넥션 1개. `with get_connection() as conn:` 블록을 벗어나거나
+    conn.close() 하면 끊지 않고 풀로 반환된다.
+    풀이 비어 있으면 timeout 초까지 기다린 뒤 PoolError.
+    DB_SQLITE_PATH 가 설정돼 있으면 같은 인터페이스의 SQLite 연결(로컬 테스트용 MySQL 대체)."""
+    if DB_SQLITE_PATH:
+        return SQLiteConnection(DB_SQLITE_PATH)
+    pool = _get_pool()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return _PooledConnection(pool.get_connection())
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+
+class _PooledConnection:
+    """풀 커넥션 래퍼: with 문 지원, close() 는 한 번만 풀로 반환(중복 반환 방지)."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            conn.close()
+
+
+class _SQLiteCursor:
+    """mysql-connector 커서처럼 쓰기: %s 플레이스홀더, with 문, dictionary=True."""
+
+    def __init__(self, cur, dictionary=False):
+        self._cur = cur
+        self._dict = dictionary
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _row(self, row):
+        if row is None or not self._dict:
+            return row
+        return {d[0]: v for d, v in zip(self._cur.description, row)}
+
+    def execute(self, sql, params=()):
+        self._cur.execute(sql.replace("%s", "?"), tuple(params or ()))
+
+    def executemany(self, sql, rows):
+        self._cur.executemany(sql.replace("%s", "?"), [tuple(r) for r in rows])
+
+    def fetchone(self):
+        return self._row(self._cur.fetchone())
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cur.fetchall()]
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+    def close(self):
+        self._cur.close()
+
+
+class SQLiteConnection:
+    """로컬 테스트용 MySQL 대체 — get_connection() 사용 코드가 그대로 동작하는 범위만 구현."""
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def cursor(self, dictionary=False, **_):
+        return _SQLiteCursor(self._conn.cursor(), dictionary=dictionary)
+
+    def start_transaction(self):
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+def parse_kis_ohlc(data):
+    items = data.get("output2", [])
+    ohlc = []
+    for item in reversed(items):  # 날짜 오름차순
+        date = item.get("xymd")
+        open_ = item.get("open")
+        high = item.get("high")
+        low = item.get("low")
+        close = item.get("clos")
+        volume = item.get("tvol")
+
+        if None in (date, open_, high, low, close, volume):
+            continue
+
+        try:
+            ohlc.append({
+                "date": date,
+                "open": float(open_),
+                "high": float(high),
+                "low": float(low),
+                "close": float(close),
+                "volume": int(volume)
+            })
+        except (ValueError, TypeError):
+            continue
+    return ohlc